@@ -19,6 +19,10 @@ if exist dist\contextfreesql.exe (
     echo   1. Copy dist\contextfreesql.exe
     echo   2. Copy config.sample.json (rename to config.json for users)
     echo.
+    REM Smoke-test the exe with the worker pools on - needs the test database, see tests\README.md
+    echo Checking the exe with worker processes...
+    pytest tests\test_roundtrip_integration.py -k test_bundled_exe_with_worker_pools
+    echo.
 ) else (
     echo Build failed! Check errors above.
 )
@@ -0,0 +1,188 @@
+"""
+On-disk cache of the loaded catalog (DBSchema frames, entity list).
+
+Each entry is stored as JSON with the fingerprint of the source database's catalog at the time it was loaded.
+The fingerprint is cheap to compute (row counts and xmin sums of the system catalogs), and any DDL or GRANT
+inserts or updates catalog rows, which changes it. While it matches, the catalog queries are skipped.
+
+JSON rather than pickle, so a cache file only ever holds data: loading one can't run code, whoever wrote it.
+Frames keep their column dtypes, and the cell values the catalog queries return that JSON has no type for
+(Decimal, dates and times, bytes, tuples) are written as tagged objects and read back as the same type.
+"""
+import base64
+import datetime
+import decimal
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.defs.script_defs import DBConnSettings
+from src.infra.database import DBSession
+
+_CACHE_FORMAT = 5  # bump when the cached objects change shape
+
+# catalogs whose rows change on the DDL/GRANTs we script. xmin is the id of the transaction that wrote the row,
+# so a new, altered or dropped object changes the count or the xmin sum of at least one of them
+_FINGERPRINT_CATALOGS = [
+    'pg_namespace', 'pg_class', 'pg_attribute', 'pg_attrdef', 'pg_constraint', 'pg_index', 'pg_proc',
+    'pg_trigger', 'pg_type', 'pg_rewrite', 'pg_sequence', 'pg_inherits', 'pg_policy', 'pg_default_acl',
+    'pg_auth_members',
+]
+
+
+def _encode(value: Any) -> Any:
+    """A JSON-serializable form of value; _decode turns it back. Raises TypeError for anything else."""
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None if value is None else {'__na__': 'NaT' if value is pd.NaT else 'NA'}
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return _encode(value.item())
+    if isinstance(value, pd.DataFrame):
+        if isinstance(value.columns, pd.MultiIndex):
+            raise TypeError("frames with multi-level columns aren't cached")
+        return {'__frame__': {
+            'columns': [_encode(c) for c in value.columns],
+            'dtypes': [str(dtype) for dtype in value.dtypes],
+            'index': None if isinstance(value.index, pd.RangeIndex) and value.index.start == 0 and value.index.step == 1
+                     else [_encode(i) for i in value.index],
+            'data': [[_encode(cell) for cell in row] for row in value.itertuples(index=False, name=None)],
+        }}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode(v) for v in value]}
+    if isinstance(value, dict):
+        return {'__dict__': [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, decimal.Decimal):
+        return {'__decimal__': str(value)}
+    if isinstance(value, datetime.datetime):  # before date, its base class
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, datetime.time):
+        return {'__time__': value.isoformat()}
+    if isinstance(value, datetime.timedelta):
+        return {'__timedelta__': [value.days, value.seconds, value.microseconds]}
+    if isinstance(value, (bytes, memoryview)):
+        return {'__bytes__': base64.b64encode(bytes(value)).decode('ascii')}
+    raise TypeError(f"can't cache a {type(value).__name__}")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    (tag, payload), = value.items()
+    if tag == '__frame__':
+        columns = [_decode(c) for c in payload['columns']]
+        frame = pd.DataFrame([[_decode(cell) for cell in row] for row in payload['data']], columns=columns, dtype=object)
+        for i, dtype in enumerate(payload['dtypes']):
+            if dtype != 'object':
+                frame.isetitem(i, frame.iloc[:, i].astype(dtype))
+        if payload['index'] is not None:
+            frame.index = pd.Index([_decode(i) for i in payload['index']])
+        return frame
+    if tag == '__na__':
+        return pd.NaT if payload == 'NaT' else pd.NA
+    if tag == '__tuple__':
+        return tuple(_decode(v) for v in payload)
+    if tag == '__dict__':
+        return {_decode(k): _decode(v) for k, v in payload}
+    if tag == '__decimal__':
+        return decimal.Decimal(payload)
+    if tag == '__datetime__':
+        return datetime.datetime.fromisoformat(payload)
+    if tag == '__date__':
+        return datetime.date.fromisoformat(payload)
+    if tag == '__time__':
+        return datetime.time.fromisoformat(payload)
+    if tag == '__timedelta__':
+        return datetime.timedelta(days=payload[0], seconds=payload[1], microseconds=payload[2])
+    if tag == '__bytes__':
+        return base64.b64decode(payload)
+    raise ValueError(f"unknown tag {tag} in catalog cache file")
+
+
+class CatalogCache:
+    """Catalog objects stored as JSON, reused while the source database's catalog fingerprint is unchanged."""
+
+    def __init__(self, cache_dir: str, conn_settings: DBConnSettings):
+        self.cache_dir = cache_dir
+        self.conn_settings = conn_settings
+        self._fingerprint: Optional[str] = None
+        self.results: Dict[str, str] = {}  # entry name -> 'hit' / 'miss'
+
+    def fingerprint(self, session: DBSession) -> Optional[str]:
+        """The catalog fingerprint, computed once per run. None if it can't be computed (nothing is cached then)."""
+        if self._fingerprint is None:
+            parts = " UNION ALL ".join(
+                f"SELECT '{name}' AS name, count(*) || ':' || coalesce(sum(xmin::text::bigint), 0) AS state FROM pg_catalog.{name}"
+                for name in _FINGERPRINT_CATALOGS)
+            # pg_authid isn't readable without superuser, so roles are hashed by content
+            sql = f"""SELECT md5(string_agg(name || '=' || state, ',' ORDER BY name)) AS fingerprint
+                    FROM ({parts}
+                          UNION ALL
+                          SELECT 'pg_roles', md5(string_agg(r::text, ',' ORDER BY r.oid)) FROM pg_catalog.pg_roles r) s"""
+            cur = None
+            try:
+                cur = session.cursor()
+                session.execute(cur, sql, "catalog_fingerprint")
+                self._fingerprint = cur.fetchone()['fingerprint']
+            except Exception as e:
+                print(f"Could not compute catalog fingerprint, catalog cache disabled for this run: {e}")
+                self._fingerprint = ""
+            finally:
+                if cur:
+                    cur.close()
+        return self._fingerprint or None
+
+    def get(self, session: DBSession, name: str, options: str) -> Optional[Any]:
+        """The cached object for this entry and load options, if it was stored under the current fingerprint."""
+        fingerprint = self.fingerprint(session)
+        value = None
+        path = self._path(name, options)
+        if fingerprint and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+                if entry.get('fingerprint') == fingerprint:
+                    value = _decode(entry['value'])
+            except Exception as e:
+                print(f"Ignoring unreadable catalog cache file {path}: {e}")
+        self.results[name] = 'hit' if value is not None else 'miss'
+        return value
+
+    def put(self, session: DBSession, name: str, options: str, value: Any) -> None:
+        fingerprint = self.fingerprint(session)
+        if not fingerprint:
+            return
+        path = self._path(name, options)
+        try:
+            content = json.dumps({'fingerprint': fingerprint, 'value': _encode(value)})
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)  # readers never see a half-written file
+        except Exception as e:
+            print(f"Could not write catalog cache file {path}: {e}")
+
+    def print_report(self) -> None:
+        if not self.results:
+            return
+        entries = ", ".join(f"{name} {result}" for name, result in self.results.items())
+        print(f"Catalog cache ({self.cache_dir}): {entries}")
+
+    def _path(self, name: str, options: str) -> str:
+        # one file per database, entry and load options; the pandas version is part of the key since the frames'
+        # dtypes (as inferred from the loaded rows) can differ across pandas versions
+        key = f"{self.conn_settings.user}|{options}|{pd.__version__}|{_CACHE_FORMAT}"
+        digest = hashlib.md5(key.encode()).hexdigest()[:12]
+        safe_host = "".join(c if c.isalnum() or c in "-_." else "_" for c in f"{self.conn_settings.host}_{self.conn_settings.port}_{self.conn_settings.db_name}")
+        return os.path.join(self.cache_dir, f"{safe_host}_{name}_{digest}.json")
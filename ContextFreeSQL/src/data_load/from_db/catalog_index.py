@@ -0,0 +1,98 @@
+"""
+Group indexes over the loaded catalog (DBSchema frames).
+
+The generators look up a table's columns, indexes, index columns, foreign keys and defaults, and each coded
+entity's definition, once per table/index/entity. With a boolean mask over the whole frame each lookup scans
+the catalog, so generating a schema was quadratic in its size. A FrameIndex groups a frame's row positions by
+its key columns in one pass (built on first use). A lookup is a dict get, and returns either the same DataFrame
+slice, in the same order, the mask gave (rows), or the matching rows as CatalogRow records (records), which skip
+pandas' per-row overhead for the generators that go row by row.
+"""
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class CatalogRow(Mapping):
+    """One row of a catalog frame, read from the frame's column lists: a read-only mapping with the values
+    to_dict('records') would give, without a dict (or Series) per row."""
+
+    __slots__ = ("_columns", "_pos")
+
+    def __init__(self, columns: Dict[str, list], pos: int):
+        self._columns = columns
+        self._pos = pos
+
+    def __getitem__(self, col_name: str):
+        return self._columns[col_name][self._pos]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+
+class FrameIndex:
+    """Row positions of a frame grouped by the values of some of its columns."""
+
+    __slots__ = ("frame", "key_cols", "key_func", "_positions", "_columns")
+
+    def __init__(self, frame: pd.DataFrame, key_cols: Iterable[str], key_func: Optional[Callable[[pd.DataFrame], list]] = None):
+        self.frame = frame
+        self.key_cols = list(key_cols)
+        self.key_func = key_func  # the key Series to group by, when they aren't just key_cols as they are
+        self._positions: Optional[Dict[object, np.ndarray]] = None
+        self._columns: Optional[Dict[str, list]] = None  # the frame's values column by column, for records
+
+    def rows(self, *key) -> pd.DataFrame:
+        """The rows whose key columns equal key (rows with a NULL in a key column are never found, as with a mask)."""
+        positions = self._get_positions().get(key[0] if len(key) == 1 else key)
+        if positions is None:
+            return self.frame.iloc[0:0]
+        return self.frame.take(positions)
+
+    def records(self, *key) -> List[CatalogRow]:
+        """The rows rows() would return, as CatalogRow records."""
+        positions = self._get_positions().get(key[0] if len(key) == 1 else key)
+        if positions is None:
+            return []
+        if self._columns is None:
+            self._columns = {col: self.frame[col].tolist() for col in self.frame.columns}
+        return [CatalogRow(self._columns, pos) for pos in positions.tolist()]
+
+    def _get_positions(self) -> Dict[object, np.ndarray]:
+        if self._positions is None:
+            if self.frame is None or self.frame.empty:
+                self._positions = {}
+            else:
+                keys = self.key_func(self.frame) if self.key_func else [self.frame[col] for col in self.key_cols]
+                self._positions = self.frame.groupby(keys if len(keys) > 1 else keys[0], sort=False, dropna=True).indices
+        return self._positions
+
+
+def _coded_ent_keys(coded_ents: pd.DataFrame) -> list:
+    # a missing parameter list matches an entity with an empty one (see create_db_state_temp_tables_for_coded)
+    return [coded_ents['code_schema'], coded_ents['code_name'], coded_ents['param_type_list'].fillna('')]
+
+
+class CatalogIndex:
+    """Per-table, per-index and per-entity lookups over a DBSchema, built once per schema (DBSchema.catalog)."""
+
+    __slots__ = ("tables", "columns", "defaults", "indexes", "index_cols_by_id", "index_cols_by_name",
+                 "index_cols_by_table", "fks", "fk_cols", "coded_ents", "coded_ents_by_name")
+
+    def __init__(self, schema):
+        self.tables = FrameIndex(schema.tables, ['entschema', 'entname'])
+        self.columns = FrameIndex(schema.columns, ['object_id'])
+        self.defaults = FrameIndex(schema.defaults, ['table_schema', 'table_name'])
+        self.indexes = FrameIndex(schema.indexes, ['object_id'])
+        self.index_cols_by_id = FrameIndex(schema.index_cols, ['object_id', 'index_id'])
+        self.index_cols_by_name = FrameIndex(schema.index_cols, ['object_id', 'index_name'])
+        self.index_cols_by_table = FrameIndex(schema.index_cols, ['table_schema', 'table_name', 'index_name'])
+        self.fks = FrameIndex(schema.fks, ['fkey_table_schema', 'fkey_table_name'])
+        self.fk_cols = FrameIndex(schema.fk_cols, ['fkey_table_schema', 'fkey_table_name', 'fk_name'])
+        self.coded_ents = FrameIndex(schema.coded_ents, ['code_schema', 'code_name', 'param_type_list'], _coded_ent_keys)
+        self.coded_ents_by_name = FrameIndex(schema.coded_ents, ['code_schema', 'code_name'])
@@ -1,12 +1,24 @@
 import os
-from pydantic import BaseModel
-from src.infra.database import Database
+import io
+import re
+import csv
+from pydantic import BaseModel, PrivateAttr
+from src.infra.database import DBSession
+from src.data_load.from_db.catalog_cache import CatalogCache
+from src.data_load.from_db.catalog_index import CatalogIndex
+from src.data_load.from_db.schema_fingerprint import schema_fingerprint_sql
 from src.defs.script_defs import ConfigVals, DBConnSettings
-from psycopg2.extras import RealDictCursor #!see if we need this
+import psycopg2.extensions
 import pandas as pd
 import numpy as np
 from src.utils import funcs as utils
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Callable
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import multiprocessing
+import math
+from dataclasses import dataclass
+from functools import partial
+import queue
 from pydantic import Field
 import networkx as nx
 
@@ -31,77 +43,148 @@ class DBSchema(BaseModel):
     function_permissions: pd.DataFrame = Field(default_factory=pd.DataFrame)
     default_privileges: pd.DataFrame = Field(default_factory=pd.DataFrame)
     rls_policies: pd.DataFrame = Field(default_factory=pd.DataFrame)
+    schema_fingerprint: Optional[str] = None  # see schema_fingerprint.py; loaded on request (load_all_schema)
+    _catalog: Optional[CatalogIndex] = PrivateAttr(default=None)
 
 
     class Config:
         arbitrary_types_allowed = True  # Needed for pd.DataFrame
 
+    @property
+    def catalog(self) -> CatalogIndex:
+        """Lookups by table, index and entity over these frames (see catalog_index), built on first use."""
+        if self._catalog is None:
+            self._catalog = CatalogIndex(self)
+        return self._catalog
 
-def load_all_schema(conn_settings: DBConnSettings, load_security: bool = True) -> DBSchema:
 
-    schemas = _load_schemas(conn_settings)
-    tables = _load_tables(conn_settings)
-    columns = _load_tables_columns(conn_settings)
-    defaults = _load_tables_columns_defaults(conn_settings)
-    indexes = _load_tables_indexes(conn_settings)
-    index_cols = _process_index_cols_pg(columns, indexes)
-    fks = _load_tables_foreign_keys(conn_settings)
-    fk_cols = _process_fk_cols_pg(columns, fks)
-    check_constraints = _load_check_constraints(conn_settings)
-    coded_ents = _load_coded_ents(conn_settings)
+def load_all_schema(conn_settings: DBConnSettings, load_security: bool = True, session: Optional[DBSession] = None, parallel_workers: int = 1, catalog_backend: str = "information_schema", cache: Optional[CatalogCache] = None, entity_filter: Optional[List[str]] = None, schema_fingerprint: bool = False) -> DBSchema:
+    # caller may pass a session to share one connection with load_all_db_ents/load_all_tables_data
+    # schema_fingerprint also loads the schema's fingerprint (with security objects if load_security), for the script's schema_fingerprint_check
+    own_session = session is None
+    if own_session:
+        session = DBSession(conn_settings)
+    try:
+        options = f"security={load_security};backend={catalog_backend};filter={','.join(sorted(entity_filter or []))};fingerprint={schema_fingerprint}"
+        cached = cache.get(session, "schema", options) if cache else None
+        if cached is not None:
+            return DBSchema(**cached)
+        schema = _load_all_schema(session, load_security, parallel_workers, catalog_backend, entity_filter, schema_fingerprint)
+        if cache:
+            cache.put(session, "schema", options, dict(schema))  # the fields (frames and strings), not the model
+        return schema
+    finally:
+        if own_session:
+            session.close()
+
+
+def _load_all_schema(session: DBSession, load_security: bool, parallel_workers: int = 1, catalog_backend: str = "information_schema", entity_filter: Optional[List[str]] = None, schema_fingerprint: bool = False) -> DBSchema:
+
+    # catalog queries are independent of each other, so they can run serially or on a pool of connections
+    loaders = {
+        'schemas': _load_schemas,
+        'tables': _load_tables,
+        'columns': _load_tables_columns,
+        'defaults': _load_tables_columns_defaults,
+        'indexes': _load_tables_indexes,
+        'fks': _load_tables_foreign_keys,
+        'check_constraints': _load_check_constraints,
+        'coded_ents': _load_coded_ents,
+    }
+    if catalog_backend == "pg_catalog":
+        loaders['tables'] = _load_tables_pg_catalog
+        loaders['columns'] = _load_tables_columns_pg_catalog
+        del loaders['defaults']  # derived from the columns frame below, no second scan
+    if entity_filter:
+        # per-entity loaders only read the requested entities (schemas and security stay database-wide)
+        for name in ['tables', 'columns', 'defaults', 'indexes', 'fks', 'check_constraints', 'coded_ents']:
+            if name in loaders:
+                loaders[name] = partial(loaders[name], entity_filter=entity_filter)
     #defaults = #in MSSQL there was a separate query for defaults. in PG, seems to me that loading columns has defaults in it. so verify, and then if i implement MSSQL, see if need separate query or can go by PG format.
     #MSSQL was: SELECT SCHEMA_NAME(o.schema_id) AS table_schema, OBJECT_NAME(o.object_id) AS table_name, d.name as default_name, d.definition as default_definition, c.name as col_name FROM sys.default_constraints d INNER JOIN sys.objects o ON d.parent_object_id=o.object_id INNER jOIN sys.columns c on d.parent_object_id=c.object_id AND d.parent_column_id = c.column_id
 
-    # Load security if enabled
+    # Load security if enabled (otherwise DBSchema defaults them to empty frames)
     if load_security:
-        roles = _load_roles(conn_settings)
-        role_memberships = _load_role_memberships(conn_settings)
-        schema_permissions = _load_schema_permissions(conn_settings)
-        table_permissions = _load_table_permissions(conn_settings)
-        column_permissions = _load_column_permissions(conn_settings)
-        function_permissions = _load_function_permissions(conn_settings)
-        default_privileges = _load_default_privileges(conn_settings)
-        rls_policies = _load_rls_policies(conn_settings)
-    else:
-        roles = pd.DataFrame()
-        role_memberships = pd.DataFrame()
-        schema_permissions = pd.DataFrame()
-        table_permissions = pd.DataFrame()
-        column_permissions = pd.DataFrame()
-        function_permissions = pd.DataFrame()
-        default_privileges = pd.DataFrame()
-        rls_policies = pd.DataFrame()
-
-    return DBSchema(
-        schemas = schemas,
-        tables = tables,
-        columns = columns,
-        defaults = defaults,
-        indexes = indexes,
-        index_cols = index_cols,
-        fks = fks,
-        fk_cols = fk_cols,
-        check_constraints = check_constraints,
-        coded_ents = coded_ents,
-        roles = roles,
-        role_memberships = role_memberships,
-        schema_permissions = schema_permissions,
-        table_permissions = table_permissions,
-        column_permissions = column_permissions,
-        function_permissions = function_permissions,
-        default_privileges = default_privileges,
-        rls_policies = rls_policies
-    )
+        loaders.update({
+            'roles': _load_roles,
+            'role_memberships': _load_role_memberships,
+            'schema_permissions': _load_schema_permissions,
+            'table_permissions': _load_table_permissions,
+            'column_permissions': _load_column_permissions,
+            'function_permissions': _load_function_permissions,
+            'default_privileges': _load_default_privileges,
+            'rls_policies': _load_rls_policies,
+        })
+    if schema_fingerprint:
+        # database-wide even with an entity filter: a match still means there is nothing to do
+        loaders['schema_fingerprint'] = partial(_load_schema_fingerprint, include_security=load_security)
+
+    frames = None
+    if parallel_workers > 1:
+        frames = _run_loaders_parallel(session, loaders, parallel_workers)
+    if frames is None:
+        frames = {name: loader(session) for name, loader in loaders.items()}
+
+    if 'defaults' not in frames:
+        frames['defaults'] = _defaults_from_columns(frames['columns'])
+    frames['index_cols'] = _process_index_cols_pg(frames['columns'], frames['indexes'])
+    frames['fk_cols'] = _process_fk_cols_pg(frames['columns'], frames['fks'])
+
+    return DBSchema(**frames)
+
+
+def _run_loaders_parallel(session: DBSession, loaders: Dict[str, Callable[[DBSession], pd.DataFrame]], num_workers: int) -> Optional[Dict[str, pd.DataFrame]]:
+    """Run the loaders on a thread pool of worker connections that all import one exported snapshot,
+    so the frames are consistent with each other. Returns None if the snapshot can't be exported (caller loads serially)."""
+    try:
+        session.export_snapshot()
+    except Exception as e:
+        print(f"Could not export snapshot for parallel load, loading serially: {e}")
+        session.end_snapshot()
+        return None
 
-def _load_schemas(conn_settings: DBConnSettings) -> pd.DataFrame:
-    conn = None
+    num_workers = min(num_workers, len(loaders))
+    workers = queue.Queue()
+    for _ in range(num_workers):
+        workers.put(session.worker())
+
+    def run_loader(loader):
+        worker = workers.get()
+        try:
+            return loader(worker)
+        finally:
+            workers.put(worker)
+
+    try:
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            futures = {name: pool.submit(run_loader, loader) for name, loader in loaders.items()}
+            return {name: future.result() for name, future in futures.items()}
+    finally:
+        while not workers.empty():
+            workers.get().close()
+        session.end_snapshot()
+
+def _entity_filter_clause(cur, key_expr: str, entity_filter: Optional[List[str]], with_fk_parents: bool = False) -> str:
+    """An AND condition keeping only rows whose key_expr ('schema.name') is in entity_filter; '' when there is no filter.
+    with_fk_parents also keeps the tables the filtered tables reference by FK (fk_cols needs their columns)."""
+    if not entity_filter:
+        return ""
+    keys = cur.mogrify("%s::text[]", (list(entity_filter),)).decode()
+    if not with_fk_parents:
+        return f" AND {key_expr} = ANY({keys})"
+    return f""" AND ({key_expr} = ANY({keys}) OR {key_expr} IN (
+                    SELECT ns_f.nspname || '.' || t_f.relname FROM pg_constraint fk
+                    INNER JOIN pg_class t ON t.oid = fk.conrelid INNER JOIN pg_namespace ns ON ns.oid = t.relnamespace
+                    INNER JOIN pg_class t_f ON t_f.oid = fk.confrelid INNER JOIN pg_namespace ns_f ON ns_f.oid = t_f.relnamespace
+                    WHERE fk.contype = 'f' AND ns.nspname || '.' || t.relname = ANY({keys})))"""
+
+def _load_schemas(session: DBSession) -> pd.DataFrame:
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
         sql =  """select schema_name, schema_owner as principal_name from information_schema.schemata 
                     WHERE schema_name NOT IN ('pg_catalog','information_schema', 'pg_toast') and schema_name NOT LIKE 'pg_temp%' and schema_name NOT LIKE 'pg_toast%'"""
-        cur.execute(sql)
+        session.execute(cur, sql, "schemas")
          
         results = cur.fetchall()
         
@@ -114,23 +197,37 @@ def _load_schemas(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
 
-def _load_tables(conn_settings: DBConnSettings) -> pd.DataFrame:   
-    conn = None
+def _load_schema_fingerprint(session: DBSession, include_security: bool) -> Optional[str]:
+    """The schema's fingerprint (see schema_fingerprint.py); None if it can't be computed (the script then doesn't check it)."""
+    cur = None
+    try:
+        cur = session.cursor()
+        session.execute(cur, schema_fingerprint_sql(include_security), "schema_fingerprint")
+        return cur.fetchone()['fingerprint']
+
+    except Exception as e:
+        print(f"Could not compute the schema fingerprint, the script will always run the schema compare: {e}")
+        return None
+
+    finally:
+        if cur:
+            cur.close()
+
+
+def _load_tables(session: DBSession, entity_filter: Optional[List[str]] = None) -> pd.DataFrame:   
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
         sql =  """SELECT  table_schema || '.' || table_name as object_id, table_name as entname, 'U' as type,  null as crdate, table_schema as entschema, table_schema, table_name,
                             null as schema_ver, 
                             NULL as ident_seed, 
                             NULL as ident_incr, Now() as db_now, null as table_sql  
                             FROM information_schema.TABLES E where TABLE_TYPE LIKE '%TABLE%'
                             and TABLE_SCHEMA not in ('information_schema', 'pg_catalog')""" 
-        cur.execute(sql)
+        sql += _entity_filter_clause(cur, "table_schema || '.' || table_name", entity_filter)
+        session.execute(cur, sql, "tables")
          
         results = cur.fetchall()
         
@@ -144,15 +241,11 @@ def _load_tables(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
-def _load_tables_columns(conn_settings: DBConnSettings) -> pd.DataFrame:
-    conn = None
+def _load_tables_columns(session: DBSession, entity_filter: Optional[List[str]] = None) -> pd.DataFrame:
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
         sql = """select table_schema || '.' || table_name as object_id,  COLUMN_NAME as col_name, ORDINAL_POSITION as column_id, table_schema, table_name, COLLATION_NAME as col_collation, COLLATION_NAME, udt_name AS user_type_name, 
                             CHARACTER_MAXIMUM_LENGTH as max_length ,NULL as col_xtype, NUMERIC_PRECISION as precision, NUMERIC_SCALE as scale, case WHEN IS_NULLABLE = 'YES' then 1 WHEN IS_NULLABLE = 'NO' then 0 END AS is_nullable,
                              null as IsRowGuidCol, null as col_default_name, COLUMN_DEFAULT as col_Default_Text, position(c.data_type in 'unsigned')>0 AS col_unsigned, 
@@ -162,7 +255,8 @@ def _load_tables_columns(conn_settings: DBConnSettings) -> pd.DataFrame:
                             identity_generation, identity_start as indent_seed, identity_increment as indent_incr, identity_maximum, identity_minimum, identity_cycle
                             FROM information_schema.COLUMNS C
                              where C.TABLE_SCHEMA not in ('information_schema', 'pg_catalog') """
-        cur.execute(sql)
+        sql += _entity_filter_clause(cur, "table_schema || '.' || table_name", entity_filter, with_fk_parents=True)
+        session.execute(cur, sql, "tables_columns")
         results = cur.fetchall()
         
         return pd.DataFrame(results)
@@ -174,22 +268,19 @@ def _load_tables_columns(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
-def _load_tables_columns_defaults(conn_settings: DBConnSettings) -> pd.DataFrame:
-    conn = None
+def _load_tables_columns_defaults(session: DBSession, entity_filter: Optional[List[str]] = None) -> pd.DataFrame:
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
         sql = """select table_schema, table_name, COLUMN_NAME as col_name, 
                         'def_' || table_schema || '_' || table_name || '_' || COLUMN_NAME as default_name, 
                         COLUMN_DEFAULT as default_definition
                 FROM information_schema.COLUMNS C
                 WHERE C.TABLE_SCHEMA not in ('information_schema', 'pg_catalog') 
                 AND column_default is NOT NULL"""
-        cur.execute(sql)
+        sql += _entity_filter_clause(cur, "table_schema || '.' || table_name", entity_filter)
+        session.execute(cur, sql, "tables_columns_defaults")
         results = cur.fetchall()
         
         return pd.DataFrame(results)
@@ -201,15 +292,101 @@ def _load_tables_columns_defaults(conn_settings: DBConnSettings) -> pd.DataFrame
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
-def _load_tables_indexes(conn_settings: DBConnSettings) -> pd.DataFrame:
-    conn = None
+# pg_catalog loaders: same frames as _load_tables/_load_tables_columns/_load_tables_columns_defaults, read straight from
+# pg_class/pg_attribute/pg_attrdef instead of the information_schema views (which expand into privilege checks and
+# many joins and get slow on big catalogs). Columns and defaults come from one scan. Unlike information_schema,
+# objects the current user has no privileges on are not hidden.
+def _load_tables_pg_catalog(session: DBSession, entity_filter: Optional[List[str]] = None) -> pd.DataFrame:
+    cur = None
+    try:
+        cur = session.cursor()
+        sql = """SELECT n.nspname || '.' || c.relname as object_id, c.relname as entname, 'U' as type, null as crdate, n.nspname as entschema, n.nspname as table_schema, c.relname as table_name,
+                        null as schema_ver,
+                        NULL as ident_seed,
+                        NULL as ident_incr, Now() as db_now, null as table_sql
+                FROM pg_class c
+                INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE c.relkind IN ('r', 'p') AND c.relpersistence <> 't'
+                AND n.nspname NOT IN ('information_schema', 'pg_catalog')"""
+        sql += _entity_filter_clause(cur, "n.nspname || '.' || c.relname", entity_filter)
+        session.execute(cur, sql, "tables (pg_catalog)")
+        results = cur.fetchall()
+
+        return pd.DataFrame(results)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        return pd.DataFrame()  # Return empty DataFrame on error
+
+    finally:
+        if cur:
+            cur.close()
+
+def _load_tables_columns_pg_catalog(session: DBSession, entity_filter: Optional[List[str]] = None) -> pd.DataFrame:
+    cur = None
+    try:
+        cur = session.cursor()
+        # typ_id/typ_mod: the column's type, or the base type for domains (information_schema._pg_truetypid/_pg_truetypmod)
+        sql = """SELECT n.nspname || '.' || c.relname as object_id, a.attname as col_name, CAST(a.attnum AS integer) as column_id, n.nspname as table_schema, c.relname as table_name, co.collname as col_collation, co.collname as collation_name, COALESCE(bt.typname, t.typname) AS user_type_name,
+                        information_schema._pg_char_max_length(tt.typ_id, tt.typ_mod) as max_length, NULL as col_xtype, information_schema._pg_numeric_precision(tt.typ_id, tt.typ_mod) as precision, information_schema._pg_numeric_scale(tt.typ_id, tt.typ_mod) as scale,
+                        case WHEN a.attnotnull OR (t.typtype = 'd' AND t.typnotnull) then 0 else 1 END AS is_nullable,
+                        null as IsRowGuidCol, null as col_default_name, CASE WHEN a.attgenerated = '' THEN pg_get_expr(ad.adbin, ad.adrelid) END as col_Default_Text, false AS col_unsigned,
+                        NULL AS extra,
+                        0 AS is_computed, null AS computed_definition ,
+                        case WHEN a.attidentity IN ('a', 'd') then 1 else 0 END AS is_identity,
+                        CASE a.attidentity WHEN 'a' THEN 'ALWAYS' WHEN 'd' THEN 'BY DEFAULT' END as identity_generation,
+                        CAST(seq.seqstart AS text) as indent_seed, CAST(seq.seqincrement AS text) as indent_incr, CAST(seq.seqmax AS text) as identity_maximum, CAST(seq.seqmin AS text) as identity_minimum,
+                        CASE WHEN seq.seqcycle THEN 'YES' ELSE 'NO' END as identity_cycle
+                FROM pg_attribute a
+                INNER JOIN pg_class c ON c.oid = a.attrelid
+                INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+                INNER JOIN pg_type t ON t.oid = a.atttypid
+                LEFT JOIN pg_type bt ON t.typtype = 'd' AND bt.oid = t.typbasetype
+                CROSS JOIN LATERAL (SELECT CASE WHEN t.typtype = 'd' THEN t.typbasetype ELSE a.atttypid END AS typ_id,
+                                           CASE WHEN t.typtype = 'd' THEN t.typtypmod ELSE a.atttypmod END AS typ_mod) tt
+                LEFT JOIN pg_attrdef ad ON ad.adrelid = a.attrelid AND ad.adnum = a.attnum
+                LEFT JOIN (pg_collation co INNER JOIN pg_namespace nco ON nco.oid = co.collnamespace)
+                    ON co.oid = a.attcollation AND (nco.nspname <> 'pg_catalog' OR co.collname <> 'default')
+                LEFT JOIN (pg_depend dep INNER JOIN pg_sequence seq ON dep.classid = 'pg_class'::regclass AND dep.objid = seq.seqrelid AND dep.deptype = 'i')
+                    ON dep.refclassid = 'pg_class'::regclass AND dep.refobjid = c.oid AND dep.refobjsubid = a.attnum
+                WHERE a.attnum > 0 AND NOT a.attisdropped
+                AND c.relkind IN ('r', 'v', 'f', 'p')
+                AND NOT pg_is_other_temp_schema(n.oid)
+                AND n.nspname NOT IN ('information_schema', 'pg_catalog')"""
+        sql += _entity_filter_clause(cur, "n.nspname || '.' || c.relname", entity_filter, with_fk_parents=True)
+        session.execute(cur, sql, "tables_columns (pg_catalog)")
+        results = cur.fetchall()
+
+        return pd.DataFrame(results)
+
+    except Exception as e:
+        print(f"Error: {e}")
+        return pd.DataFrame()  # Return empty DataFrame on error
+
+    finally:
+        if cur:
+            cur.close()
+
+def _defaults_from_columns(tbl_cols: pd.DataFrame) -> pd.DataFrame:
+    """Build the defaults frame (as _load_tables_columns_defaults returns it) from the columns frame."""
+    if tbl_cols.empty:
+        return pd.DataFrame()
+    cols = tbl_cols[tbl_cols['col_default_text'].notna()]
+    if cols.empty:
+        return pd.DataFrame()
+    return pd.DataFrame({
+        'table_schema': cols['table_schema'],
+        'table_name': cols['table_name'],
+        'col_name': cols['col_name'],
+        'default_name': 'def_' + cols['table_schema'] + '_' + cols['table_name'] + '_' + cols['col_name'],
+        'default_definition': cols['col_default_text'],
+    }).reset_index(drop=True)
+
+def _load_tables_indexes(session: DBSession, entity_filter: Optional[List[str]] = None) -> pd.DataFrame:
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
   
         #small note: i had below '0 as index_id' but it made no sense when its time to select the index
         sql= """SELECT
@@ -251,8 +428,9 @@ def _load_tables_indexes(conn_settings: DBConnSettings) -> pd.DataFrame:
                 inner join pg_indexes idx on idx.schemaname=scm.nspname and idx.tablename=t.relname and idx.indexname=i.relname
                 Left Join pg_constraint cnst on t.oid = cnst.conrelid And i.oid=cnst.conindid And cnst.contype='u'	
             where scm.nspname not in ('pg_catalog','information_schema', 'pg_toast')"""
+        sql += _entity_filter_clause(cur, "scm.nspname || '.' || t.relname", entity_filter)
             
-        cur.execute(sql)
+        session.execute(cur, sql, "tables_indexes")
         results = cur.fetchall()
 
         return pd.DataFrame(results)
@@ -265,8 +443,6 @@ def _load_tables_indexes(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
 def _process_index_cols_pg(tbl_cols, tbl_indexes) -> pd.DataFrame:
     # Convert lists to DataFrames if they aren't already
@@ -363,12 +539,10 @@ def _process_index_cols_pg(tbl_cols, tbl_indexes) -> pd.DataFrame:
     
     return output
 
-def _load_tables_foreign_keys(conn_settings: DBConnSettings) -> pd.DataFrame:
-    conn = None
+def _load_tables_foreign_keys(session: DBSession, entity_filter: Optional[List[str]] = None) -> pd.DataFrame:
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
         
         sql = """SELECT fk.conrelid as fkey_table_id, fk.confrelid as rkey_table_id, fk.oid AS fkey_constid,fk.conname as fk_name, ns.nspname as fkey_table_schema, t.relname as fkey_table_name, ns_f.nspname as rkey_table_schema,t_f.relname as rkey_table_name,
             CASE confdeltype
@@ -388,7 +562,8 @@ def _load_tables_foreign_keys(conn_settings: DBConnSettings) -> pd.DataFrame:
                             inner join pg_class t_f on fk.confrelid=t_f.oid
                                 inner join pg_namespace ns_f on ns_f.oid = t_f.relnamespace
                         where fk.contype = 'f'"""
-        cur.execute(sql)
+        sql += _entity_filter_clause(cur, "ns.nspname || '.' || t.relname", entity_filter)
+        session.execute(cur, sql, "tables_foreign_keys")
         results = cur.fetchall()
         
         return pd.DataFrame(results)
@@ -400,8 +575,6 @@ def _load_tables_foreign_keys(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
 def _process_fk_cols_pg(tbl_cols, tbl_fks) -> pd.DataFrame:
     tbl_cols = pd.DataFrame(tbl_cols) if not isinstance(tbl_cols, pd.DataFrame) else tbl_cols
@@ -435,84 +608,65 @@ def _process_fk_cols_pg(tbl_cols, tbl_fks) -> pd.DataFrame:
     # Convert f_cols and r_cols to lists of integers
     tbl_fks['f_cols'] = tbl_fks['f_cols'].apply(utils.parse_pg_array)
     tbl_fks['r_cols'] = tbl_fks['r_cols'].apply(utils.parse_pg_array)
-    
-    # Create rows list to store results
-    rows = []
-    
-    # Process each FK row
-    for _, fk_row in tbl_fks.iterrows():
-        f_cols = fk_row['f_cols']  # foreign key columns (now list of integers)
-        r_cols = fk_row['r_cols']  # referenced columns (now list of integers)
-        
-        # Process each pair of columns
-        for idx, (f_col_id, r_col_id) in enumerate(zip(f_cols, r_cols)):
-            # Get foreign key column info
-            f_mask = (
-                (tbl_cols['table_schema'] == str(fk_row['fkey_table_schema'])) &
-                (tbl_cols['table_name'] == str(fk_row['fkey_table_name'])) &
-                (tbl_cols['column_id'] == f_col_id)  # Now comparing integers
-            )
-            
-            # Handle potential missing matches
-            f_col_match = tbl_cols[f_mask]
-            if f_col_match.empty:
-                print(f"Warning: No match found for foreign key column {f_col_id} in table {fk_row['fkey_table_schema']}.{fk_row['fkey_table_name']}")
-                continue
-            f_col = f_col_match.iloc[0]
-            
-            # Get referenced column info
-            r_mask = (
-                (tbl_cols['table_schema'] == str(fk_row['rkey_table_schema'])) &
-                (tbl_cols['table_name'] == str(fk_row['rkey_table_name'])) &
-                (tbl_cols['column_id'] == r_col_id)  # Now comparing integers
-            )
-            
-            # Handle potential missing matches
-            r_col_match = tbl_cols[r_mask]
-            if r_col_match.empty:
-                print(f"Warning: No match found for referenced column {r_col_id} in table {fk_row['rkey_table_schema']}.{fk_row['rkey_table_name']}")
-                continue
-            r_col = r_col_match.iloc[0]
-            
-            # Construct fkey_table_id and fkey_constid if they're not present
-            fkey_table_id = fk_row.get('fkey_table_id', f"{fk_row['fkey_table_schema']}.{fk_row['fkey_table_name']}")
-            fkey_constid = fk_row.get('fkey_constid', str(idx))
-            
-            # Create new row
-            new_row = {
-                'fkey_table_id': fkey_table_id,
-                'fkey_constid': fkey_constid,
-                'fk_name': fk_row['fk_name'],
-                'keyno': idx,
-                'fkey_table_schema': fk_row['fkey_table_schema'],
-                'fkey_table_name': fk_row['fkey_table_name'],
-                'rkey_table_schema': fk_row['rkey_table_schema'],
-                'rkey_table_name': fk_row['rkey_table_name'],
-                'fkey_col_name': f_col['col_name'],
-                'rkey_col_name': r_col['col_name']
-            }
-            rows.append(new_row)
-    
-    # Convert rows to DataFrame
-    if rows:
-        output = pd.DataFrame(rows)
-    
-    return output
+
+    # One row per (FK, column pair); keyno is the pair's position within its FK
+    pairs = tbl_fks.reset_index(drop=True)
+    pairs['col_pair'] = [list(zip(f_cols, r_cols)) for f_cols, r_cols in zip(pairs['f_cols'], pairs['r_cols'])]
+    pairs = pairs.explode('col_pair')
+    pairs = pairs[pairs['col_pair'].notna()]
+    if pairs.empty:
+        return output
+    pairs['keyno'] = pairs.groupby(level=0).cumcount()
+    pairs['f_col_id'] = pd.Series([pair[0] for pair in pairs['col_pair']], index=pairs.index, dtype='int64')
+    pairs['r_col_id'] = pd.Series([pair[1] for pair in pairs['col_pair']], index=pairs.index, dtype='int64')
+
+    # Look up both column names by (schema, table, attnum); left merges keep the FK/keyno order
+    col_names = tbl_cols[['table_schema', 'table_name', 'column_id', 'col_name']].drop_duplicates(['table_schema', 'table_name', 'column_id'])
+    result = pairs.merge(
+        col_names.rename(columns={'table_schema': 'fkey_table_schema', 'table_name': 'fkey_table_name', 'column_id': 'f_col_id', 'col_name': 'fkey_col_name'}),
+        how='left', on=['fkey_table_schema', 'fkey_table_name', 'f_col_id']
+    ).merge(
+        col_names.rename(columns={'table_schema': 'rkey_table_schema', 'table_name': 'rkey_table_name', 'column_id': 'r_col_id', 'col_name': 'rkey_col_name'}),
+        how='left', on=['rkey_table_schema', 'rkey_table_name', 'r_col_id']
+    )
+
+    # Handle potential missing matches
+    f_missing = result['fkey_col_name'].isna()
+    r_missing = ~f_missing & result['rkey_col_name'].isna()
+    for _, row in result[f_missing].iterrows():
+        print(f"Warning: No match found for foreign key column {row['f_col_id']} in table {row['fkey_table_schema']}.{row['fkey_table_name']}")
+    for _, row in result[r_missing].iterrows():
+        print(f"Warning: No match found for referenced column {row['r_col_id']} in table {row['rkey_table_schema']}.{row['rkey_table_name']}")
+    result = result[~(f_missing | r_missing)].reset_index(drop=True)
+    if result.empty:
+        return output
+
+    # Use fkey_table_id and fkey_constid from the query, or construct them if they're not present
+    return pd.DataFrame({
+        'fkey_table_id': result['fkey_table_id'] if 'fkey_table_id' in result.columns else result['fkey_table_schema'] + '.' + result['fkey_table_name'],
+        'fkey_constid': result['fkey_constid'] if 'fkey_constid' in result.columns else result['keyno'].astype(str),
+        'fk_name': result['fk_name'],
+        'keyno': result['keyno'],
+        'fkey_table_schema': result['fkey_table_schema'],
+        'fkey_table_name': result['fkey_table_name'],
+        'rkey_table_schema': result['rkey_table_schema'],
+        'rkey_table_name': result['rkey_table_name'],
+        'fkey_col_name': result['fkey_col_name'],
+        'rkey_col_name': result['rkey_col_name']
+    })
 
 #def load_tables_defaults():
      #!implement (did not have it in .net... does PG needs it? where are its defaults? we didn't query already at this point?)
 
-def _load_check_constraints(conn_settings: DBConnSettings) -> pd.DataFrame:
+def _load_check_constraints(session: DBSession, entity_filter: Optional[List[str]] = None) -> pd.DataFrame:
     """Load check constraints from PostgreSQL database."""
-    conn = None
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
 
         # Query check constraints from pg_constraint
         # contype='c' means check constraint
-        sql = """
+        sql = f"""
             SELECT
                 ns.nspname AS table_schema,
                 t.relname AS table_name,
@@ -525,9 +679,10 @@ def _load_check_constraints(conn_settings: DBConnSettings) -> pd.DataFrame:
             WHERE con.contype = 'c'
               AND ns.nspname NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
               AND ns.nspname NOT LIKE 'pg_temp%'
+              {_entity_filter_clause(cur, "ns.nspname || '.' || t.relname", entity_filter)}
             ORDER BY ns.nspname, t.relname, con.conname
         """
-        cur.execute(sql)
+        session.execute(cur, sql, "check_constraints")
         results = cur.fetchall()
 
         return pd.DataFrame(results)
@@ -539,39 +694,19 @@ def _load_check_constraints(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
-def _load_coded_ents(conn_settings: DBConnSettings) -> pd.DataFrame:
-    conn = None
+def _load_coded_ents(session: DBSession, entity_filter: Optional[List[str]] = None) -> pd.DataFrame:
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        #had this code here that claude converted, essentially to select only coded ents taht are in tbl_ents. but i dont pass tbl_ents as param and all other load funcs in this module load the whole thing
-        #so for now, i just load the whole thing
-        """coded_script_rows = schema_entities[
-            (schema_entities['ScriptSchema'] == True) & 
-            (schema_entities['EntType'] != 'Table')
-        ]
-
-        coded_schema_name_in = []
-        for _, row in coded_script_rows.iterrows():
-            # Add schema.name with quotes for SQL IN clause
-            coded_schema_name_in.append(f"'{row['EntSchema']}.{row['EntName']}'")
-
-        # Join the names with commas to create a complete IN clause string
-        coded_schema_name_in_str = ','.join(coded_schema_name_in)
-
-        if coded_schema_name_in:"""
-        #real code returns here:
+        cur = session.cursor()
+        # with a filter, pg_get_functiondef only runs for the requested functions
         sql = f"""
         Select table_schema || '.' || table_name AS EntKey, table_schema as code_schema, table_name as code_name, 
                 'V' as EntType, 'View' as enttype_pg, 
                 'CREATE OR REPLACE VIEW ' || table_schema || '.' || table_name || E'\\nAS\\n' || view_definition AS definition, 
                 NULL as param_type_list 
         From information_schema.views
-        Where table_schema Not In ('information_schema', 'pg_catalog')
+        Where table_schema Not In ('information_schema', 'pg_catalog'){_entity_filter_clause(cur, "table_schema || '.' || table_name", entity_filter)}
         UNION
         Select n.nspname || '.' || p.proname  AS EntKey, n.nspname as code_schema,
             p.proname as code_name,    
@@ -588,17 +723,16 @@ def _load_coded_ents(conn_settings: DBConnSettings) -> pd.DataFrame:
         Left Join pg_namespace n on p.pronamespace = n.oid
         Left Join pg_language l on p.prolang = l.oid
         Left Join pg_type t on t.oid = p.prorettype 
-        where n.nspname Not in ('pg_catalog', 'information_schema')            
+        where n.nspname Not in ('pg_catalog', 'information_schema'){_entity_filter_clause(cur, "n.nspname || '.' || p.proname", entity_filter)}
         UNION
         Select trigger_schema || '.' || trigger_name AS EntKey, trigger_schema As code_schema,
             trigger_name As code_name,
             'TR' as EntType, 'Trigger' as enttype_pg, action_statement As definition, NULL as param_type_list 
         From information_schema.triggers
+        Where true{_entity_filter_clause(cur, "trigger_schema || '.' || trigger_name", entity_filter)}
         Group By 1, 2, 3, 4, 5, 6
         """
-        #AND ( (n.nspname || '.' || p.proname) IN ({','.join(coded_schema_name_in)}) ) NOTE: reactivate this if you wnat specific loading. right above the last UNION
-        # In implementation, this would be queried using an appropriate DB adapter
-        cur.execute(sql)
+        session.execute(cur, sql, "coded_ents")
         results = cur.fetchall()
         
         return pd.DataFrame(results)
@@ -610,27 +744,52 @@ def _load_coded_ents(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
     
-def load_all_db_ents(conn_settings: DBConnSettings, entity_filter: Optional[List[str]] = None) -> pd.DataFrame:
-    conn = None
+def _load_db_ents_rows(session: DBSession, catalog_backend: str, entity_filter: Optional[List[str]] = None):
+    """The entity list (tables, views, functions, procedures, triggers), the FK dependency rows between tables
+    and the dependency rows between coded entities."""
     cur = None
-    tbl_ents = pd.DataFrame()  # Initialize to avoid unbound variable
     try:
-        conn = Database.connect_to_database(conn_settings)
-        
-        # First, fetch the database entities
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        entities_sql = """SELECT CAST(1 as boolean) AS ScriptSchema, CAST(0 as boolean) as ScriptData, CAST(0 as bit) as ScriptSortOrder, table_schema || '.' || table_name AS EntKey,
-                    table_schema as EntSchema, table_name as EntName, 'U' as EntBaseType, 'Table' AS EntType, NULL as EntParamList, NULL as EntParamListTypes
-                FROM information_schema.tables
-                where table_schema not in ('information_schema', 'pg_catalog') and TABLE_TYPE<>'VIEW'
-                UNION
-                select CAST(1 as boolean) AS ScriptSchema, CAST(0 as boolean) as ScriptData, CAST(0 as bit) as ScriptSortOrder, table_schema || '.' || table_name AS EntKey,table_schema as EntSchema, table_name as EntName, 'V' as EntBaseType, 'View' as EntType, NULL as EntParamList, NULL as EntParamListTypes
-                from information_schema.views
-                where table_schema not in ('information_schema', 'pg_catalog')
+        cur = session.cursor()
+        def filter_on(key_expr):
+            return _entity_filter_clause(cur, key_expr, entity_filter)
+        if catalog_backend == "pg_catalog":
+            tables_views_sql = f"""SELECT CAST(1 as boolean) AS ScriptSchema, CAST(0 as boolean) as ScriptData, CAST(0 as bit) as ScriptSortOrder, n.nspname || '.' || c.relname AS EntKey,
+                        n.nspname as EntSchema, c.relname as EntName,
+                        CASE c.relkind WHEN 'v' THEN 'V' ELSE 'U' END as EntBaseType, CASE c.relkind WHEN 'v' THEN 'View' ELSE 'Table' END AS EntType, NULL as EntParamList, NULL as EntParamListTypes
+                    FROM pg_class c
+                    INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE c.relkind IN ('r', 'p', 'f', 'v') AND NOT pg_is_other_temp_schema(n.oid)
+                    AND n.nspname not in ('information_schema', 'pg_catalog'){filter_on("n.nspname || '.' || c.relname")}"""
+            triggers_sql = f"""Select CAST(1 as boolean) AS ScriptSchema, CAST(0 as boolean) as ScriptData, CAST(0 as bit) as ScriptSortOrder, n.nspname || '.' || tg.tgname AS EntKey, n.nspname As EntSchema,
+                        tg.tgname As EntName,
+                        'TR' as EntBaseType,
+                        'Trigger' as EntType,
+                        NULL as EntParamList, NULL as EntParamListTypes
+                    FROM pg_trigger tg
+                    INNER JOIN pg_class c ON c.oid = tg.tgrelid
+                    INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE NOT tg.tgisinternal AND (tg.tgtype & 28) <> 0 AND NOT pg_is_other_temp_schema(n.oid){filter_on("n.nspname || '.' || tg.tgname")}
+                    Group By 1, 2, 3, 4, 5, 6, 7, 8"""  # tgtype 28 = INSERT|DELETE|UPDATE, the events information_schema.triggers lists
+        else:
+            tables_views_sql = f"""SELECT CAST(1 as boolean) AS ScriptSchema, CAST(0 as boolean) as ScriptData, CAST(0 as bit) as ScriptSortOrder, table_schema || '.' || table_name AS EntKey,
+                        table_schema as EntSchema, table_name as EntName, 'U' as EntBaseType, 'Table' AS EntType, NULL as EntParamList, NULL as EntParamListTypes
+                    FROM information_schema.tables
+                    where table_schema not in ('information_schema', 'pg_catalog') and TABLE_TYPE<>'VIEW'{filter_on("table_schema || '.' || table_name")}
+                    UNION
+                    select CAST(1 as boolean) AS ScriptSchema, CAST(0 as boolean) as ScriptData, CAST(0 as bit) as ScriptSortOrder, table_schema || '.' || table_name AS EntKey,table_schema as EntSchema, table_name as EntName, 'V' as EntBaseType, 'View' as EntType, NULL as EntParamList, NULL as EntParamListTypes
+                    from information_schema.views
+                    where table_schema not in ('information_schema', 'pg_catalog'){filter_on("table_schema || '.' || table_name")}"""
+            triggers_sql = f"""Select CAST(1 as boolean) AS ScriptSchema, CAST(0 as boolean) as ScriptData, CAST(0 as bit) as ScriptSortOrder, trigger_schema || '.' || trigger_name AS EntKey, trigger_schema As EntSchema,
+                                            trigger_name As EntName,
+                                            'TR' as EntBaseType,
+                                            'Trigger' as EntType,
+                                            NULL as EntParamList, NULL as EntParamListTypes
+                    FROM information_schema.triggers
+                    WHERE true{filter_on("trigger_schema || '.' || trigger_name")}
+                    Group By 1, 2, 3, 4, 5, 6, 7, 8"""
+        entities_sql = f"""{tables_views_sql}
                 UNION
                 select CAST(1 as boolean) AS ScriptSchema, CAST(0 as boolean) as ScriptData, CAST(0 as bit) as ScriptSortOrder, n.nspname || '.' || p.proname  AS EntKey, n.nspname as EntSchema,
                     p.proname as EntName,
@@ -642,35 +801,118 @@ def load_all_db_ents(conn_settings: DBConnSettings, entity_filter: Optional[List
                 left join pg_namespace n on p.pronamespace = n.oid
                 left join pg_language l on p.prolang = l.oid
                 left join pg_type t on t.oid = p.prorettype
-                where n.nspname not in ('pg_catalog', 'information_schema')
+                where n.nspname not in ('pg_catalog', 'information_schema'){filter_on("n.nspname || '.' || p.proname")}
                 UNION
-                Select CAST(1 as boolean) AS ScriptSchema, CAST(0 as boolean) as ScriptData, CAST(0 as bit) as ScriptSortOrder, trigger_schema || '.' || trigger_name AS EntKey, trigger_schema As EntSchema,
-                                        trigger_name As EntName,
-                                        'TR' as EntBaseType,
-                                        'Trigger' as EntType,
-                                        NULL as EntParamList, NULL as EntParamListTypes
-                FROM information_schema.triggers
-                Group By 1, 2, 3, 4, 5, 6, 7, 8"""
-        cur.execute(entities_sql)
+                {triggers_sql}"""
+        session.execute(cur, entities_sql, "db_ents")
         entities_results = cur.fetchall()
-        tbl_ents = pd.DataFrame(entities_results)
-        
-        # Apply filter if provided
-        if entity_filter:
-            tbl_ents = tbl_ents[tbl_ents['entkey'].isin(entity_filter)]
+        tbl_ents = pd.DataFrame(entities_results, columns=[col.name for col in cur.description])
         
-        # Rest of the function remains the same...
         # Now, fetch the foreign key dependencies
-        fk_sql = """SELECT ns.nspname as child_schema, t.relname as child_table, ns_f.nspname as parent_schema,t_f.relname as parent_table 
+        # only edges between two loaded tables matter for the sort order
+        fk_sql = f"""SELECT ns.nspname as child_schema, t.relname as child_table, ns_f.nspname as parent_schema,t_f.relname as parent_table 
         FROM pg_catalog.pg_constraint fk 
             inner join pg_class t on fk.conrelid = t.oid
             inner join pg_namespace ns on ns.oid = t.relnamespace
             inner join pg_class t_f on fk.confrelid=t_f.oid
             inner join pg_namespace ns_f on ns_f.oid = t_f.relnamespace
-        where fk.contype = 'f';
+        where fk.contype = 'f'{filter_on("ns.nspname || '.' || t.relname")}{filter_on("ns_f.nspname || '.' || t_f.relname")};
         """
-        cur.execute(fk_sql)
-        fk_results = cur.fetchall()
+        session.execute(cur, fk_sql, "db_ents_fk_dependencies")
+        fk_results = [dict(row) for row in cur.fetchall()]
+
+        # and the dependencies between coded entities: a view's are recorded against its rewrite rule, a function's
+        # (SQL-standard bodies, argument and return types) against itself, a dependency on a view's row type is one
+        # on the view, and a trigger depends on its function. Only edges between two loaded entities are used
+        code_deps_sql = """WITH ents AS (
+            SELECT 'pg_class'::regclass::oid AS classid, c.oid AS objid, n.nspname || '.' || c.relname AS ent_key, NULL::text AS ent_params
+            FROM pg_class c INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relkind = 'v' AND n.nspname NOT IN ('information_schema', 'pg_catalog')
+            UNION ALL
+            SELECT 'pg_proc'::regclass::oid, p.oid, n.nspname || '.' || p.proname, pg_get_function_arguments(p.oid)
+            FROM pg_proc p INNER JOIN pg_namespace n ON n.oid = p.pronamespace
+            WHERE n.nspname NOT IN ('information_schema', 'pg_catalog')
+        ), deps AS (
+            SELECT 'pg_class'::regclass::oid AS classid, r.ev_class AS objid, d.refclassid, d.refobjid
+            FROM pg_depend d INNER JOIN pg_rewrite r ON d.classid = 'pg_rewrite'::regclass AND d.objid = r.oid
+            UNION ALL
+            SELECT d.classid, d.objid, d.refclassid, d.refobjid
+            FROM pg_depend d WHERE d.classid = 'pg_proc'::regclass
+        ), refs AS (
+            SELECT deps.classid, deps.objid,
+                CASE WHEN t.oid IS NULL THEN deps.refclassid ELSE 'pg_class'::regclass::oid END AS refclassid,
+                CASE WHEN t.oid IS NULL THEN deps.refobjid ELSE t.typrelid END AS refobjid
+            FROM deps LEFT JOIN pg_type t ON deps.refclassid = 'pg_type'::regclass AND t.oid = deps.refobjid AND t.typrelid <> 0
+        )
+        SELECT dep.ent_key AS dep_key, dep.ent_params AS dep_params, ref.ent_key AS ref_key, ref.ent_params AS ref_params
+        FROM refs
+            INNER JOIN ents dep ON dep.classid = refs.classid AND dep.objid = refs.objid
+            INNER JOIN ents ref ON ref.classid = refs.refclassid AND ref.objid = refs.refobjid
+        WHERE dep.objid <> ref.objid OR dep.classid <> ref.classid
+        UNION
+        SELECT n.nspname || '.' || tg.tgname, NULL, fn.nspname || '.' || p.proname, pg_get_function_arguments(p.oid)
+        FROM pg_trigger tg
+            INNER JOIN pg_class c ON c.oid = tg.tgrelid INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+            INNER JOIN pg_proc p ON p.oid = tg.tgfoid INNER JOIN pg_namespace fn ON fn.oid = p.pronamespace
+        WHERE NOT tg.tgisinternal AND fn.nspname NOT IN ('information_schema', 'pg_catalog');
+        """
+        session.execute(cur, code_deps_sql, "db_ents_code_dependencies")
+        code_dep_results = [dict(row) for row in cur.fetchall()]
+        return tbl_ents, fk_results, code_dep_results
+    finally:
+        if cur:
+            cur.close()
+
+
+def _set_coded_ents_sort_order(tbl_ents: pd.DataFrame, code_deps: List[dict]) -> None:
+    """Number the coded entities (views, functions, procedures, triggers) after the tables, each one after the
+    entities it depends on (code_deps, see _load_db_ents_rows), so the script creates them in scriptsortorder in
+    one pass and drops them in reverse. Unrelated entities keep their load order; on a cycle nothing is changed."""
+    coded_mask = tbl_ents['enttype'] != 'Table'
+    if tbl_ents.empty or not coded_mask.any():
+        return
+    # overloads are told apart by their param list; a missing one is an empty one (as in the catalog lookups)
+    def ent_node(key, params):
+        return (key, '' if params is None or pd.isna(params) else params)
+    nodes = [ent_node(key, params) for key, params in zip(tbl_ents.loc[coded_mask, 'entkey'], tbl_ents.loc[coded_mask, 'entparamlist'])]
+    position = {}
+    for node in nodes:
+        position.setdefault(node, len(position))
+
+    G = nx.DiGraph()
+    G.add_nodes_from(position)
+    for dep in code_deps:
+        dep_node = ent_node(dep['dep_key'], dep['dep_params'])
+        ref_node = ent_node(dep['ref_key'], dep['ref_params'])
+        if dep_node in position and ref_node in position and dep_node != ref_node:
+            G.add_edge(ref_node, dep_node)  # created before the entity depending on it
+    try:
+        sorted_ents = list(nx.lexicographical_topological_sort(G, key=position.get))
+    except nx.NetworkXUnfeasible:
+        print("Warning: Cycle detected in coded entity dependencies.")
+        return
+
+    tables_order = tbl_ents.loc[~coded_mask, 'scriptsortorder']
+    first_order = int(tables_order.max()) + 1 if not tables_order.empty else 1
+    sort_order = {node: first_order + i for i, node in enumerate(sorted_ents)}
+    tbl_ents.loc[coded_mask, 'scriptsortorder'] = [sort_order[node] for node in nodes]
+
+
+def load_all_db_ents(conn_settings: DBConnSettings, entity_filter: Optional[List[str]] = None, session: Optional[DBSession] = None, catalog_backend: str = "information_schema", cache: Optional[CatalogCache] = None) -> pd.DataFrame:
+    own_session = session is None
+    if own_session:
+        session = DBSession(conn_settings)
+    tbl_ents = pd.DataFrame()  # Initialize to avoid unbound variable
+    try:
+        # First, fetch the database entities; the filter is applied in the catalog queries
+        options = f"backend={catalog_backend};filter={','.join(sorted(entity_filter or []))}"
+        cached = cache.get(session, "db_ents", options) if cache else None
+        if cached is not None:
+            tbl_ents, fk_results, code_dep_results = cached
+        else:
+            tbl_ents, fk_results, code_dep_results = _load_db_ents_rows(session, catalog_backend, entity_filter)
+            if cache:
+                cache.put(session, "db_ents", options, (tbl_ents, fk_results, code_dep_results))
         
         # Create a directed graph for dependencies
         G = nx.DiGraph()
@@ -716,6 +958,8 @@ def load_all_db_ents(conn_settings: DBConnSettings, entity_filter: Optional[List
                 lambda row: 1 if row["enttype"] == "Table" else 2, 
                 axis=1
             )
+
+        _set_coded_ents_sort_order(tbl_ents, code_dep_results)
         
         return tbl_ents
         
@@ -724,34 +968,34 @@ def load_all_db_ents(conn_settings: DBConnSettings, entity_filter: Optional[List
         return tbl_ents
         
     finally:
-        if cur:
-            cur.close()
-        if conn:
-            conn.close()
-
-
-def load_all_tables_data(conn_settings: DBConnSettings,db_all: DBSchema, table_names: List[str]) -> None:    
-    conn = None
-    cur = None
+        if own_session:
+            session.close()
+
+
+@dataclass
+class TableChunk:
+    """One slice of a table for a chunked data load: a WHERE clause, and the ORDER BY that keeps its rows in key order."""
+    where: str
+    order_by: Optional[str]
+    label: str
+
+
+def load_all_tables_data(conn_settings: DBConnSettings,db_all: DBSchema, table_names: List[str], session: Optional[DBSession] = None, itersize: Optional[int] = None, use_copy: bool = False, parallel_workers: int = 1, chunk_rows: int = 0) -> None:
+    """Load the rows of each table into db_all.tables_data.
+    With use_copy, each table is read with COPY ... TO STDOUT and parsed column by column (see _copy_table_data).
+    Otherwise, with itersize set, rows are streamed through a server-side cursor and the frame is built in chunks of itersize rows.
+    With parallel_workers > 1, tables are spread over that many worker processes, largest first, and tables estimated
+    bigger than chunk_rows (if set) are split into key ranges loaded concurrently (see _load_tables_data_parallel)."""
+    own_session = session is None
+    if own_session:
+        session = DBSession(conn_settings)
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        
+        if parallel_workers > 1 and (len(table_names) > 1 or chunk_rows) and _load_tables_data_parallel(session, db_all, table_names, parallel_workers, itersize, use_copy, chunk_rows):
+            return
+
         for table_name in table_names:
-            # Handle table names with or without schema
-            if '.' in table_name:
-                schema_name, table_only = table_name.split('.')
-                query = f'SELECT * FROM {schema_name}.{table_only}'
-            else:
-                # Default to public schema if not specified
-                query = f'SELECT * FROM {table_name}'
-            
             try:
-                cur.execute(query)
-                results = cur.fetchall()
-                
-                # Create DataFrame from results
-                df = pd.DataFrame(results)
+                df = _load_table_data(session, table_name, itersize, use_copy)
                 
                 # Store in the DBSchema object
                 db_all.tables_data[table_name] = df
@@ -765,27 +1009,367 @@ def load_all_tables_data(conn_settings: DBConnSettings,db_all: DBSchema, table_n
     except Exception as e:
         print(f"Database connection error: {e}")
 
+    finally:
+        if own_session:
+            session.close()
+
+
+class PipelinedTablesData(dict):
+    """A tables_data dict that loads table data on demand, window_tables tables at a time, in table_names order.
+    Looking up a table that isn't loaded frees the tables loaded so far and loads the window starting at that table
+    (with load_window, e.g. load_all_tables_data with its other arguments bound), so only one window's frames are in
+    memory at once. Membership is answered from table_names, without loading anything."""
+
+    def __init__(self, table_names: List[str], load_window: Callable[[List[str]], None], window_tables: int = 1):
+        super().__init__()
+        self.table_names = list(table_names)
+        self.load_window = load_window
+        self.window_tables = max(1, window_tables)
+        self.windows_loaded = 0
+
+    def __contains__(self, table_name) -> bool:
+        return dict.__contains__(self, table_name) or table_name in self.table_names
+
+    def __missing__(self, table_name: str) -> pd.DataFrame:
+        if table_name not in self.table_names:
+            raise KeyError(table_name)
+        pos = self.table_names.index(table_name)
+        self.clear()  # free the previous window before loading the next one
+        self.load_window(self.table_names[pos:pos + self.window_tables])
+        self.windows_loaded += 1
+        return dict.__getitem__(self, table_name)  # KeyError if its load failed, like a table missing from tables_data
+
+
+def _load_table_data(session: DBSession, table_name: str, itersize: Optional[int], use_copy: bool, chunk: Optional[TableChunk] = None) -> pd.DataFrame:
+    # Handle table names with or without schema
+    if '.' in table_name:
+        schema_name, table_only = table_name.split('.')
+        query = f'SELECT * FROM {schema_name}.{table_only}'
+    else:
+        # Default to public schema if not specified
+        query = f'SELECT * FROM {table_name}'
+    label = table_name
+    if chunk is not None:
+        query += f" WHERE {chunk.where}" + (f" ORDER BY {chunk.order_by}" if chunk.order_by else "")
+        label = f"{table_name} [{chunk.label}]"
+
+    if use_copy:
+        return _copy_table_data(session, query, label)
+    if itersize:
+        return _stream_table_data(session, query, label, itersize)
+
+    cur = session.cursor()
+    try:
+        session.execute(cur, query, f"data {label}")
+        results = cur.fetchall()
+
+        # Create DataFrame from results
+        return pd.DataFrame(results)
+    finally:
+        cur.close()
+
+
+def _load_tables_data_parallel(session: DBSession, db_all: DBSchema, table_names: List[str], num_workers: int, itersize: Optional[int], use_copy: bool, chunk_rows: int = 0) -> bool:
+    """Load the tables on a pool of worker processes that all import one snapshot exported by session, so the data
+    is consistent across tables. Biggest tables (by pg_class estimates) are submitted first so they don't end up
+    running alone at the end. With chunk_rows, tables estimated bigger than that are split into key ranges
+    (see _plan_table_chunks) that are loaded as separate tasks and put back together in key order.
+    Returns False if the snapshot can't be exported (caller loads serially)."""
+    try:
+        snapshot_id = session.export_snapshot()
+    except Exception as e:
+        print(f"Could not export snapshot for parallel data load, loading serially: {e}")
+        session.end_snapshot()
+        return False
+
+    try:
+        sizes = _estimate_table_sizes(session, table_names)
+        ordered = sorted(table_names, key=lambda name: sizes.get(name, (0, 0)), reverse=True)
+        # spawn, not fork: a forked child would share the parent's open connection socket
+        chunks = {table_name: _plan_table_chunks(session, db_all, table_name, sizes.get(table_name), chunk_rows) if chunk_rows else [None]
+                  for table_name in ordered}
+        num_tasks = sum(len(table_chunks) for table_chunks in chunks.values())
+        with ProcessPoolExecutor(max_workers=min(num_workers, num_tasks), mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_data_worker, initargs=(session.conn_settings, snapshot_id)) as pool:
+            futures = {table_name: [pool.submit(_load_table_data_in_worker, table_name, itersize, use_copy, chunk) for chunk in chunks[table_name]]
+                       for table_name in ordered}
+            for table_name in table_names:
+                parts, errors = [], []
+                for future in futures[table_name]:
+                    try:
+                        df, timings, connections, error = future.result()
+                    except Exception as e:
+                        errors.append(str(e))
+                        continue
+                    session.timings.extend(timings)
+                    session.count_connections(connections)
+                    if error is not None:
+                        errors.append(error)
+                    else:
+                        parts.append(_swap_bytea_values(df, to_bytes=False))
+                if errors:
+                    print(f"Error loading table {table_name}: {errors[0]}")
+                    continue
+                df = _concat_frames(parts)
+                db_all.tables_data[table_name] = df
+                print(f"Loaded {len(df)} rows for table: {table_name}")
+        return True
+    finally:
+        session.end_snapshot()
+
+
+def _estimate_table_sizes(session: DBSession, table_names: List[str]) -> Dict[str, tuple]:
+    """(relpages, reltuples) of each table, from the planner statistics in pg_class (no table scan)."""
+    cur = None
+    try:
+        cur = session.cursor()
+        sql = """SELECT t.name, c.relpages, c.reltuples
+                FROM unnest(%s::text[]) AS t(name)
+                INNER JOIN pg_class c ON c.oid = to_regclass(t.name)"""
+        session.execute(cur, sql, "table_sizes", (list(table_names),))
+        return {row['name']: (row['relpages'], row['reltuples']) for row in cur.fetchall()}
+    except Exception as e:
+        print(f"Error: {e}")
+        return {}
+    finally:
+        if cur:
+            cur.close()
+
+
+def _plan_table_chunks(session: DBSession, db_all: DBSchema, table_name: str, size: Optional[tuple], chunk_rows: int) -> List[Optional[TableChunk]]:
+    """Split a table estimated at more than chunk_rows rows into ranges of its unique key (the index the data
+    generator matches rows on: primary key first). Range bounds come from the pg_stats histogram of the key's
+    leading column, so planning doesn't scan the table. Without a usable key or histogram, splits on ctid
+    page ranges instead. Returns [None] (load whole) for tables that don't need splitting."""
+    if size is None:
+        return [None]
+    relpages, reltuples = size
+    num_chunks = math.ceil(reltuples / chunk_rows) if reltuples > 0 else 0
+    if num_chunks < 2:
+        return [None]
+
+    key_cols = _unique_key_cols(db_all, table_name)
+    if key_cols:
+        bounds = _key_histogram_bounds(session, table_name, key_cols[0], num_chunks)
+        if bounds:
+            return _key_range_chunks(session, key_cols, bounds)
+
+    num_chunks = min(num_chunks, relpages)
+    if num_chunks < 2:
+        return [None]
+    pages = [round(i * relpages / num_chunks) for i in range(num_chunks)]
+    chunks = []
+    for i, start in enumerate(pages):
+        # the last range is open ended: pages added since the last ANALYZE still get read
+        where = f"ctid >= '({start},0)'::tid" + (f" AND ctid < '({pages[i + 1]},0)'::tid" if i + 1 < len(pages) else "")
+        chunks.append(TableChunk(where, None, f"{i + 1}/{len(pages)}"))
+    return chunks
+
+
+def _unique_key_cols(db_all: DBSchema, table_name: str) -> List[str]:
+    indexes = db_all.catalog.indexes.rows(table_name)
+    if indexes.empty:
+        return []
+    unq_index = indexes[indexes["is_unique"] == 1].sort_values("is_primary_key", ascending=False)
+    if unq_index.empty:
+        return []
+    cols = db_all.catalog.index_cols_by_id.rows(table_name, unq_index.iloc[0]["index_id"])
+    return cols.sort_values("key_ordinal")["col_name"].tolist()
+
+
+def _key_histogram_bounds(session: DBSession, table_name: str, col_name: str, num_chunks: int) -> List[str]:
+    """num_chunks - 1 evenly spaced values from the column's pg_stats histogram (as text), or [] if it has none."""
+    if '.' not in table_name:
+        return []
+    schema_name, table_only = table_name.split('.')
+    cur = None
+    try:
+        cur = session.cursor()
+        sql = """SELECT histogram_bounds::text::text[] AS bounds FROM pg_stats
+                WHERE schemaname = %s AND tablename = %s AND attname = %s"""
+        session.execute(cur, sql, f"key_histogram {table_name}", (schema_name, table_only, col_name))
+        row = cur.fetchone()
+    except Exception as e:
+        print(f"Error: {e}")
+        return []
+    finally:
+        if cur:
+            cur.close()
+    hist = row['bounds'] if row and row['bounds'] else []
+    if len(hist) < 3:
+        return []
+    # inner histogram entries only: the first and last are the column's min and max
+    picks = [hist[round(i * (len(hist) - 1) / num_chunks)] for i in range(1, num_chunks)]
+    return list(dict.fromkeys(picks))
+
+
+def _key_range_chunks(session: DBSession, key_cols: List[str], bounds: List[str]) -> List[TableChunk]:
+    cur = session.cursor()
+    try:
+        col = _quote_ident(key_cols[0])
+        order_by = ", ".join(_quote_ident(c) for c in key_cols)
+        # bounds go in as untyped literals, so the server casts them to the column's type
+        conditions = [cur.mogrify(f"{col} < %s", (bounds[0],)).decode()]
+        conditions += [cur.mogrify(f"{col} >= %s AND {col} < %s", (lo, hi)).decode() for lo, hi in zip(bounds, bounds[1:])]
+        conditions.append(cur.mogrify(f"({col} >= %s OR {col} IS NULL)", (bounds[-1],)).decode())
+        return [TableChunk(where, order_by, f"{i + 1}/{len(conditions)}") for i, where in enumerate(conditions)]
+    finally:
+        cur.close()
+
+
+def _quote_ident(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _concat_frames(parts: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate partial frames of one table so the result matches a one-shot load of it."""
+    parts = [part for part in parts if not part.empty]
+    if not parts:
+        return pd.DataFrame()  # same as the one-shot load of an empty table
+    if len(parts) == 1:
+        return parts[0]
+    df = pd.concat(parts, ignore_index=True)
+    for col in df.columns:
+        # e.g. a part that is all NULL in a column comes back as object: rebuild so pandas infers the dtype over all rows
+        if len({str(part[col].dtype) for part in parts}) > 1:
+            df[col] = pd.Series(df[col].tolist())
+    return df
+
+
+# worker process state for _load_tables_data_parallel: one session per process, on the shared snapshot
+_data_worker_session: Optional[DBSession] = None
+
+
+def _init_data_worker(conn_settings: DBConnSettings, snapshot_id: str) -> None:
+    global _data_worker_session
+    _data_worker_session = DBSession(conn_settings, snapshot_id=snapshot_id)
+
+
+def _load_table_data_in_worker(table_name: str, itersize: Optional[int], use_copy: bool, chunk: Optional[TableChunk] = None):
+    session = _data_worker_session
+    timings_before = len(session.timings)
+    connections_before = session.connections_opened
+    df, error = None, None
+    try:
+        # bytea comes back as memoryview, which can't be pickled back to the parent
+        df = _swap_bytea_values(_load_table_data(session, table_name, itersize, use_copy, chunk), to_bytes=True)
+    except Exception as e:
+        error = str(e)
+    return df, session.timings[timings_before:], session.connections_opened - connections_before, error
+
+
+def _swap_bytea_values(df: pd.DataFrame, to_bytes: bool) -> pd.DataFrame:
+    """Swap bytea values between psycopg2's memoryview and bytes (which, unlike memoryview, can be pickled)."""
+    from_type = memoryview if to_bytes else bytes
+    convert = bytes if to_bytes else (lambda v: memoryview(v).cast('c'))  # psycopg2 hands out 'c' format views
+    for col in df.columns[df.dtypes == object]:
+        non_null = df[col].dropna()
+        if len(non_null) and isinstance(non_null.iloc[0], from_type):
+            df[col] = df[col].map(lambda v: convert(v) if isinstance(v, from_type) else v)
+    return df
+
+
+# COPY text format: tab separated, one row per line, NULL is \N and tabs/newlines/backslashes inside values are
+# backslash-escaped, so the raw output splits cleanly on tab and newline and only needs unescaping afterwards
+_COPY_ESCAPE = re.compile(r'\\(?:([0-7]{1,3})|x([0-9A-Fa-f]{1,2})|(.))')
+_COPY_ESCAPE_CHARS = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v'}
+_COPY_INT_OIDS = {20, 21, 23, 26}  # int8, int2, int4, oid
+_COPY_FLOAT_OIDS = {700, 701}  # float4, float8
+_COPY_TEXT_OIDS = {18, 19, 25, 1042, 1043}  # char, name, text, bpchar, varchar
+_COPY_BOOL_OID = 16
+
+
+def _copy_unescape(match: re.Match) -> str:
+    octal, hexa, char = match.groups()
+    if octal:
+        return chr(int(octal, 8))
+    if hexa:
+        return chr(int(hexa, 16))
+    return _COPY_ESCAPE_CHARS.get(char, char)
+
+
+def _copy_table_data(session: DBSession, query: str, table_name: str) -> pd.DataFrame:
+    cur = None
+    try:
+        cur = session.cursor(cursor_factory=None)
+        # no rows, just the result's column names and type oids
+        session.execute(cur, f"{query} LIMIT 0", f"columns {table_name}")
+        columns = [d.name for d in cur.description]
+        type_oids = [d.type_code for d in cur.description]
+
+        buf = io.BytesIO()
+        session.copy_out(cur, f"COPY ({query}) TO STDOUT", buf, f"data {table_name}")
+        if buf.tell() == 0:
+            return pd.DataFrame()  # same as the SELECT load of an empty table
+        data = buf.getvalue()  # shares the buffer, no copy
+        # every backslash belongs to a \N unless some value has escapes (tab, newline, backslash...) to undo
+        has_escapes = data.count(b'\\') != data.count(b'\\N')
+        del data
+        buf.seek(0)
+        # numbers are parsed by the C parser straight into int64/float64 (float64 when there are NULLs, as for a
+        # frame built from row dicts); everything else is read as text and converted per column
+        dtypes = {col: ('float64' if oid in _COPY_FLOAT_OIDS else None if oid in _COPY_INT_OIDS else object)
+                  for col, oid in zip(columns, type_oids)}
+        na_values = {col: (['\\N', 'NaN'] if oid in _COPY_FLOAT_OIDS else ['\\N']) for col, oid in zip(columns, type_oids)}
+        raw = pd.read_csv(buf, sep='\t', header=None, names=columns, dtype={c: t for c, t in dtypes.items() if t},
+                          quoting=csv.QUOTE_NONE, na_values=na_values, keep_default_na=False, skip_blank_lines=False,
+                          encoding=psycopg2.extensions.encodings[cur.connection.encoding])
+        buf.close()
+        return pd.DataFrame({col: _copy_column(raw[col], oid, cur, has_escapes) for col, oid in zip(columns, type_oids)})
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
+
+
+def _copy_column(raw: pd.Series, type_oid: int, cur, has_escapes: bool) -> pd.Series:
+    """Turn one column of COPY text into the values the cursor path would have produced for it."""
+    if type_oid in _COPY_INT_OIDS or type_oid in _COPY_FLOAT_OIDS:
+        return raw
+    nulls = raw.isna()
+    values = raw
+    if has_escapes and raw.str.contains('\\', regex=False, na=False).any():
+        values = values.str.replace(_COPY_ESCAPE, _copy_unescape, regex=True)
+    if type_oid == _COPY_BOOL_OID:
+        values = values.map({'t': True, 'f': False})
+    elif type_oid not in _COPY_TEXT_OIDS:
+        # everything else goes through psycopg2's own typecaster for the type (Decimal, datetime, dict for json,
+        # lists for arrays...). Types psycopg2 has no caster for (uuid, inet, money...) stay text, as with a cursor
+        caster = psycopg2.extensions.string_types.get(type_oid)
+        if caster is not None:
+            return pd.Series([None if is_null else caster(v, cur) for v, is_null in zip(values, nulls)])
+    # built from a list so pandas infers the dtype exactly as for a frame built from row dicts
+    return pd.Series(values.where(~nulls, None).tolist())
+
+
+def _stream_table_data(session: DBSession, query: str, table_name: str, itersize: int) -> pd.DataFrame:
+    # plain tuples from a named cursor: no per-row dict, and only itersize rows are held client side at a time
+    cur = session.get_conn().cursor(name=f"cfs_data_{len(session.timings)}")
+    cur.itersize = itersize
+    try:
+        chunks = []
+        columns = None
+        for rows in session.stream(cur, query, f"data {table_name}", itersize):
+            if columns is None:
+                columns = [d[0] for d in cur.description]
+            chunks.append(pd.DataFrame.from_records(rows, columns=columns))
+        return _concat_frames(chunks)
+    finally:
+        if not cur.closed:
+            cur.close()
 
 
 # ============================================
 # SECURITY LOADING FUNCTIONS
 # ============================================
 
-def _load_roles(conn_settings: DBConnSettings) -> pd.DataFrame:
+def _load_roles(session: DBSession) -> pd.DataFrame:
     """Load all database roles (users and groups) from pg_authid.
     Note: Requires superuser to read password hashes from pg_authid.
     Falls back to pg_roles if not superuser (without passwords).
     """
-    conn = None
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
 
         # Try pg_authid first (requires superuser for password hashes)
         # If that fails, fall back to pg_roles (no passwords)
@@ -806,7 +1390,7 @@ def _load_roles(conn_settings: DBConnSettings) -> pd.DataFrame:
                     WHERE rolname NOT LIKE 'pg_%'
                       AND rolname NOT IN ('postgres')
                     ORDER BY rolname"""
-            cur.execute(sql)
+            session.execute(cur, sql, "roles")
         except Exception:
             # Fall back to pg_roles (accessible to all, but no password hashes)
             sql = """SELECT
@@ -825,7 +1409,7 @@ def _load_roles(conn_settings: DBConnSettings) -> pd.DataFrame:
                     WHERE rolname NOT LIKE 'pg_%'
                       AND rolname NOT IN ('postgres')
                     ORDER BY rolname"""
-            cur.execute(sql)
+            session.execute(cur, sql, "roles")
 
         results = cur.fetchall()
         return pd.DataFrame(results)
@@ -837,17 +1421,13 @@ def _load_roles(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
 
-def _load_role_memberships(conn_settings: DBConnSettings) -> pd.DataFrame:
+def _load_role_memberships(session: DBSession) -> pd.DataFrame:
     """Load role memberships (GRANT role TO role)."""
-    conn = None
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
 
         sql = """SELECT
                     r.rolname as role_name,
@@ -861,7 +1441,7 @@ def _load_role_memberships(conn_settings: DBConnSettings) -> pd.DataFrame:
                 WHERE r.rolname NOT LIKE 'pg_%'
                   AND m.rolname NOT LIKE 'pg_%'
                 ORDER BY r.rolname, m.rolname"""
-        cur.execute(sql)
+        session.execute(cur, sql, "role_memberships")
         results = cur.fetchall()
         return pd.DataFrame(results)
 
@@ -872,17 +1452,13 @@ def _load_role_memberships(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
 
-def _load_schema_permissions(conn_settings: DBConnSettings) -> pd.DataFrame:
+def _load_schema_permissions(session: DBSession) -> pd.DataFrame:
     """Load schema-level permissions (USAGE, CREATE on schemas)."""
-    conn = None
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
 
         sql = """SELECT
                     grantor,
@@ -898,7 +1474,7 @@ def _load_schema_permissions(conn_settings: DBConnSettings) -> pd.DataFrame:
                   AND object_schema NOT LIKE 'pg_temp%'
                   AND object_schema NOT LIKE 'pg_toast%'
                 ORDER BY object_schema, grantee, privilege_type"""
-        cur.execute(sql)
+        session.execute(cur, sql, "schema_permissions")
         results = cur.fetchall()
         return pd.DataFrame(results)
 
@@ -909,17 +1485,13 @@ def _load_schema_permissions(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
 
-def _load_table_permissions(conn_settings: DBConnSettings) -> pd.DataFrame:
+def _load_table_permissions(session: DBSession) -> pd.DataFrame:
     """Load table-level permissions (SELECT, INSERT, UPDATE, DELETE, etc.)."""
-    conn = None
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
 
         sql = """SELECT
                     grantor,
@@ -936,7 +1508,7 @@ def _load_table_permissions(conn_settings: DBConnSettings) -> pd.DataFrame:
                   AND table_schema NOT LIKE 'pg_temp%'
                   AND table_schema NOT LIKE 'pg_toast%'
                 ORDER BY table_schema, table_name, grantee, privilege_type"""
-        cur.execute(sql)
+        session.execute(cur, sql, "table_permissions")
         results = cur.fetchall()
         return pd.DataFrame(results)
 
@@ -947,17 +1519,13 @@ def _load_table_permissions(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
 
-def _load_column_permissions(conn_settings: DBConnSettings) -> pd.DataFrame:
+def _load_column_permissions(session: DBSession) -> pd.DataFrame:
     """Load column-level permissions."""
-    conn = None
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
 
         sql = """SELECT
                     cp.grantor,
@@ -982,7 +1550,7 @@ def _load_column_permissions(conn_settings: DBConnSettings) -> pd.DataFrame:
                         AND tp.privilege_type = cp.privilege_type
                   )
                 ORDER BY cp.table_schema, cp.table_name, cp.column_name, cp.grantee, cp.privilege_type"""
-        cur.execute(sql)
+        session.execute(cur, sql, "column_permissions")
         results = cur.fetchall()
         return pd.DataFrame(results)
 
@@ -993,17 +1561,13 @@ def _load_column_permissions(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
 
-def _load_function_permissions(conn_settings: DBConnSettings) -> pd.DataFrame:
+def _load_function_permissions(session: DBSession) -> pd.DataFrame:
     """Load function/procedure permissions (EXECUTE)."""
-    conn = None
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
 
         sql = """SELECT
                     grantor,
@@ -1019,7 +1583,7 @@ def _load_function_permissions(conn_settings: DBConnSettings) -> pd.DataFrame:
                   AND grantee NOT LIKE 'pg_%'
                   AND specific_schema NOT IN ('pg_catalog', 'information_schema')
                 ORDER BY routine_schema, routine_name, grantee, privilege_type"""
-        cur.execute(sql)
+        session.execute(cur, sql, "function_permissions")
         results = cur.fetchall()
         return pd.DataFrame(results)
 
@@ -1030,17 +1594,13 @@ def _load_function_permissions(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
 
-def _load_default_privileges(conn_settings: DBConnSettings) -> pd.DataFrame:
+def _load_default_privileges(session: DBSession) -> pd.DataFrame:
     """Load default privileges (ALTER DEFAULT PRIVILEGES)."""
-    conn = None
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
 
         sql = """SELECT
                     pg_get_userbyid(d.defaclrole) as role_name,
@@ -1054,7 +1614,7 @@ def _load_default_privileges(conn_settings: DBConnSettings) -> pd.DataFrame:
                 WHERE pg_get_userbyid(d.defaclrole) NOT LIKE 'pg_%'
                   AND pg_get_userbyid(d.defaclrole) NOT IN ('postgres')
                 ORDER BY role_name, schema_name, object_type"""
-        cur.execute(sql)
+        session.execute(cur, sql, "default_privileges")
         results = cur.fetchall()
         return pd.DataFrame(results)
 
@@ -1065,17 +1625,13 @@ def _load_default_privileges(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
 
 
-def _load_rls_policies(conn_settings: DBConnSettings) -> pd.DataFrame:
+def _load_rls_policies(session: DBSession) -> pd.DataFrame:
     """Load Row Level Security (RLS) policies."""
-    conn = None
     cur = None
     try:
-        conn = Database.connect_to_database(conn_settings)
-        cur = conn.cursor(cursor_factory=RealDictCursor)
+        cur = session.cursor()
 
         sql = """SELECT
                     schemaname as table_schema,
@@ -1091,7 +1647,7 @@ def _load_rls_policies(conn_settings: DBConnSettings) -> pd.DataFrame:
                   AND schemaname NOT LIKE 'pg_temp%'
                   AND schemaname NOT LIKE 'pg_toast%'
                 ORDER BY schemaname, tablename, policyname"""
-        cur.execute(sql)
+        session.execute(cur, sql, "rls_policies")
         results = cur.fetchall()
         return pd.DataFrame(results)
 
@@ -1102,5 +1658,3 @@ def _load_rls_policies(conn_settings: DBConnSettings) -> pd.DataFrame:
     finally:
         if cur:
             cur.close()
-        if conn:
-            conn.close()
@@ -0,0 +1,93 @@
+"""
+Canonical fingerprint of a database's schema, computed by one catalog query.
+
+The same query runs on the source when it is loaded (the fingerprint is embedded in the script) and on the
+target when the script runs, so a match means the target's schema is the source's and the schema compare can
+be skipped. Unlike the catalog cache's fingerprint (row counts and xmin sums, which differ between any two
+databases), this one is built from the objects' definitions: one text line per schema, table, column,
+constraint, index, view, function, trigger and, with security, role, membership, ACL and RLS policy, without
+OIDs, sorted in "C" order and md5'd. Columns are compared by name, as the script does, not by position.
+Definitions are deparsed by the server (pg_get_*def), so different server versions may never match; that
+only means the full compare runs.
+"""
+
+
+def _user_schema(nsp_expr: str) -> str:
+    return f"""{nsp_expr} NOT IN ('pg_catalog', 'information_schema') AND {nsp_expr} NOT LIKE 'pg\\_toast%' AND {nsp_expr} NOT LIKE 'pg\\_temp\\_%'"""
+
+
+def _sorted_acl(acl_expr: str) -> str:
+    # aclitems in a fixed order: the same grants made in a different order give the same text
+    return f"coalesce((SELECT string_agg(acl::text, ',' ORDER BY acl::text) FROM unnest({acl_expr}) acl), '')"
+
+
+def schema_fingerprint_sql(include_security: bool) -> str:
+    """The query returning the fingerprint (one row, one 'fingerprint' column). include_security adds roles,
+    role memberships, ACLs, default privileges and RLS policies, the objects script_security scripts."""
+    rel = "n.nspname || '.' || c.relname"
+    lines = [
+        f"""SELECT 'schema|' || n.nspname FROM pg_namespace n WHERE {_user_schema('n.nspname')}""",
+        f"""SELECT 'rel|' || {rel} || '|' || c.relkind::text
+            FROM pg_class c INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relkind IN ('r', 'p', 'f', 'v', 'm') AND {_user_schema('n.nspname')}""",
+        f"""SELECT 'col|' || {rel} || '.' || a.attname || '|' || format_type(a.atttypid, a.atttypmod) || '|' || a.attnotnull::text
+                || '|' || a.attidentity::text || '|' || a.attgenerated::text
+                || '|' || coalesce(CASE WHEN a.attcollation <> t.typcollation THEN co.collname END, '')
+                || '|' || coalesce(pg_get_expr(ad.adbin, ad.adrelid), '')
+            FROM pg_attribute a
+                INNER JOIN pg_class c ON c.oid = a.attrelid INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+                INNER JOIN pg_type t ON t.oid = a.atttypid
+                LEFT JOIN pg_collation co ON co.oid = a.attcollation
+                LEFT JOIN pg_attrdef ad ON ad.adrelid = a.attrelid AND ad.adnum = a.attnum
+            WHERE c.relkind IN ('r', 'p', 'f') AND a.attnum > 0 AND NOT a.attisdropped AND {_user_schema('n.nspname')}""",
+        f"""SELECT 'con|' || {rel} || '.' || con.conname || '|' || pg_get_constraintdef(con.oid)
+            FROM pg_constraint con INNER JOIN pg_class c ON c.oid = con.conrelid INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE {_user_schema('n.nspname')}""",
+        f"""SELECT 'idx|' || {rel} || '|' || pg_get_indexdef(i.indexrelid)
+            FROM pg_index i INNER JOIN pg_class c ON c.oid = i.indrelid INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE {_user_schema('n.nspname')}""",
+        f"""SELECT 'view|' || {rel} || '|' || pg_get_viewdef(c.oid)
+            FROM pg_class c INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relkind IN ('v', 'm') AND {_user_schema('n.nspname')}""",
+        f"""SELECT 'proc|' || n.nspname || '.' || p.proname || '(' || pg_get_function_identity_arguments(p.oid) || ')|'
+                || CASE WHEN p.prokind = 'a' THEN '' WHEN l.lanname = 'internal' THEN p.prosrc ELSE pg_get_functiondef(p.oid) END
+            FROM pg_proc p INNER JOIN pg_namespace n ON n.oid = p.pronamespace INNER JOIN pg_language l ON l.oid = p.prolang
+            WHERE {_user_schema('n.nspname')}""",
+        f"""SELECT 'trigger|' || {rel} || '.' || tg.tgname || '|' || pg_get_triggerdef(tg.oid)
+            FROM pg_trigger tg INNER JOIN pg_class c ON c.oid = tg.tgrelid INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE NOT tg.tgisinternal AND {_user_schema('n.nspname')}""",
+    ]
+    if include_security:
+        # the roles and memberships the security loaders read (not pg_* roles, not postgres); pg_roles, since
+        # pg_authid needs superuser, so passwords aren't part of it
+        lines += [
+            """SELECT 'role|' || r.rolname || '|' || r.rolsuper::text || '|' || r.rolinherit::text || '|' || r.rolcreaterole::text
+                    || '|' || r.rolcreatedb::text || '|' || r.rolcanlogin::text || '|' || r.rolreplication::text
+                    || '|' || r.rolbypassrls::text || '|' || r.rolconnlimit::text || '|' || coalesce(extract(epoch FROM r.rolvaliduntil)::text, '')
+                FROM pg_roles r WHERE r.rolname NOT LIKE 'pg\\_%' AND r.rolname <> 'postgres'""",
+            """SELECT 'member|' || r.rolname || '|' || m.rolname || '|' || am.admin_option::text
+                FROM pg_auth_members am INNER JOIN pg_roles r ON r.oid = am.roleid INNER JOIN pg_roles m ON m.oid = am.member
+                WHERE r.rolname NOT LIKE 'pg\\_%' AND m.rolname NOT LIKE 'pg\\_%'""",
+            f"""SELECT 'acl|schema|' || n.nspname || '|' || {_sorted_acl('n.nspacl')} FROM pg_namespace n WHERE {_user_schema('n.nspname')}""",
+            f"""SELECT 'acl|rel|' || {rel} || '|' || {_sorted_acl('c.relacl')} || '|' || c.relrowsecurity::text || '|' || c.relforcerowsecurity::text
+                FROM pg_class c INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE c.relkind IN ('r', 'p', 'f', 'v', 'm') AND {_user_schema('n.nspname')}""",
+            f"""SELECT 'acl|col|' || {rel} || '.' || a.attname || '|' || {_sorted_acl('a.attacl')}
+                FROM pg_attribute a INNER JOIN pg_class c ON c.oid = a.attrelid INNER JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE a.attacl IS NOT NULL AND a.attnum > 0 AND NOT a.attisdropped AND {_user_schema('n.nspname')}""",
+            f"""SELECT 'acl|proc|' || n.nspname || '.' || p.proname || '(' || pg_get_function_identity_arguments(p.oid) || ')|' || {_sorted_acl('p.proacl')}
+                FROM pg_proc p INNER JOIN pg_namespace n ON n.oid = p.pronamespace
+                WHERE {_user_schema('n.nspname')}""",
+            f"""SELECT 'acl|default|' || pg_get_userbyid(d.defaclrole) || '|' || coalesce(n.nspname, '') || '|' || d.defaclobjtype::text
+                    || '|' || {_sorted_acl('d.defaclacl')}
+                FROM pg_default_acl d LEFT JOIN pg_namespace n ON n.oid = d.defaclnamespace""",
+            f"""SELECT 'policy|' || p.schemaname || '.' || p.tablename || '.' || p.policyname || '|' || p.permissive || '|' || p.cmd
+                    || '|' || coalesce((SELECT string_agg(r::text, ',' ORDER BY r::text) FROM unnest(p.roles) r), '')
+                    || '|' || coalesce(p.qual, '') || '|' || coalesce(p.with_check, '')
+                FROM pg_policies p WHERE {_user_schema('p.schemaname')}""",
+        ]
+    union = "\n            UNION ALL\n            ".join(lines)
+    return f"""SELECT md5(coalesce(string_agg(line, E'\\n' ORDER BY line COLLATE "C"), '')) AS fingerprint
+        FROM (
+            {union}
+        ) AS schema_lines (line)"""
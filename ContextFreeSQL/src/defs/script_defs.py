@@ -86,6 +86,8 @@ class ScriptingOptions:
    script_schemas: bool = True  # turning it off from MA, when doing only data. for now, its always on other wise 07-17-14
    all_schemas: bool = True  # if off, will only script schemas that we are using in entities we chose to script
    script_security: bool = True  # Script roles, permissions, RLS policies
+   state_insert_batch_rows: int = 1  # rows per multi-row INSERT ... VALUES when filling the columns/indexes/FKs/check constraints state tables (1 = one INSERT per row)
+   schema_fingerprint_check: bool = False  # embed the source schema's fingerprint; the script ends before the schema compare when the target's matches (PostgreSQL, scripts without data)
    #code comparison
    code_compare_no_whitespace : bool = False
 
@@ -96,6 +98,14 @@ class ScriptingOptions:
    data_comparison_include_equal_rows: bool = True  # if false, equal rows excluded from CSV/HTML comparison reports
    data_window_only: bool = False  # 3/31/15
    data_window_got_specific_cells: bool = False  # in case the user wants specific cells not to be included
+   data_insert_batch_rows: int = 1  # rows per multi-row INSERT ... VALUES when embedding table data (1 = one INSERT per row)
+   data_embed_format: str = "insert"  # "insert": INSERT ... VALUES statements; "jsonb": one jsonb_populate_recordset INSERT per table (PostgreSQL)
+   data_generation_workers: int = 1  # render each table's data sections on this many worker processes (1 = in this process)
+   data_hash_fast_path: bool = False  # compare an aggregate hash of each table's scripted rows with the table's own first, and skip the row compare on a match (PostgreSQL)
+   data_temp_table_indexes: bool = True  # index the comparison temp tables on their key columns and ANALYZE them once filled (PostgreSQL)
+   data_tune_work_mem: bool = False  # raise work_mem before each table's compare, sized from its embedded row count (PostgreSQL)
+   data_hash_chunk_rows: int = 0  # split tables with more scripted rows than this into key ranges of about this many rows, and only compare the ranges whose hashes differ (PostgreSQL, 0 = off)
+   data_set_based_dml: bool = False  # apply changed rows with one UPDATE per table and render the printed DML with set-based INSERT ... SELECTs instead of record loops (PostgreSQL)
 
    
 
@@ -143,6 +153,21 @@ class SQLScriptParams:
     html_report: bool = True  # Generate HTML comparison report for data differences
     export_csv: bool = False  # Export source/target data to CSV files
 
+@dataclass
+class DBLoadOptions:
+    """How the catalog and table data are read from the source database"""
+    parallel_catalog_load: bool = False  # run the catalog queries concurrently, all on one exported snapshot
+    load_workers: int = 4  # number of connections (and, for parallel_data_load, worker processes) used by parallel loads
+    catalog_backend: str = "information_schema"  # "information_schema" or "pg_catalog" (reads pg_class/pg_attribute directly, faster on big catalogs)
+    stream_table_data: bool = False  # read table data through a server-side cursor, itersize rows at a time, instead of fetching it all at once
+    itersize: int = 50000  # rows per fetch when stream_table_data is on
+    copy_table_data: bool = False  # read table data with COPY ... TO STDOUT and parse it column by column (takes precedence over stream_table_data)
+    parallel_data_load: bool = False  # load table data on load_workers processes, biggest tables first, all on one exported snapshot
+    table_chunk_rows: int = 0  # with parallel_data_load, split tables estimated bigger than this into key ranges loaded concurrently (0 = never split)
+    catalog_cache: bool = False  # keep the loaded catalog on disk next to the output and reuse it while the database's catalog fingerprint is unchanged
+    pipelined_data_load: bool = False  # load table data while the script is generated, a window of tables at a time, freeing each window before the next (peak memory set by the largest window, not the whole database)
+    pipeline_window_tables: int = 1  # tables loaded together per window when pipelined_data_load is on
+
 @dataclass
 class ConfigVals:
     db_conn: DBConnSettings
@@ -152,4 +177,5 @@ class ConfigVals:
     tables_data: ListTables
     input_output: InputOutput
     sql_script_params: SQLScriptParams = field(default_factory=SQLScriptParams)
+    db_load_ops: DBLoadOptions = field(default_factory=DBLoadOptions)
 
@@ -0,0 +1,40 @@
+"""
+Rendered column/index/FK DDL fragments, shared by the generators over one write_all_script run.
+
+The state tables and the CREATE TABLEs render the same fragments from the same catalog rows (an index's
+CREATE INDEX is both the state row's SQL_CREATE and a line of its table's CREATE TABLE). A DDLCache renders
+each one once. A run renders from one catalog (its DBSchema), where an entity's name determines its catalog
+rows, so fragments are keyed on the entity's name (table, column, index or FK) and the rendering arguments
+(script state, db type, options). Keying on the rows' values instead cost more than rendering a column.
+"""
+from collections import Counter
+from typing import Callable, Dict
+
+
+class DDLCache:
+    """DDL fragments by kind ('columns', 'indexes', 'fks'), rendered on their first lookup, with per-kind hit counts.
+    Use one per run over one catalog (see the module docstring)."""
+
+    def __init__(self):
+        self._fragments: Dict[tuple, str] = {}
+        self.hits: Counter = Counter()  # kind -> lookups answered from the cache
+        self.misses: Counter = Counter()  # kind -> lookups that rendered the fragment
+
+    def fragment(self, kind: str, key: tuple, render: Callable[[], str]) -> str:
+        """The fragment render() returns for key: the entity's name and the rendering arguments."""
+        full_key = (kind, key)
+        sql = self._fragments.get(full_key)
+        if sql is not None:
+            self.hits[kind] += 1
+            return sql
+        self.misses[kind] += 1
+        sql = render()
+        self._fragments[full_key] = sql
+        return sql
+
+    def print_report(self) -> None:
+        lookups = self.hits + self.misses
+        if not lookups:
+            return
+        entries = ", ".join(f"{kind} {self.hits[kind]}/{count} hits ({self.hits[kind] / count:.0%})" for kind, count in lookups.items())
+        print(f"DDL cache: {entries}")
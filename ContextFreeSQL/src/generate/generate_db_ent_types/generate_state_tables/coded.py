@@ -6,7 +6,7 @@ from io import StringIO
 
 from src.defs.script_defs import DBType, DBSyntax, ScriptingOptions
 from src.data_load.from_db.load_from_db_pg import DBSchema
-from src.utils.funcs import quote_str_or_null, add_print
+from src.utils.funcs import quote_str_or_null, numeric_or_null, add_print
 
 def create_db_state_temp_tables_for_coded(
     db_type: DBType,
@@ -90,6 +90,8 @@ END;
     if db_type == DBType.PostgreSQL:
         create_table_script += f"{align}\tparam_type_list {db_syntax.nvarchar_type} {db_syntax.max_length_str} null,\n"
     
+    # creation order (scriptsortorder: after what the entity depends on); entities only on the DB have none
+    create_table_script += f"{align}\tsort_order int null,\n"
     create_table_script += f"{align}\tcodeStat smallint null\n);\n\n"
     script_builder.write(create_table_script)
     
@@ -102,35 +104,18 @@ END;
     if not tbl_ents_coded.empty:
         script_builder.write(f"{align}--Fill it with code entities\n")
     
-    coded_ents=schema_tables.coded_ents    
+    catalog = schema_tables.catalog
     # For each entity, get CREATE/DROP SQL and add to script
     for _, ent_row in tbl_ents_coded.iterrows():
         create_ent = None
         
         # Find matching coded entity
         if db_type == DBType.PostgreSQL:
-            select_cond = (
-                (coded_ents['code_schema'] == ent_row['entschema']) & 
-                (coded_ents['code_name'] == ent_row['entname'])
-            )
-            
-            # Add param list condition
-            if pd.isna(ent_row['entparamlist']) or ent_row['entparamlist'] == '':
-                select_cond = select_cond & (
-                    pd.isna(coded_ents['param_type_list']) | 
-                    (coded_ents['param_type_list'] == '')
-                )
-            else:
-                select_cond = select_cond & (
-                    coded_ents['param_type_list'] == ent_row['entparamlist']
-                )
-            
-            matching_rows = coded_ents[select_cond]
+            # overloads are told apart by their param list; a missing one is looked up as empty
+            param_list = '' if pd.isna(ent_row['entparamlist']) else ent_row['entparamlist']
+            matching_rows = catalog.coded_ents.rows(ent_row['entschema'], ent_row['entname'], param_list)
         else:
-            matching_rows = coded_ents[
-                (coded_ents['code_schema'] == ent_row['entschema']) & 
-                (coded_ents['code_name'] == ent_row['entname'])
-            ]
+            matching_rows = catalog.coded_ents_by_name.rows(ent_row['entschema'], ent_row['entname'])
         
         if len(matching_rows) == 1:
             create_ent = matching_rows.iloc[0]['definition']
@@ -145,9 +130,9 @@ END;
 
         # Insert statement
         if db_type == DBType.PostgreSQL:
-            script_builder.write(f"{align}INSERT INTO {db_syntax.temp_table_prefix}ScriptCode (ent_schema, ent_name, ent_type, SQL_CREATE, SQL_DROP, param_type_list)\n")
+            script_builder.write(f"{align}INSERT INTO {db_syntax.temp_table_prefix}ScriptCode (ent_schema, ent_name, ent_type, SQL_CREATE, SQL_DROP, param_type_list, sort_order)\n")
         else:
-            script_builder.write(f"{align}INSERT INTO {db_syntax.temp_table_prefix}ScriptCode (ent_schema, ent_name, ent_type, SQL_CREATE, SQL_DROP)\n")
+            script_builder.write(f"{align}INSERT INTO {db_syntax.temp_table_prefix}ScriptCode (ent_schema, ent_name, ent_type, SQL_CREATE, SQL_DROP, sort_order)\n")
 
         # Entity schema and name
         script_builder.write(f"{align}\tVALUES ({quote_str_or_null(ent_row['entschema'])}, ")
@@ -162,9 +147,11 @@ END;
         # SQL CREATE
         script_builder.write(f"{quote_str_or_null(create_ent)}, ")
         
+        sort_order = numeric_or_null(int(ent_row['scriptsortorder']) if not pd.isna(ent_row.get('scriptsortorder')) else None)
+
         # SQL DROP
         if db_type == DBType.MSSQL:
-            script_builder.write(f"'DROP {ent_row['enttype']} [{ent_row['entschema']}].[{ent_row['entname']}];');\n")
+            script_builder.write(f"'DROP {ent_row['enttype']} [{ent_row['entschema']}].[{ent_row['entname']}];', {sort_order});\n")
         else:
             # For DROP, use entparamlisttypes (types only) for correct PostgreSQL syntax
             # e.g., DROP PROCEDURE name(integer) not DROP PROCEDURE name(IN studentid integer)
@@ -173,7 +160,7 @@ END;
             # Keep full param list for matching/comparison
             param_list_str = ent_row['entparamlist'] if not pd.isna(ent_row['entparamlist']) else ''
             ent_param_list_val = f"'{param_list_str}'" if param_list_str else "''"
-            script_builder.write(f"'DROP {ent_row['enttype']} {ent_row['entschema']}.{ent_row['entname']}{param_list_for_drop};', {ent_param_list_val});\n")
+            script_builder.write(f"'DROP {ent_row['enttype']} {ent_row['entschema']}.{ent_row['entname']}{param_list_for_drop};', {ent_param_list_val}, {sort_order});\n")
     
     # Update state against existing entities
     script_builder.write(f"{align}\n--Entities only On Johannes database (need To add)\n")
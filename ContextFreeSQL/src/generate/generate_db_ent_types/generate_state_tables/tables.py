@@ -6,6 +6,7 @@ from io import StringIO
 from src.defs.script_defs import DBType, DBSyntax, ScriptingOptions, ScriptTableOptions
 from src.generate.generate_final_create_table import get_create_table_from_sys_tables
 from src.data_load.from_db.load_from_db_pg import DBSchema
+from src.generate.ddl_cache import DDLCache
 from src.utils.funcs import quote_str_or_null, add_print
 from src.generate.generate_db_ent_types.generate_state_tables.tables_columns import create_db_state_columns
 from src.generate.generate_db_ent_types.generate_state_tables.tables_indexes import create_db_state_indexes
@@ -21,7 +22,8 @@ def create_db_state_temp_tables_for_tables(
     scripting_data: Optional[bool] = False,
     script_table_ops: Optional[ScriptTableOptions] = None,
     pre_add_constraints_data_checks: bool = False,
-    got_specific_tables: bool = False
+    got_specific_tables: bool = False,
+    ddl_cache: Optional[DDLCache] = None
 ) -> StringIO:
     
     script_db_state_tables = StringIO()
@@ -64,7 +66,8 @@ def create_db_state_temp_tables_for_tables(
         tbl_ents_to_script = tables_to_script,
         db_type = db_type,
         schema_tables = schema_tables,
-        got_specific_tables = got_specific_tables
+        got_specific_tables = got_specific_tables,
+        ddl_cache = ddl_cache
     )
     script_db_state_tables.write(create_state_tables.getvalue())
     
@@ -77,7 +80,9 @@ def create_db_state_temp_tables_for_tables(
         db_type = db_type,
         tbl_ents_to_script = tbl_ents,
         overall_table_schema_name_in_scripting = overall_table_schema_name_in_scripting,
-        scripting_data = scripting_data
+        scripting_data = scripting_data,
+        insert_batch_rows = script_ops.state_insert_batch_rows,
+        ddl_cache = ddl_cache
     )
 
     script_db_state_tables.write(create_state_tables_columns.getvalue())
@@ -88,7 +93,9 @@ def create_db_state_temp_tables_for_tables(
         db_type = db_type,
         tbl_ents_to_script = tbl_ents,
         overall_table_schema_name_in_scripting = overall_table_schema_name_in_scripting,
-        scripting_data = scripting_data
+        scripting_data = scripting_data,
+        insert_batch_rows = script_ops.state_insert_batch_rows,
+        ddl_cache = ddl_cache
     )
 
     script_db_state_tables.write(create_state_tables_indexes.getvalue())
@@ -99,7 +106,9 @@ def create_db_state_temp_tables_for_tables(
         db_type = db_type,
         tbl_ents_to_script = tbl_ents,
         overall_table_schema_name_in_scripting = overall_table_schema_name_in_scripting,
-        scripting_data = scripting_data
+        scripting_data = scripting_data,
+        insert_batch_rows = script_ops.state_insert_batch_rows,
+        ddl_cache = ddl_cache
     )
 
     script_db_state_tables.write(create_state_tables_fks.getvalue())
@@ -114,7 +123,8 @@ def create_db_state_tables(
     tbl_ents_to_script: pd.DataFrame,
     num_tabs: int,
     db_type: DBType, #that's the destination db type
-    got_specific_tables: bool = False
+    got_specific_tables: bool = False,
+    ddl_cache: Optional[DDLCache] = None
 ) -> StringIO:
 
     db_syntax = DBSyntax.get_syntax(db_type)
@@ -183,7 +193,8 @@ def create_db_state_tables(
             table_name = row['entname'],
             schema_tables = schema_tables,
             script_table_ops = script_table_options_no_fk,
-            pre_add_constraints_data_checks = False
+            pre_add_constraints_data_checks = False,
+            ddl_cache = ddl_cache
         )
 
         # Get database-specific syntax
@@ -5,7 +5,7 @@ import pandas as pd
 from io import StringIO
 from src.defs.script_defs import DBType, DBSyntax, ScriptingOptions, ScriptTableOptions, DBEntScriptState
 from src.data_load.from_db.load_from_db_pg import DBSchema
-from src.utils.funcs import quote_str_or_null, quote_str_or_null_bool, numeric_or_null, bool_to_sql_bit_boolean_val
+from src.utils.funcs import quote_str_or_null, quote_str_or_null_bool, numeric_or_null, bool_to_sql_bit_boolean_val, write_insert_values_batches
 
 
 def create_db_state_check_constraints(
@@ -13,6 +13,7 @@ def create_db_state_check_constraints(
     tbl_ents_to_script: pd.DataFrame,
     db_type: DBType,
     overall_table_schema_name_in_scripting: Optional[str],
+    insert_batch_rows: int = 1
 ) -> StringIO:
     """
     Create state table for check constraints.
@@ -68,29 +69,25 @@ def create_db_state_check_constraints(
     for _, ent_row in filtered_ents.iterrows():
         tables_to_script_set.add((ent_row['entschema'], ent_row['entname']))
 
-    # Insert check constraints from schema_tables
+    # Insert check constraints from schema_tables, insert_batch_rows rows per multi-row VALUES
     if not schema_tables.check_constraints.empty:
         script_db_state_tables.write(f"{align}--Fill it with check constraints\n")
 
-        for _, cc_row in schema_tables.check_constraints.iterrows():
+        rows_values = []
+        for cc_row in schema_tables.check_constraints.to_dict('records'):
             # Only process if this table is in our tbl_ents_to_script with scriptschema=True
             if (cc_row['table_schema'], cc_row['table_name']) not in tables_to_script_set:
                 continue
 
-            script_db_state_tables.write(f"{align}INSERT INTO {db_syntax.temp_table_prefix}ScriptCheckConstraints ")
-            script_db_state_tables.write(f"(table_schema, table_name, constraint_name, constraint_definition)\n")
-
+            key_values = [cc_row['table_schema'], cc_row['table_name'], cc_row['constraint_name']]
             if db_type == DBType.PostgreSQL:
-                script_db_state_tables.write(f"{align}VALUES ({quote_str_or_null(cc_row['table_schema'].lower())}, ")
-                script_db_state_tables.write(f"{quote_str_or_null(cc_row['table_name'].lower())}, ")
-                script_db_state_tables.write(f"{quote_str_or_null(cc_row['constraint_name'].lower())}, ")
-            else:
-                script_db_state_tables.write(f"{align}VALUES ({quote_str_or_null(cc_row['table_schema'])}, ")
-                script_db_state_tables.write(f"{quote_str_or_null(cc_row['table_name'])}, ")
-                script_db_state_tables.write(f"{quote_str_or_null(cc_row['constraint_name'])}, ")
-
-            script_db_state_tables.write(f"{quote_str_or_null(cc_row['constraint_definition'])});\n")
-            script_db_state_tables.write(f"{align}\n")
+                key_values = [key_value.lower() for key_value in key_values]
+            rows_values.append(f"({', '.join(quote_str_or_null(value) for value in key_values + [cc_row['constraint_definition']])})")
+
+        write_insert_values_batches(db_type, script_db_state_tables, align,
+                                    f"INSERT INTO {db_syntax.temp_table_prefix}ScriptCheckConstraints (table_schema, table_name, constraint_name, constraint_definition)",
+                                    rows_values, insert_batch_rows)
+        script_db_state_tables.write(f"{align}\n")
 
     # Update state against existing entities
     if overall_table_schema_name_in_scripting and len(overall_table_schema_name_in_scripting) > 0:
@@ -6,7 +6,8 @@ from io import StringIO
 from src.defs.script_defs import DBType, DBSyntax, ScriptingOptions, ScriptTableOptions, DBEntScriptState
 from src.generate.generate_final_create_table import get_create_table_from_sys_tables, get_col_sql
 from src.data_load.from_db.load_from_db_pg import DBSchema
-from src.utils.funcs import quote_str_or_null, quote_str_or_null_bool, numeric_or_null
+from src.generate.ddl_cache import DDLCache
+from src.utils.funcs import quote_str_or_null, quote_str_or_null_bool, numeric_or_null, write_insert_values_batches
 
 
 def create_db_state_columns(
@@ -14,7 +15,9 @@ def create_db_state_columns(
     tbl_ents_to_script: pd.DataFrame,        
     db_type: DBType, #that's the destination db type    
     overall_table_schema_name_in_scripting: Optional[str],
-    scripting_data: Optional[bool] = False
+    scripting_data: Optional[bool] = False,
+    insert_batch_rows: int = 1,
+    ddl_cache: Optional[DDLCache] = None
 ) -> StringIO:
     
     db_syntax = DBSyntax.get_syntax(db_type)
@@ -89,9 +92,11 @@ def create_db_state_columns(
     for _, ent_row in filtered_ents.iterrows():
         tables_to_script_set.add((ent_row['entschema'], ent_row['entname']))
         
-    # Generate the column script rows (but only for tables that should be scripted, in case filter was applied)
+    # Generate the column script rows (but only for tables that should be scripted, in case filter was applied),
+    # insert_batch_rows rows per multi-row VALUES
     alter_col=''
-    for _, row in schema_tables.columns.iterrows():
+    rows_values = []
+    for row in schema_tables.columns.to_dict('records'):
         # Only process if this table is in our tbl_ents_to_script with scriptschema=True
         if (row['table_schema'], row['table_name']) not in tables_to_script_set:
             continue
@@ -101,32 +106,36 @@ def create_db_state_columns(
         elif db_type == DBType.PostgreSQL:
             alter_col = f"'ALTER TABLE {row['table_schema']}.{row['table_name']} DROP COLUMN {row['col_name']}'"
             
-        
-        script_db_state_tables.write(f"{align}INSERT INTO {db_syntax.temp_table_prefix}ScriptCols (table_schema,table_name,col_name,user_type_name,max_length,precision,scale,is_nullable,is_identity,is_computed,collation_name,computed_definition, SQL_CREATE, SQL_ALTER, SQL_DROP{',SQL_ALTER_PostData_NotNULL' if scripting_data else ''})\n")
-        script_db_state_tables.write(f"{align}VALUES ({quote_str_or_null(row['table_schema'])},")
-        script_db_state_tables.write(f"{align}{quote_str_or_null(row['table_name'])},")
-        script_db_state_tables.write(f"{align}{quote_str_or_null(row['col_name'])},")
-        script_db_state_tables.write(f"{align}{quote_str_or_null(row['user_type_name'])},")
-        script_db_state_tables.write(f"{align}{numeric_or_null(row['max_length'])},")
-        script_db_state_tables.write(f"{align}{numeric_or_null(row['precision'])},")
-        script_db_state_tables.write(f"{align}{numeric_or_null(row['scale'])},")
-        script_db_state_tables.write(f"{align}{quote_str_or_null_bool(row['is_nullable'])},")
-        script_db_state_tables.write(f"{align}{quote_str_or_null_bool(row['is_identity'])},")
-        script_db_state_tables.write(f"{align}{quote_str_or_null(row['is_computed'])},")
-        script_db_state_tables.write(f"{align}{quote_str_or_null(row['collation_name'])},")
-        script_db_state_tables.write(f"{align}{quote_str_or_null(row['computed_definition'])},")
-        script_db_state_tables.write(f"{align}{quote_str_or_null(get_col_sql(sys_cols_row=row, table_schema = row['table_schema'], table_name = row['table_name'], script_state = DBEntScriptState.Add, db_type = DBType.PostgreSQL, column_identity =False, force_allow_null = scripting_data or False, actual_size = True))},")
-        script_db_state_tables.write(f"{align}{quote_str_or_null(get_col_sql(sys_cols_row=row, table_schema = row['table_schema'], table_name = row['table_name'], script_state = DBEntScriptState.Alter, db_type = DBType.PostgreSQL, column_identity =False, force_allow_null = False, actual_size = True))},")
-        script_db_state_tables.write(f"{alter_col}")
+        row_values = [
+            quote_str_or_null(row['table_schema']),
+            quote_str_or_null(row['table_name']),
+            quote_str_or_null(row['col_name']),
+            quote_str_or_null(row['user_type_name']),
+            numeric_or_null(row['max_length']),
+            numeric_or_null(row['precision']),
+            numeric_or_null(row['scale']),
+            quote_str_or_null_bool(row['is_nullable']),
+            quote_str_or_null_bool(row['is_identity']),
+            quote_str_or_null(row['is_computed']),
+            quote_str_or_null(row['collation_name']),
+            quote_str_or_null(row['computed_definition']),
+            quote_str_or_null(get_col_sql(sys_cols_row=row, table_schema = row['table_schema'], table_name = row['table_name'], script_state = DBEntScriptState.Add, db_type = DBType.PostgreSQL, column_identity =False, force_allow_null = scripting_data or False, actual_size = True, ddl_cache = ddl_cache)),
+            quote_str_or_null(get_col_sql(sys_cols_row=row, table_schema = row['table_schema'], table_name = row['table_name'], script_state = DBEntScriptState.Alter, db_type = DBType.PostgreSQL, column_identity =False, force_allow_null = False, actual_size = True, ddl_cache = ddl_cache)),
+            alter_col
+        ]
         
         if scripting_data:
             # Was the col NOT NULL to begin with?
             if row['is_nullable']:
-                script_db_state_tables.write(f"{align},NULL")  # code for this field
+                row_values.append("NULL")  # code for this field
             else:
-                script_db_state_tables.write(f",{quote_str_or_null(get_col_sql(row, row['table_schema'], row['table_name'], DBEntScriptState.Alter, db_type, False, False, True))}")
+                row_values.append(quote_str_or_null(get_col_sql(row, row['table_schema'], row['table_name'], DBEntScriptState.Alter, db_type, False, False, True, ddl_cache=ddl_cache)))
         
-        script_db_state_tables.write(f"{align});\n")
+        rows_values.append(f"({','.join(row_values)})")
+
+    write_insert_values_batches(db_type, script_db_state_tables, align,
+                                f"INSERT INTO {db_syntax.temp_table_prefix}ScriptCols (table_schema,table_name,col_name,user_type_name,max_length,precision,scale,is_nullable,is_identity,is_computed,collation_name,computed_definition, SQL_CREATE, SQL_ALTER, SQL_DROP{',SQL_ALTER_PostData_NotNULL' if scripting_data else ''})",
+                                rows_values, insert_batch_rows)
     
     # Now update state as against existing table
     script_db_state_tables.write(f"{align}\n")
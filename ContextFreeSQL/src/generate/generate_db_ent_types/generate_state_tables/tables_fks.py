@@ -6,7 +6,8 @@ from io import StringIO
 from src.defs.script_defs import DBType, DBSyntax, ScriptingOptions, ScriptTableOptions, DBEntScriptState
 from src.generate.generate_final_create_table import get_create_table_from_sys_tables, get_col_sql
 from src.data_load.from_db.load_from_db_pg import DBSchema
-from src.utils.funcs import quote_str_or_null, quote_str_or_null_bool, numeric_or_null, bool_to_sql_bit_boolean_val
+from src.generate.ddl_cache import DDLCache
+from src.utils.funcs import quote_str_or_null, quote_str_or_null_bool, numeric_or_null, bool_to_sql_bit_boolean_val, write_insert_values_batches
 from src.generate.generate_final_create_table import get_fk_sql 
 from src.utils.code_funcs import get_code_check_fk_data
 
@@ -18,7 +19,9 @@ def create_db_state_fks(
     overall_table_schema_name_in_scripting: Optional[str],
     scripting_data: Optional[bool] = False,
     remove_all_extra_ents: Optional[bool] = False,
-    bad_data_pre_add_fk: Optional[StringIO] = None
+    bad_data_pre_add_fk: Optional[StringIO] = None,
+    insert_batch_rows: int = 1,
+    ddl_cache: Optional[DDLCache] = None
 ) -> StringIO:
     
     db_syntax = DBSyntax.get_syntax(db_type)
@@ -111,95 +114,62 @@ def create_db_state_fks(
     for _, ent_row in filtered_ents.iterrows():
         tables_to_script_set.add((ent_row['entschema'], ent_row['entname']))
 
-    # Process foreign keys from schema_tables
-    for _, fk_row in schema_tables.fks.iterrows():
+    # Process foreign keys from schema_tables, insert_batch_rows rows per multi-row VALUES (the FKs', then their columns')
+    fks_values = []
+    fk_cols_values = []
+    for fk_row in schema_tables.fks.to_dict('records'):
         # Only process if this table is in our tbl_ents_to_script with scriptschema=True
         if (fk_row['fkey_table_schema'], fk_row['fkey_table_name']) not in tables_to_script_set:
             continue
         
         # Get FK columns for the current FK
-        fk_cols = schema_tables.fk_cols[
-            (schema_tables.fk_cols['fkey_table_schema'] == fk_row['fkey_table_schema']) &
-            (schema_tables.fk_cols['fkey_table_name'] == fk_row['fkey_table_name']) &
-            (schema_tables.fk_cols['fk_name'] == fk_row['fk_name'])
-        ]
+        fk_cols = schema_tables.catalog.fk_cols.records(fk_row['fkey_table_schema'], fk_row['fkey_table_name'], fk_row['fk_name'])
         
         # Prepare the full table name
         full_table_name = f"[{fk_row['fkey_table_schema']}].[{fk_row['fkey_table_name']}]"
         
         # Get SQL for creating FK and checking FK data
-        create_fk_sql = get_fk_sql(fk_row, fk_cols, db_type)
+        create_fk_sql = get_fk_sql(fk_row, fk_cols, db_type, ddl_cache=ddl_cache)
         sql_check_fk_data = None
         if scripting_data:
             sql_check_fk_data = get_code_check_fk_data(db_type, fk_row, fk_cols)
         
-        # Insert into scriptfks
-        script_db_state_tables.write(f"{align}INSERT INTO {db_syntax.temp_table_prefix}scriptfks (fkey_table_schema,fkey_table_name,fk_name,rkey_table_schema,rkey_table_name,is_not_for_replication,is_not_trusted,delete_referential_action,update_referential_action,is_system_named,SQL_CREATE")
-        
-        if scripting_data:
-            script_db_state_tables.write(",SQL_CheckFKData")
-        
-        script_db_state_tables.write(")\n")
-        
-        # VALUES for the insert
+        # VALUES for scriptfks
         if db_type == DBType.MSSQL:
-            script_db_state_tables.write(f"{align}VALUES ({quote_str_or_null(fk_row['fkey_table_schema'])},")
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['fkey_table_name'])},")
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['fk_name'])},")
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['rkey_table_schema'])},")
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['rkey_table_name'])},")
-            
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['is_not_for_replication'])},")
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['is_not_trusted'])},")
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['delete_referential_action'])},")
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['update_referential_action'])},")
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['is_system_named'])},")
+            row_values = [quote_str_or_null(fk_row[col_name]) for col_name in
+                          ['fkey_table_schema', 'fkey_table_name', 'fk_name', 'rkey_table_schema', 'rkey_table_name',
+                           'is_not_for_replication', 'is_not_trusted', 'delete_referential_action', 'update_referential_action', 'is_system_named']]
         elif db_type == DBType.PostgreSQL:
-            script_db_state_tables.write(f"{align}VALUES ({quote_str_or_null(fk_row['fkey_table_schema'].lower())},")
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['fkey_table_name'].lower())},")
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['fk_name'].lower())},")
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['rkey_table_schema'].lower())},")
-            script_db_state_tables.write(f"{quote_str_or_null(fk_row['rkey_table_name'].lower())},")
-
-            script_db_state_tables.write(f"NULL,") #is_not_for_replication
-            script_db_state_tables.write(f"NULL,") #is_not_trusted
-            script_db_state_tables.write(f"NULL,") #delete_referential_action
-            script_db_state_tables.write(f"NULL,") #update_referential_action
-            script_db_state_tables.write(f"NULL,") #is_system_named
+            row_values = [quote_str_or_null(fk_row[col_name].lower()) for col_name in
+                          ['fkey_table_schema', 'fkey_table_name', 'fk_name', 'rkey_table_schema', 'rkey_table_name']]
+            row_values += ["NULL"] * 5 #is_not_for_replication, is_not_trusted, delete_referential_action, update_referential_action, is_system_named
         
-      
-        script_db_state_tables.write(f"{quote_str_or_null(create_fk_sql)}")
+        row_values.append(quote_str_or_null(create_fk_sql))
         
         if scripting_data:
-            script_db_state_tables.write(f",{quote_str_or_null(sql_check_fk_data)}")
+            row_values.append(quote_str_or_null(sql_check_fk_data))
         
-        script_db_state_tables.write(");\n")
-        script_db_state_tables.write(f"{align}\n")
+        fks_values.append(f"({','.join(row_values)})")
         
-        # Insert FK columns
-        script_db_state_tables.write(f"{align}--FK's Columns\n")
-        for _, fk_col_row in fk_cols.iterrows():
-            script_db_state_tables.write(f"{align}INSERT INTO {db_syntax.temp_table_prefix}scriptfkcols (fkey_table_schema,fkey_table_name,fk_name,rkey_table_schema,rkey_table_name,fkey_col_name,rkey_col_name)\n")
-            
-            if db_type == DBType.MSSQL:
-                script_db_state_tables.write(f"{align}VALUES ({quote_str_or_null(fk_col_row['fkey_table_schema'])},")
-                script_db_state_tables.write(f"{quote_str_or_null(fk_col_row['fkey_table_name'])},")
-                script_db_state_tables.write(f"{quote_str_or_null(fk_col_row['fk_name'])},")
-                script_db_state_tables.write(f"{quote_str_or_null(fk_col_row['rkey_table_schema'])},\n")
-                script_db_state_tables.write(f"{align}{quote_str_or_null(fk_col_row['rkey_table_name'])},\n")
-                script_db_state_tables.write(f"{align}{quote_str_or_null(fk_col_row['fkey_col_name'])},\n")
-                script_db_state_tables.write(f"{align}{quote_str_or_null(fk_col_row['rkey_col_name'])});\n")
-            elif db_type == DBType.PostgreSQL:
-                script_db_state_tables.write(f"{align}VALUES ({quote_str_or_null(fk_col_row['fkey_table_schema'].lower())},")
-                script_db_state_tables.write(f"{quote_str_or_null(fk_col_row['fkey_table_name'].lower())},")
-                script_db_state_tables.write(f"{quote_str_or_null(fk_col_row['fk_name'].lower())},")
-                script_db_state_tables.write(f"{quote_str_or_null(fk_col_row['rkey_table_schema'].lower())},\n")
-                script_db_state_tables.write(f"{align}{quote_str_or_null(fk_col_row['rkey_table_name'].lower())},\n")
-                script_db_state_tables.write(f"{align}{quote_str_or_null(fk_col_row['fkey_col_name'].lower())},\n")
-                script_db_state_tables.write(f"{align}{quote_str_or_null(fk_col_row['rkey_col_name'].lower())});\n")
-            
-            script_db_state_tables.write(f"{align}\n")
+        # VALUES for the FK's columns
+        for fk_col_row in fk_cols:
+            col_values = [fk_col_row[col_name] for col_name in
+                          ['fkey_table_schema', 'fkey_table_name', 'fk_name', 'rkey_table_schema', 'rkey_table_name', 'fkey_col_name', 'rkey_col_name']]
+            if db_type == DBType.PostgreSQL:
+                col_values = [col_value.lower() for col_value in col_values]
+            fk_cols_values.append(f"({','.join(quote_str_or_null(col_value) for col_value in col_values)})")
+    
+    # Insert into scriptfks
+    write_insert_values_batches(db_type, script_db_state_tables, align,
+                                f"INSERT INTO {db_syntax.temp_table_prefix}scriptfks (fkey_table_schema,fkey_table_name,fk_name,rkey_table_schema,rkey_table_name,is_not_for_replication,is_not_trusted,delete_referential_action,update_referential_action,is_system_named,SQL_CREATE{',SQL_CheckFKData' if scripting_data else ''})",
+                                fks_values, insert_batch_rows)
+    script_db_state_tables.write(f"{align}\n")
     
+    # Insert FK columns
+    script_db_state_tables.write(f"{align}--FK's Columns\n")
+    write_insert_values_batches(db_type, script_db_state_tables, align,
+                                f"INSERT INTO {db_syntax.temp_table_prefix}scriptfkcols (fkey_table_schema,fkey_table_name,fk_name,rkey_table_schema,rkey_table_name,fkey_col_name,rkey_col_name)",
+                                fk_cols_values, insert_batch_rows)
     script_db_state_tables.write(f"{align}\n")
     
     # Update state against existing table
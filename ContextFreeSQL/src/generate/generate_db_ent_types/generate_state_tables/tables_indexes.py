@@ -6,7 +6,8 @@ from io import StringIO
 from src.defs.script_defs import DBType, DBSyntax, ScriptingOptions, ScriptTableOptions, DBEntScriptState
 from src.generate.generate_final_create_table import get_create_table_from_sys_tables, get_col_sql, get_index_sql
 from src.data_load.from_db.load_from_db_pg import DBSchema
-from src.utils.funcs import quote_str_or_null, quote_str_or_null_bool, numeric_or_null, bool_to_sql_bit_boolean_val
+from src.generate.ddl_cache import DDLCache
+from src.utils.funcs import quote_str_or_null, quote_str_or_null_bool, numeric_or_null, bool_to_sql_bit_boolean_val, write_insert_values_batches
 from src.utils.code_funcs import get_code_check_unq_data
 
 # CreateDBStateIndexes
@@ -16,7 +17,9 @@ def create_db_state_indexes(
     db_type: DBType, # that's the destination db type
     overall_table_schema_name_in_scripting: Optional[str],
     scripting_data: Optional[bool] = False,
-    bad_data_pre_add_indx: Optional[StringIO] = None
+    bad_data_pre_add_indx: Optional[StringIO] = None,
+    insert_batch_rows: int = 1,
+    ddl_cache: Optional[DDLCache] = None
 ) -> StringIO:
     
     db_syntax = DBSyntax.get_syntax(db_type)
@@ -127,18 +130,17 @@ def create_db_state_indexes(
     for _, ent_row in filtered_ents.iterrows():
         tables_to_script_set.add((ent_row['entschema'], ent_row['entname']))
     
-    # Process Indexes from schema_tables - but only for tables that should be scripted
-    for _, index_row in schema_tables.indexes.iterrows():
+    # Process Indexes from schema_tables - but only for tables that should be scripted,
+    # insert_batch_rows rows per multi-row VALUES (the indexes', then their columns')
+    indexes_values = []
+    index_cols_values = []
+    for index_row in schema_tables.indexes.to_dict('records'):
         # Only process if this table is in our tbl_ents_to_script with scriptschema=True
         if (index_row['table_schema'], index_row['table_name']) not in tables_to_script_set:
             continue
             
         # Get associated index columns
-        index_cols = schema_tables.index_cols[
-            (schema_tables.index_cols['table_schema'] == index_row['table_schema']) & 
-            (schema_tables.index_cols['table_name'] == index_row['table_name']) & 
-            (schema_tables.index_cols['index_name'] == index_row['index_name'])
-        ]
+        index_cols = schema_tables.catalog.index_cols_by_table.records(index_row['table_schema'], index_row['table_name'], index_row['index_name'])
         
         # Prepare SQL statements - you'd need to implement these functions
         full_table_name = None
@@ -148,74 +150,66 @@ def create_db_state_indexes(
             full_table_name = f"{index_row['table_schema']}.{index_row['table_name']}"
         
         # These would need to be implemented based on your code
-        create_index_sql = get_index_sql(index_row, index_cols, db_type)
+        create_index_sql = get_index_sql(index_row, index_cols, db_type, ddl_cache=ddl_cache)
         sql_check_unq_data = ""
         if scripting_data:
             sql_check_unq_data = get_code_check_unq_data(db_type, full_table_name, index_cols)
         
-        # Insert into ScriptIndexes
-        script_db_state_tables.write(f"{align}INSERT INTO {db_syntax.temp_table_prefix}ScriptIndexes (table_schema,table_name,index_name,is_unique,is_clustered,ignore_dup_key,is_primary_key,is_unique_constraint,allow_row_locks,allow_page_locks,has_filter,filter_definition,")
-        
-        if db_type == DBType.PostgreSQL:
-            script_db_state_tables.write("index_columns,")
-        
-        script_db_state_tables.write(f"SQL_CREATE")
-        
-        if scripting_data:
-            script_db_state_tables.write(",SQL_CheckUnqData")
-        
-        script_db_state_tables.write(")\n")
-        
-        # VALUES
+        # VALUES for ScriptIndexes
         if db_type == DBType.MSSQL:
-            script_db_state_tables.write(f"{align}VALUES ({quote_str_or_null(index_row['table_schema'])},")
-            script_db_state_tables.write(f"{quote_str_or_null(index_row['table_name'])},")
-            script_db_state_tables.write(f"{quote_str_or_null(index_row['index_name'])},")
+            row_values = [quote_str_or_null(index_row['table_schema']),
+                          quote_str_or_null(index_row['table_name']),
+                          quote_str_or_null(index_row['index_name'])]
         elif db_type == DBType.PostgreSQL:
-            script_db_state_tables.write(f"{align}VALUES ({quote_str_or_null(index_row['table_schema'].lower())},")
-            script_db_state_tables.write(f"{quote_str_or_null(index_row['table_name']).lower()},")
-            script_db_state_tables.write(f"{quote_str_or_null(index_row['index_name']).lower()},")
+            row_values = [quote_str_or_null(index_row['table_schema'].lower()),
+                          quote_str_or_null(index_row['table_name']).lower(),
+                          quote_str_or_null(index_row['index_name']).lower()]
         
-        script_db_state_tables.write(f"{bool_to_sql_bit_boolean_val(index_row['is_unique'], db_type != DBType.MSSQL)},\n")
+        row_values.append(bool_to_sql_bit_boolean_val(index_row['is_unique'], db_type != DBType.MSSQL))
         
         # is_clustered handling depends on database type
         if db_type == DBType.PostgreSQL:
-            script_db_state_tables.write(f"{align}{bool_to_sql_bit_boolean_val(index_row['is_clustered'], db_type != DBType.MSSQL)},\n")
+            row_values.append(bool_to_sql_bit_boolean_val(index_row['is_clustered'], db_type != DBType.MSSQL))
         else:
-            script_db_state_tables.write(f"{align}NULL,\n")
+            row_values.append("NULL")
         
-        script_db_state_tables.write(f"{align}{bool_to_sql_bit_boolean_val(index_row['ignore_dup_key'], db_type != DBType.MSSQL)},\n")
-        script_db_state_tables.write(f"{align}{bool_to_sql_bit_boolean_val(index_row['is_primary_key'], db_type != DBType.MSSQL)},\n")
-        script_db_state_tables.write(f"{align}{bool_to_sql_bit_boolean_val(index_row['is_unique_constraint'], db_type != DBType.MSSQL)},\n")
-        script_db_state_tables.write(f"{align}{bool_to_sql_bit_boolean_val(index_row['allow_row_locks'], db_type != DBType.MSSQL)},\n")
-        script_db_state_tables.write(f"{align}{bool_to_sql_bit_boolean_val(index_row['allow_page_locks'], db_type != DBType.MSSQL)},\n")
-        script_db_state_tables.write(f"{align}{bool_to_sql_bit_boolean_val(index_row['has_filter'], db_type != DBType.MSSQL)},\n")
-        script_db_state_tables.write(f"{align}{bool_to_sql_bit_boolean_val(index_row['filter_definition'], db_type != DBType.MSSQL)},\n")
+        for col_name in ['ignore_dup_key', 'is_primary_key', 'is_unique_constraint', 'allow_row_locks', 'allow_page_locks', 'has_filter', 'filter_definition']:
+            row_values.append(bool_to_sql_bit_boolean_val(index_row[col_name], db_type != DBType.MSSQL))
         
         if db_type == DBType.PostgreSQL:
-            script_db_state_tables.write(f"{align}'{index_row['index_columns']}',\n")
+            row_values.append(f"'{index_row['index_columns']}'")
         
-        script_db_state_tables.write(f"{align}{quote_str_or_null(create_index_sql)}")
+        row_values.append(quote_str_or_null(create_index_sql))
         
         if scripting_data:
-            script_db_state_tables.write(f",{quote_str_or_null(sql_check_unq_data)}")
-        
-        script_db_state_tables.write(");\n")
-        script_db_state_tables.write(f"{align}\n")
-        
-        # Insert index columns
-        script_db_state_tables.write(f"{align}--Insert Index Columns\n")
-        for _, index_col_row in index_cols.iterrows():
-            script_db_state_tables.write(f"{align}INSERT INTO {db_syntax.temp_table_prefix}ScriptIndexesCols (table_schema,table_name,index_name,col_name,index_column_id,key_ordinal,is_descending_key,is_included_column)\n")
-            script_db_state_tables.write(f"{align}VALUES ({quote_str_or_null(index_row['table_schema'].lower())},")
-            script_db_state_tables.write(f"{quote_str_or_null(index_row['table_name'].lower())},")
-            script_db_state_tables.write(f"{quote_str_or_null(index_row['index_name'].lower())},")
-            script_db_state_tables.write(f"{quote_str_or_null(index_col_row['col_name'].lower())},\n")
-            script_db_state_tables.write(f"{align}{quote_str_or_null(index_col_row['index_column_id'])},\n")
-            script_db_state_tables.write(f"{align}{quote_str_or_null(index_col_row['key_ordinal'])},\n")
-            script_db_state_tables.write(f"{align}{bool_to_sql_bit_boolean_val(index_col_row['is_descending_key'], db_type != DBType.MSSQL)},\n")
-            script_db_state_tables.write(f"{align}{quote_str_or_null(index_col_row['is_included_column'])});\n")
-            script_db_state_tables.write(f"{align}\n")
+            row_values.append(quote_str_or_null(sql_check_unq_data))
+        
+        indexes_values.append(f"({','.join(row_values)})")
+        
+        # VALUES for ScriptIndexesCols
+        for index_col_row in index_cols:
+            index_cols_values.append(f"({quote_str_or_null(index_row['table_schema'].lower())},"
+                                     f"{quote_str_or_null(index_row['table_name'].lower())},"
+                                     f"{quote_str_or_null(index_row['index_name'].lower())},"
+                                     f"{quote_str_or_null(index_col_row['col_name'].lower())},"
+                                     f"{quote_str_or_null(index_col_row['index_column_id'])},"
+                                     f"{quote_str_or_null(index_col_row['key_ordinal'])},"
+                                     f"{bool_to_sql_bit_boolean_val(index_col_row['is_descending_key'], db_type != DBType.MSSQL)},"
+                                     f"{quote_str_or_null(index_col_row['is_included_column'])})")
+    
+    # Insert into ScriptIndexes
+    write_insert_values_batches(db_type, script_db_state_tables, align,
+                                f"INSERT INTO {db_syntax.temp_table_prefix}ScriptIndexes (table_schema,table_name,index_name,is_unique,is_clustered,ignore_dup_key,is_primary_key,is_unique_constraint,allow_row_locks,allow_page_locks,has_filter,filter_definition,"
+                                f"{'index_columns,' if db_type == DBType.PostgreSQL else ''}SQL_CREATE{',SQL_CheckUnqData' if scripting_data else ''})",
+                                indexes_values, insert_batch_rows)
+    script_db_state_tables.write(f"{align}\n")
+    
+    # Insert index columns
+    script_db_state_tables.write(f"{align}--Insert Index Columns\n")
+    write_insert_values_batches(db_type, script_db_state_tables, align,
+                                f"INSERT INTO {db_syntax.temp_table_prefix}ScriptIndexesCols (table_schema,table_name,index_name,col_name,index_column_id,key_ordinal,is_descending_key,is_included_column)",
+                                index_cols_values, insert_batch_rows)
+    script_db_state_tables.write(f"{align}\n")
     
     # Handle checking against existing DB state
     if overall_table_schema_name_in_scripting and len(overall_table_schema_name_in_scripting) > 0:
@@ -12,6 +12,8 @@ def generate_drop_coded_ents(db_type: DBType, sql_buffer, remove_all_extra_ents:
     Drops:
     - Extra entities (codeStat=2) if remove_all_extra_ents is True
     - Entities that need to be altered (codeStat=3) - they will be re-created later
+
+    Both in reverse creation order (ScriptCode.sort_order), so an entity is dropped before the ones it depends on.
     """
     sql_buffer.write("\n")
     if db_type == DBType.PostgreSQL:
@@ -28,6 +30,7 @@ def generate_drop_coded_ents(db_type: DBType, sql_buffer, remove_all_extra_ents:
             sql_buffer.write("\t\tent_type \n")
             sql_buffer.write("\tFROM    #ScriptCode \n")
             sql_buffer.write("\tWHERE codeStat=2 \n")
+            sql_buffer.write("\tORDER BY sort_order DESC \n")
             sql_buffer.write("\t\tOPEN codedDrop \n")
             sql_buffer.write("FETCH NEXT FROM codedDrop INTO @table_schema, @table_name,@ent_type \n")
             sql_buffer.write("WHILE @@FETCH_STATUS = 0  \n")
@@ -50,6 +53,7 @@ def generate_drop_coded_ents(db_type: DBType, sql_buffer, remove_all_extra_ents:
             sql_buffer.write("\t\tSelect s.ent_schema , s.ent_name, s.ent_type, s.param_type_list  \n")
             sql_buffer.write("\t\tFROM ScriptCode s\n")
             sql_buffer.write("\t\tWHERE codeStat = 2\n")
+            sql_buffer.write("\t\tORDER BY s.sort_order DESC\n")
             sql_buffer.write("LOOP\n")
             utils.add_print(db_type, 1, sql_buffer, "'' || temprow.ent_schema || '.' || temprow.ent_name || ' is extra. Drop this code:'")
             utils.add_exec_sql(db_type, 1, sql_buffer, "'DROP  ' || temprow.ent_type || ' ' || temprow.ent_schema || '.' || temprow.ent_name || CASE WHEN temprow.ent_type IN ('FUNCTION', 'PROCEDURE') THEN '(' || COALESCE(temprow.param_type_list,'') || ')' ELSE '' END")
@@ -67,6 +71,7 @@ def generate_drop_coded_ents(db_type: DBType, sql_buffer, remove_all_extra_ents:
         sql_buffer.write("\t\tent_type \n")
         sql_buffer.write("\tFROM    #ScriptCode \n")
         sql_buffer.write("\tWHERE codeStat=3 \n")
+        sql_buffer.write("\tORDER BY sort_order DESC \n")
         sql_buffer.write("\t\tOPEN codedDropPreAdd \n")
         sql_buffer.write("FETCH NEXT FROM codedDropPreAdd INTO @table_schema, @table_name,@ent_type \n")
         sql_buffer.write("WHILE @@FETCH_STATUS = 0  \n")
@@ -90,6 +95,7 @@ def generate_drop_coded_ents(db_type: DBType, sql_buffer, remove_all_extra_ents:
             sql_buffer.write("\t\t\tSELECT  s.ent_schema , s.ent_name, s.ent_type, S.param_type_list \n")
             sql_buffer.write("\t\t\tFROM ScriptCode s\n")
             sql_buffer.write("\t\t\tWHERE codeStat = 3 \n")
+            sql_buffer.write("\t\t\tORDER BY s.sort_order DESC \n")
             sql_buffer.write("\t\tLOOP\n")
             utils.add_print(db_type, 1, sql_buffer, "'' || temprow.ent_schema || '.' || temprow.ent_name || ' is different. Drop and then add:'")
             utils.add_exec_sql(db_type, 1, sql_buffer, "'DROP ' || temprow.ent_type || ' ' || temprow.ent_schema || '.' || temprow.ent_name || CASE WHEN temprow.ent_type IN ('FUNCTION', 'PROCEDURE') THEN '(' || COALESCE(temprow.param_type_list,'') || ')' ELSE '' END || ';'")
@@ -112,6 +118,9 @@ def generate_add_coded_ents(db_type: DBType, sql_buffer, got_specific_tables: bo
     Creates:
     - New entities (codeStat=1)
     - Entities that were altered/dropped (codeStat=3) - re-creating them
+
+    In ScriptCode.sort_order, so an entity is created after the ones it depends on (views on views, views
+    calling functions, triggers on their functions) in one pass.
     """
     sql_buffer.write("\n")
     if db_type == DBType.PostgreSQL:
@@ -128,6 +137,7 @@ def generate_add_coded_ents(db_type: DBType, sql_buffer, got_specific_tables: bo
         sql_buffer.write("\t\tSQL_CREATE \n")
         sql_buffer.write("\tFROM    #ScriptCode \n")
         sql_buffer.write("\tWHERE codeStat IN (1,3)\n")
+        sql_buffer.write("\tORDER BY sort_order \n")
         sql_buffer.write("\t\tOPEN codedAdd \n")
         sql_buffer.write("FETCH NEXT FROM codedAdd INTO @table_schema, @table_name,@SQL_CREATE \n")
         sql_buffer.write("WHILE @@FETCH_STATUS = 0  \n")
@@ -151,6 +161,7 @@ def generate_add_coded_ents(db_type: DBType, sql_buffer, got_specific_tables: bo
             sql_buffer.write("\t\t\tSELECT  s.ent_schema , s.ent_name, s.sql_create, s.ent_type \n")
             sql_buffer.write("\t\t\tFROM ScriptCode s\n")
             sql_buffer.write("\t\t\tWHERE codeStat IN (1,3) \n")
+            sql_buffer.write("\t\t\tORDER BY s.sort_order \n")
             sql_buffer.write("\t\tLOOP\n")
             utils.add_print(db_type, 1, sql_buffer, "'' || temprow.ent_type || ' ' || temprow.ent_schema || '.' || temprow.ent_name || ' will be added'")
             utils.add_exec_sql(db_type, 1, sql_buffer, "temprow.SQL_CREATE")
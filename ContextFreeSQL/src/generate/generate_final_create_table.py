@@ -6,8 +6,10 @@ import re
 from src.defs.script_defs import DBType, DBSyntax, ScriptingOptions, ScriptTableOptions, DBEntScriptState
 from src.data_load.from_db.load_from_db_pg import DBSchema
 from typing import List, Dict, Any
+from collections.abc import Mapping
 from io import StringIO
 from src.utils import funcs as utils, code_funcs
+from src.generate.ddl_cache import DDLCache
 
 
 def _is_serial_default(default_definition: str, col_type: str) -> Optional[str]:
@@ -60,6 +62,11 @@ def _pg_fk_action_to_sql(action_char: str) -> str:
     return None
 
 
+def _row_records(rows: pd.DataFrame | List[Mapping]) -> List[Mapping]:
+    """Rows as records: a list (of catalog records, see CatalogIndex) as is, a DataFrame as its to_dict('records')."""
+    return rows if isinstance(rows, list) else rows.to_dict('records')
+
+
 def get_create_table_from_sys_tables(
     db_type: DBType,
     table_schema: str,
@@ -68,7 +75,8 @@ def get_create_table_from_sys_tables(
     script_table_ops: Optional[ScriptTableOptions] = None,
     force_allow_null: bool = False,
     pre_add_constraints_data_checks: bool = False,    #!tbd
-    as_temp_table: bool = False
+    as_temp_table: bool = False,
+    ddl_cache: Optional[DDLCache] = None
 ) -> tuple[str, str]:
     
     try:
@@ -79,17 +87,15 @@ def get_create_table_from_sys_tables(
             script_table_ops = ScriptTableOptions()
 
         db_syntax = DBSyntax.get_syntax(db_type)
+        catalog = schema_tables.catalog
 
         # Get the table information
-        table_rows = schema_tables.tables[
-            (schema_tables.tables['entschema'] == table_schema) & 
-            (schema_tables.tables['entname'] == table_name)
-        ]
+        table_rows = catalog.tables.records(table_schema, table_name)
         
         if len(table_rows) == 0:
             return ("", f"could not find table in the result set: {table_schema}.{table_name}")
 
-        table_row = table_rows.iloc[0]
+        table_row = table_rows[0]
         create_table_lines = []
 
         # Determine full table name based on DB type
@@ -109,26 +115,21 @@ def get_create_table_from_sys_tables(
         create_table_lines.append("(")
 
         # Add columns
-        col_rows = schema_tables.columns[
-            schema_tables.columns['object_id'] == table_row['object_id']
-        ].sort_values('column_id')
+        col_rows = sorted(catalog.columns.records(table_row['object_id']), key=lambda col_row: col_row['column_id'])
 
         # Build a dict of column defaults for inline inclusion (PostgreSQL)
         col_defaults = {}
         if script_table_ops.defaults and schema_tables.defaults is not None and not schema_tables.defaults.empty:
-            default_rows = schema_tables.defaults[
-                (schema_tables.defaults['table_schema'] == table_schema) &
-                (schema_tables.defaults['table_name'] == table_name)
-            ]
-            for _, default_row in default_rows.iterrows():
+            default_rows = catalog.defaults.records(table_schema, table_name)
+            for default_row in default_rows:
                 col_defaults[default_row['col_name']] = default_row['default_definition']
 
         col_num = 0
-        for idx, col_row in col_rows.iterrows():
+        for col_row in col_rows:
             col_num += 1
             col_sql = get_col_sql(
                 col_row, table_row['table_schema'], table_row['table_name'],
-                DBEntScriptState.InLine, db_type, script_table_ops.column_identity, force_allow_null
+                DBEntScriptState.InLine, db_type, script_table_ops.column_identity, force_allow_null, ddl_cache=ddl_cache
             ).strip()
 
             # For PostgreSQL, include DEFAULT inline with the column
@@ -162,70 +163,46 @@ def get_create_table_from_sys_tables(
         
         
         if script_table_ops.indexes and schema_tables.indexes is not None and not schema_tables.indexes.empty:
-            idx_rows = schema_tables.indexes[
-                schema_tables.indexes['object_id'] == table_row['object_id']
-            ]
+            idx_rows = catalog.indexes.records(table_row['object_id'])
 
             # First pass: output PRIMARY KEY constraints first
-            for _, idx_row in idx_rows.iterrows():
+            for idx_row in idx_rows:
                 if not utils.val_if_null(idx_row.get('is_primary_key'), False):
                     continue  # Skip non-PK indexes in first pass
 
                 if db_type == DBType.MSSQL:
-                    idx_cols = schema_tables.index_cols[
-                        (schema_tables.index_cols['object_id'] == table_row['object_id']) &
-                        (schema_tables.index_cols['index_id'] == idx_row['index_id'])
-                    ]
+                    idx_cols = catalog.index_cols_by_id.records(table_row['object_id'], idx_row['index_id'])
                 else:
-                    idx_cols = schema_tables.index_cols[
-                        (schema_tables.index_cols['object_id'] == table_row['object_id']) &
-                        (schema_tables.index_cols['index_name'] == idx_row['index_name'])
-                    ]
-                index_sql = get_index_sql(idx_row, idx_cols, db_type)
+                    idx_cols = catalog.index_cols_by_name.records(table_row['object_id'], idx_row['index_name'])
+                index_sql = get_index_sql(idx_row, idx_cols, db_type, ddl_cache=ddl_cache)
                 create_table_lines.append(index_sql + ";")
 
             # Second pass: output regular indexes (non-PK)
-            for _, idx_row in idx_rows.iterrows():
+            for idx_row in idx_rows:
                 if utils.val_if_null(idx_row.get('is_primary_key'), False):
                     continue  # Skip PK indexes in second pass
 
                 if db_type == DBType.MSSQL:
-                    idx_cols = schema_tables.index_cols[
-                        (schema_tables.index_cols['object_id'] == table_row['object_id']) &
-                        (schema_tables.index_cols['index_id'] == idx_row['index_id'])
-                    ]
+                    idx_cols = catalog.index_cols_by_id.records(table_row['object_id'], idx_row['index_id'])
                 else:
-                    idx_cols = schema_tables.index_cols[
-                        (schema_tables.index_cols['object_id'] == table_row['object_id']) &
-                        (schema_tables.index_cols['index_name'] == idx_row['index_name'])
-                    ]
-                index_sql = get_index_sql(idx_row, idx_cols, db_type)
+                    idx_cols = catalog.index_cols_by_name.records(table_row['object_id'], idx_row['index_name'])
+                index_sql = get_index_sql(idx_row, idx_cols, db_type, ddl_cache=ddl_cache)
                 create_table_lines.append(index_sql + ";")
 
         # Add foreign keys if requested
         if script_table_ops.foreign_keys and schema_tables.fks is not None and not schema_tables.fks.empty:
-            fk_rows = schema_tables.fks[
-                (schema_tables.fks['fkey_table_schema'] == table_schema) &
-                (schema_tables.fks['fkey_table_name'] == table_name)
-            ]
+            fk_rows = catalog.fks.records(table_schema, table_name)
             
-            for _, fk_row in fk_rows.iterrows():
-                fk_cols = schema_tables.fk_cols[
-                    (schema_tables.fk_cols['fkey_table_schema'] == fk_row['fkey_table_schema']) &
-                    (schema_tables.fk_cols['fkey_table_name'] == fk_row['fkey_table_name']) &
-                    (schema_tables.fk_cols['fk_name'] == fk_row['fk_name'])
-                ]
-                create_table_lines.append(get_fk_sql(fk_row.to_dict(), fk_cols, db_type) + ";")
+            for fk_row in fk_rows:
+                fk_cols = catalog.fk_cols.records(fk_row['fkey_table_schema'], fk_row['fkey_table_name'], fk_row['fk_name'])
+                create_table_lines.append(get_fk_sql(fk_row, fk_cols, db_type, ddl_cache=ddl_cache) + ";")
         
         #defaults - only add as separate ALTER statements for MSSQL (PostgreSQL includes them inline)
         if db_type == DBType.MSSQL and script_table_ops.defaults and schema_tables.defaults is not None and not schema_tables.defaults.empty:
-            default_rows = schema_tables.defaults[
-                (schema_tables.defaults['table_schema'] == table_schema) &
-                (schema_tables.defaults['table_name'] == table_name)
-            ]
+            default_rows = catalog.defaults.records(table_schema, table_name)
 
-            for _, default_row in default_rows.iterrows():
-                create_table_lines.append(get_default_sql(db_type, default_row.to_dict()))
+            for default_row in default_rows:
+                create_table_lines.append(get_default_sql(db_type, default_row))
 
         return ("\n".join(create_table_lines),"")
 
@@ -268,13 +245,17 @@ def get_col_sql(
     db_type: DBType, 
     column_identity: bool = True, 
     force_allow_null: bool = False, 
-    actual_size: bool = False
+    actual_size: bool = False,
+    ddl_cache: Optional[DDLCache] = None
 ) -> str:
+    if ddl_cache is not None:
+        return ddl_cache.fragment('columns', (table_schema, table_name, sys_cols_row['col_name'], script_state, db_type, column_identity, force_allow_null, actual_size),
+                                  lambda: get_col_sql(sys_cols_row, table_schema, table_name, script_state, db_type, column_identity, force_allow_null, actual_size))
     sql = []
 
     # Check for default constraint
     has_default = False
-    if 'col_default_name' in sys_cols_row.index:
+    if 'col_default_name' in sys_cols_row:
         has_default = not pd.isna(sys_cols_row['col_default_name'])
 
     # Build ALTER TABLE part
@@ -324,7 +305,7 @@ def get_col_sql(
         sql.append(type_size_prec_scale)
 
     # MySQL unsigned
-    if 'col_unsigned' in sys_cols_row.index:
+    if 'col_unsigned' in sys_cols_row:
         if sys_cols_row.get('col_unsigned', False):
             sql.append(" UNSIGNED ")
 
@@ -380,8 +361,12 @@ def get_col_sql(
 
 
 
-def get_index_sql(index_row: Dict[str, Any], index_cols_rows: pd.DataFrame, db_type: DBType, in_line: bool = False) -> str:
+def get_index_sql(index_row: Dict[str, Any], index_cols_rows: pd.DataFrame | List[Mapping], db_type: DBType, in_line: bool = False, ddl_cache: Optional[DDLCache] = None) -> str:
+    if ddl_cache is not None:
+        return ddl_cache.fragment('indexes', (index_row['table_schema'], index_row['table_name'], index_row['index_name'], db_type, in_line),
+                                  lambda: get_index_sql(index_row, index_cols_rows, db_type, in_line))
     buffer = StringIO()
+    index_cols_rows = _row_records(index_cols_rows)
     
     if utils.val_if_null(index_row.get('is_primary_key'), False):
         if db_type == DBType.MSSQL:
@@ -390,10 +375,10 @@ def get_index_sql(index_row: Dict[str, Any], index_cols_rows: pd.DataFrame, db_t
             buffer.write(f"CONSTRAINT [{index_row['name']}] PRIMARY KEY {index_row['type_desc']}\n")
             buffer.write("(\n")
             
-            if not index_cols_rows:
+            if len(index_cols_rows) == 0:
                 raise Exception(f"Internal Error: Primary Key '{index_row['index_name']}' on table [{index_row['table_schema']}].[{index_row['table_name']}] has no columns")
             
-            for col in index_cols_rows.to_dict('records'):
+            for col in index_cols_rows:
                 if col is None:
                     raise Exception(f"Primary Key '{index_row['index_name']}' has an unknown field")
                 
@@ -423,10 +408,10 @@ def get_index_sql(index_row: Dict[str, Any], index_cols_rows: pd.DataFrame, db_t
             buffer.write(f"PRIMARY KEY {'CLUSTERED ' if index_row['type'] == 1 else ''}\n")
             buffer.write("(\n")
             
-            if not index_cols_rows:
+            if len(index_cols_rows) == 0:
                 raise Exception(f"Internal Error: Primary Key '{index_row['index_name']}' on table {index_row['table_name']} has no columns")
             
-            for col in index_cols_rows.to_dict('records'):
+            for col in index_cols_rows:
                 if col is None:
                     raise Exception(f"Primary Key '{index_row['index_name']}' has an unknown field")
                 
@@ -440,11 +425,11 @@ def get_index_sql(index_row: Dict[str, Any], index_cols_rows: pd.DataFrame, db_t
             
         elif db_type == DBType.PostgreSQL:
             # Generate single-line format to match pg_indexes output
-            if index_cols_rows.empty:
+            if len(index_cols_rows) == 0:
                 raise Exception(f"Internal Error: Primary Key '{index_row['index_name']}' on table {index_row['table_schema']}.{index_row['table_name']} has no columns")
 
             cols = []
-            for col in index_cols_rows.to_dict('records'):
+            for col in index_cols_rows:
                 if col is None:
                     raise Exception(f"Primary Key '{index_row['index_name']}' has an unknown field")
                 col_str = col['name']
@@ -462,10 +447,10 @@ def get_index_sql(index_row: Dict[str, Any], index_cols_rows: pd.DataFrame, db_t
             buffer.write(f"CONSTRAINT [{index_row['name']}] UNIQUE {'CLUSTERED ' if index_row['type'] == 1 else ''}\n")
             buffer.write("(\n")
             
-            if not index_cols_rows:
+            if len(index_cols_rows) == 0:
                 raise Exception(f"Internal Error: Index '{index_row['index_name']}' on table [{index_row['table_schema']}].[{index_row['table_name']}] has no columns")
             
-            for col in index_cols_rows.to_dict('records'):
+            for col in index_cols_rows:
                 if col is None:
                     raise Exception(f"Unique Constraint '{col['col_name']}' has an unknown field")
                 
@@ -481,11 +466,11 @@ def get_index_sql(index_row: Dict[str, Any], index_cols_rows: pd.DataFrame, db_t
             table_ref = (f"{index_row['table_schema']}.{index_row['table_name']}"
                         if db_type == DBType.PostgreSQL else index_row['table_name'])
 
-            if index_cols_rows.empty:
+            if len(index_cols_rows) == 0:
                 raise Exception(f"Internal Error: Index '{index_row['index_name']}' on table {table_ref} has no columns")
 
             cols = []
-            for col in index_cols_rows.to_dict('records'):
+            for col in index_cols_rows:
                 if col is None:
                     raise Exception(f"Unique Constraint '{index_row['index_name']}' has an unknown field")
                 col_str = col['col_name']
@@ -517,10 +502,10 @@ def get_index_sql(index_row: Dict[str, Any], index_cols_rows: pd.DataFrame, db_t
             buffer.write("(\n")
             
             included_cols = []
-            if not index_cols_rows:
+            if len(index_cols_rows) == 0:
                 raise Exception(f"Internal Error: Index '{index_row['index_name']}' on table [{index_row['table_schema']}].[{index_row['table_name']}] has no columns")
             
-            for col in index_cols_rows.to_dict('records'): 
+            for col in index_cols_rows: 
                 if utils.val_if_null(col.get('is_included_column'), 0):
                     included_cols.append(col['col_name'])
                     continue
@@ -558,11 +543,11 @@ def get_index_sql(index_row: Dict[str, Any], index_cols_rows: pd.DataFrame, db_t
             table_ref = (f"{index_row['table_schema']}.{index_row['table_name']}"
                         if db_type == DBType.PostgreSQL else index_row['table_name'])
 
-            if index_cols_rows.empty:
+            if len(index_cols_rows) == 0:
                 raise Exception(f"Internal Error: Index '{index_row['index_name']}' on table {table_ref} has no columns")
 
             cols = []
-            for col in index_cols_rows.to_dict('records'):
+            for col in index_cols_rows:
                 if col is None:
                     raise Exception(f"Index '{index_row['index_name']}' has an unknown field")
                 col_str = col['col_name']
@@ -589,19 +574,23 @@ def get_index_sql(index_row: Dict[str, Any], index_cols_rows: pd.DataFrame, db_t
     buffer.close()
     return result
 
-def get_fk_sql(fk_row: Dict[str, Any], fk_cols_rows: pd.DataFrame, db_type: DBType, from_rndph: bool = False) -> str:
+def get_fk_sql(fk_row: Dict[str, Any], fk_cols_rows: pd.DataFrame | List[Mapping], db_type: DBType, from_rndph: bool = False, ddl_cache: Optional[DDLCache] = None) -> str:
+    if ddl_cache is not None:
+        return ddl_cache.fragment('fks', (fk_row['fkey_table_schema'], fk_row['fkey_table_name'], fk_row['fk_name'], db_type, from_rndph),
+                                  lambda: get_fk_sql(fk_row, fk_cols_rows, db_type, from_rndph))
     buffer = StringIO()
+    fk_cols_rows = _row_records(fk_cols_rows)
     
     if db_type == DBType.MSSQL:
         buffer.write(f"ALTER TABLE [{fk_row['fkey_table_schema']}].[{fk_row['fkey_table_name']}] ADD ")
         buffer.write(f"CONSTRAINT [{fk_row['fk_name']}] FOREIGN KEY\n")
         buffer.write("(\n")
         
-        if fk_cols_rows.empty:
+        if len(fk_cols_rows) == 0:
             raise Exception(f"Internal Error: foreign key '{fk_row['fk_name']}' (on table [{fk_row['fkey_table_schema']}].[{fk_row['fkey_table_name']}]) has no fields defined for it for the table")
         
         # Write foreign key columns
-        for col in fk_cols_rows.to_dict('records'):
+        for col in fk_cols_rows:
             buffer.write(f"[{col['fkey_col_name']}],\n")
             
         buffer.seek(buffer.tell() - 2)  # Remove last comma
@@ -612,7 +601,7 @@ def get_fk_sql(fk_row: Dict[str, Any], fk_cols_rows: pd.DataFrame, db_type: DBTy
         buffer.write("(\n")
         
         # Write referenced columns
-        for col in fk_cols_rows.to_dict('records'):
+        for col in fk_cols_rows:
             buffer.write(f"[{col['rkey_col_name']}],\n")
             
         buffer.seek(buffer.tell() - 2)  # Remove last comma
@@ -633,11 +622,11 @@ def get_fk_sql(fk_row: Dict[str, Any], fk_cols_rows: pd.DataFrame, db_type: DBTy
         buffer.write(f"CONSTRAINT {fk_row['fk_name']} FOREIGN KEY\n")
         buffer.write("(\n")
         
-        if fk_cols_rows.empty:
+        if len(fk_cols_rows) == 0:
             raise Exception(f"Internal Error: foreign key '{fk_row['fk_name']}' (on table {fk_row['fkey_table_name']}) has no fields defined for it for the table")
         
         # Write foreign key columns
-        for col in fk_cols_rows.to_dict('records'):
+        for col in fk_cols_rows:
             buffer.write(f"{col['fkey_col_name']},\n")
             
         buffer.seek(buffer.tell() - 2)  # Remove last comma
@@ -648,7 +637,7 @@ def get_fk_sql(fk_row: Dict[str, Any], fk_cols_rows: pd.DataFrame, db_type: DBTy
         buffer.write("(\n")
         
         # Write referenced columns
-        for col in fk_cols_rows.to_dict('records'):
+        for col in fk_cols_rows:
             buffer.write(f"{col['rkey_col_name']},\n")
             
         buffer.seek(buffer.tell() - 2)  # Remove last comma
@@ -663,11 +652,11 @@ def get_fk_sql(fk_row: Dict[str, Any], fk_cols_rows: pd.DataFrame, db_type: DBTy
         buffer.write(f"CONSTRAINT {fk_row['fk_name']} FOREIGN KEY\n")
         buffer.write("(\n")
         
-        if fk_cols_rows.empty:
+        if len(fk_cols_rows) == 0:
             raise Exception(f"Internal Error: foreign key '{fk_row['fk_name']}' (on table {fk_row['fkey_table_schema']}.{fk_row['fkey_table_name']}) has no fields defined for it for the table")
         
         # Write foreign key columns
-        for col in fk_cols_rows.to_dict('records'):
+        for col in fk_cols_rows:
             buffer.write(f"{col['fkey_col_name']},\n")
             
         buffer.seek(buffer.tell() - 2)  # Remove last comma
@@ -678,7 +667,7 @@ def get_fk_sql(fk_row: Dict[str, Any], fk_cols_rows: pd.DataFrame, db_type: DBTy
         buffer.write("(\n")
         
         # Write referenced columns
-        for col in fk_cols_rows.to_dict('records'):
+        for col in fk_cols_rows:
             buffer.write(f"{col['rkey_col_name']},\n")
             
         buffer.seek(buffer.tell() - 2)  # Remove last comma
@@ -1,5 +1,6 @@
 from io import StringIO
 import os
+from typing import TextIO
 import pandas as pd
 from src.data_load.from_db.load_from_db_pg import DBSchema
 from src.defs.script_defs import DBType, DBSyntax, ScriptingOptions, InputOutput, ListTables, SQLScriptParams
@@ -8,6 +9,9 @@ from src.generate.generate_db_ent_types.generate_state_tables.tables import crea
 from src.generate.generate_db_ent_types.generate_state_tables.coded import create_db_state_temp_tables_for_coded
 from src.generate.generate_db_ent_types.generate_state_tables.tables_check_constraints import create_db_state_check_constraints
 from src.utils import code_funcs
+from src.utils.funcs import add_print
+from src.data_load.from_db.schema_fingerprint import schema_fingerprint_sql
+from src.generate.ddl_cache import DDLCache
 
 from src.generate.generate_final_indexes_fks import generate_pre_drop_post_add_indexes_fks
 from src.generate.generate_final_tables import generate_add_tables, generate_drop_tables
@@ -22,10 +26,26 @@ from src.generate.generate_final_security import (
     generate_grant_function_permissions, generate_revoke_and_drop_extra_security
 )
 
-#core proc for this whole app
 def generate_all_script(schema_tables: DBSchema, db_type: DBType, tbl_ents: pd.DataFrame, scrpt_ops: ScriptingOptions, input_output: InputOutput, got_specific_tables: bool, tables_data: ListTables | None = None, sql_script_params: SQLScriptParams | None = None) -> str:
-    db_syntax = DBSyntax.get_syntax(db_type)
+    """The whole script as one string. See write_all_script to stream it to a file instead."""
     buffer = StringIO()
+    write_all_script(buffer, schema_tables, db_type=db_type, tbl_ents=tbl_ents, scrpt_ops=scrpt_ops, input_output=input_output,
+                     got_specific_tables=got_specific_tables, tables_data=tables_data, sql_script_params=sql_script_params)
+    result = buffer.getvalue()
+    buffer.close()
+    return result
+
+
+#core proc for this whole app
+def write_all_script(buffer: TextIO, schema_tables: DBSchema, db_type: DBType, tbl_ents: pd.DataFrame, scrpt_ops: ScriptingOptions, input_output: InputOutput, got_specific_tables: bool, tables_data: ListTables | None = None, sql_script_params: SQLScriptParams | None = None, ddl_cache: DDLCache | None = None) -> None:
+    """Write the script to buffer (a file, or a StringIO) in script order as it's generated.
+    Only the DDL sections, which are generated before their place in the script, are held in memory;
+    the data section, which is most of the script when data is embedded, goes straight to buffer table by table.
+    The column/index/FK DDL fragments are rendered once for the run, in ddl_cache (a new one if not given)."""
+    db_syntax = DBSyntax.get_syntax(db_type)
+
+    if ddl_cache is None:
+        ddl_cache = DDLCache()
 
     # Use default SQLScriptParams if not provided
     if sql_script_params is None:
@@ -62,6 +82,9 @@ def generate_all_script(schema_tables: DBSchema, db_type: DBType, tbl_ents: pd.D
     buffer.write("\t(\n")
     buffer.write("\t\tSQLText character varying\n")
     buffer.write("\t);\n")
+
+    if _use_schema_fingerprint_check(scrpt_ops, db_type, schema_tables, tbl_ents):
+        buffer.write(build_schema_fingerprint_check(db_type, schema_tables.schema_fingerprint, include_security=scrpt_ops.script_security))
    
     
     # 2. State tables
@@ -75,7 +98,8 @@ def generate_all_script(schema_tables: DBSchema, db_type: DBType, tbl_ents: pd.D
             tbl_ents = tbl_ents,
             script_ops = scrpt_ops,
             schema_tables = schema_tables,
-            got_specific_tables = got_specific_tables
+            got_specific_tables = got_specific_tables,
+            ddl_cache = ddl_cache
         )
 
     
@@ -101,7 +125,8 @@ def generate_all_script(schema_tables: DBSchema, db_type: DBType, tbl_ents: pd.D
             schema_tables=schema_tables,
             tbl_ents_to_script=tbl_ents,
             db_type=db_type,
-            overall_table_schema_name_in_scripting=overall_table_schema_name_in_scripting
+            overall_table_schema_name_in_scripting=overall_table_schema_name_in_scripting,
+            insert_batch_rows=scrpt_ops.state_insert_batch_rows
         )
 
     buffer.write("\t--Iterate tables, generate all code----------------\n")
@@ -392,11 +417,26 @@ def generate_all_script(schema_tables: DBSchema, db_type: DBType, tbl_ents: pd.D
     elif db_type == DBType.MSSQL:
         buffer.write("SET NOCOUNT OFF\n")
 
-    # Get final string and clean up
-    result = buffer.getvalue()
-    buffer.close()
-    
-    return result
+
+def _use_schema_fingerprint_check(scrpt_ops: ScriptingOptions, db_type: DBType, schema_tables: DBSchema, tbl_ents: pd.DataFrame) -> bool:
+    # on a match the check ends the script, so it's only written into scripts that do nothing but the schema compare
+    # (the data section works off the state tables). The fingerprint is a PostgreSQL catalog query
+    if not (scrpt_ops.schema_fingerprint_check and db_type == DBType.PostgreSQL and schema_tables.schema_fingerprint):
+        return False
+    return not ((tbl_ents['enttype'] == 'Table') & (tbl_ents['scriptdata'] == True)).any()
+
+
+def build_schema_fingerprint_check(db_type: DBType, fingerprint: str, include_security: bool) -> str:
+    """Compute the target's schema fingerprint with the query the source's was (schema_fingerprint_sql), and when it's
+    the source's, log it and end the script before the state tables are built: the target's schema is already the source's."""
+    check = StringIO()
+    fingerprint_sql = schema_fingerprint_sql(include_security).replace("\n", "\n\t\t")
+    check.write("\t--Schema fingerprint: nothing to compare if the target's schema is already the source's----------------\n")
+    check.write(f"\tIF ({fingerprint_sql}) = '{fingerprint}' THEN\n")
+    add_print(db_type, 2, check, f"'Schema fingerprint {fingerprint} matches the source''s: the schema is up to date, schema compare skipped'")
+    check.write("\t\tRETURN;\n")
+    check.write("\tEND IF;\n")
+    return check.getvalue()
 
 
 def build_script_header(db_syntax: DBSyntax, scrpt_ops: ScriptingOptions, sql_script_params: SQLScriptParams, filename: str, base_path: str = "", include_base_path: bool = False) -> str:
@@ -1,9 +1,14 @@
 import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
 import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
 from psycopg2.extras import RealDictCursor
 from src.defs.script_defs import ConfigVals, DBConnSettings
 
-class Database:        
+class Database:
     @staticmethod
     def connect_to_database(conn_settings: DBConnSettings):
         conn = psycopg2.connect(
@@ -15,3 +20,140 @@ class Database:
         )
         return conn
 
+
+@dataclass
+class QueryTiming:
+    label: str
+    seconds: float
+    rows: int
+
+
+class DBSession:
+    """One connection shared by the whole load phase (schema, entities, table data).
+
+    Opening a connection per query is expensive against TLS/pgbouncer-fronted servers, so the loaders
+    take a session and run all their queries on it. Every query executed through execute() is timed.
+    """
+
+    def __init__(self, conn_settings: DBConnSettings, snapshot_id: Optional[str] = None, parent: Optional["DBSession"] = None):
+        self.conn_settings = conn_settings
+        self.conn = None
+        self.connections_opened = 0
+        self.snapshot_id = snapshot_id  # set on worker sessions: every transaction imports this snapshot
+        self.parent = parent
+        self.exported_snapshot: Optional[str] = None
+        # workers record into their parent's list, so one report covers the whole load
+        self.timings: List[QueryTiming] = parent.timings if parent else []
+        # worker sessions opened on threads count their connections on the parent, under its lock
+        self._count_lock = parent._count_lock if parent else threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_conn(self):
+        if self.conn is None or self.conn.closed:
+            self.conn = Database.connect_to_database(self.conn_settings)
+            self.count_connections(1)
+            if self.snapshot_id:
+                self.conn.set_session(isolation_level=ISOLATION_LEVEL_REPEATABLE_READ, readonly=True)
+                self._import_snapshot()
+        return self.conn
+
+    def count_connections(self, count: int) -> None:
+        """Add count to the connections reported by print_timings (the parent's, for a worker session)."""
+        with self._count_lock:
+            (self.parent or self).connections_opened += count
+
+    def _import_snapshot(self) -> None:
+        with self.conn.cursor() as cur:
+            cur.execute("SET TRANSACTION SNAPSHOT %s", (self.snapshot_id,))
+
+    def export_snapshot(self) -> str:
+        """Open a repeatable-read transaction on this session and export its snapshot, so worker sessions
+        (see worker()) all read the database as of the same moment. Ended by end_snapshot()."""
+        conn = self.get_conn()
+        conn.rollback()
+        conn.set_session(isolation_level=ISOLATION_LEVEL_REPEATABLE_READ, readonly=True)
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_export_snapshot()")
+            self.exported_snapshot = cur.fetchone()[0]
+        return self.exported_snapshot
+
+    def end_snapshot(self) -> None:
+        if self.conn is not None and not self.conn.closed:
+            self.conn.rollback()
+            self.conn.set_session(isolation_level="DEFAULT", readonly="DEFAULT")
+        self.exported_snapshot = None
+
+    def worker(self) -> "DBSession":
+        """A session on its own connection that imports this session's exported snapshot."""
+        return DBSession(self.conn_settings, snapshot_id=self.exported_snapshot, parent=self)
+
+    def cursor(self, cursor_factory=RealDictCursor):
+        return self.get_conn().cursor(cursor_factory=cursor_factory)
+
+    def execute(self, cur, sql: str, label: Optional[str] = None, params=None) -> None:
+        start = time.perf_counter()
+        try:
+            cur.execute(sql, params)
+        except Exception:
+            # a failed statement aborts the transaction; roll back so the next query on the shared connection can run
+            cur.connection.rollback()
+            if self.snapshot_id:
+                self._import_snapshot()
+            raise
+        finally:
+            rows = cur.rowcount if cur.rowcount is not None and cur.rowcount >= 0 else 0
+            self.timings.append(QueryTiming(label or sql.strip()[:40], time.perf_counter() - start, rows))
+
+    def stream(self, cur, sql: str, label: Optional[str] = None, chunk_rows: int = 10000) -> Iterator[list]:
+        """Run sql on a named (server-side) cursor and yield its rows in lists of up to chunk_rows, so the
+        whole result never sits in client memory. Recorded as one timing covering the full fetch."""
+        start = time.perf_counter()
+        rows = 0
+        try:
+            cur.execute(sql)
+            while True:
+                chunk = cur.fetchmany(chunk_rows)
+                if not chunk:
+                    break
+                rows += len(chunk)
+                yield chunk
+        except Exception:
+            cur.close()  # before the rollback, which drops the server-side cursor
+            cur.connection.rollback()
+            if self.snapshot_id:
+                self._import_snapshot()
+            raise
+        finally:
+            self.timings.append(QueryTiming(label or sql.strip()[:40], time.perf_counter() - start, rows))
+
+    def copy_out(self, cur, sql: str, file, label: Optional[str] = None) -> None:
+        """Run a COPY ... TO STDOUT statement, writing its output to file."""
+        start = time.perf_counter()
+        try:
+            cur.copy_expert(sql, file)
+        except Exception:
+            cur.connection.rollback()
+            if self.snapshot_id:
+                self._import_snapshot()
+            raise
+        finally:
+            rows = cur.rowcount if cur.rowcount is not None and cur.rowcount >= 0 else 0
+            self.timings.append(QueryTiming(label or sql.strip()[:40], time.perf_counter() - start, rows))
+
+    def print_timings(self) -> None:
+        if not self.timings:
+            return
+        total = sum(t.seconds for t in self.timings)
+        print(f"DB queries: {len(self.timings)} on {self.connections_opened} connection(s), {total * 1000:.1f} ms total")
+        for t in self.timings:
+            print(f"  {t.label}: {t.seconds * 1000:.1f} ms, {t.rows} rows")
+
+    def close(self) -> None:
+        if self.conn is not None and not self.conn.closed:
+            self.conn.close()
+        self.conn = None
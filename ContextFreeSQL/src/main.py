@@ -3,18 +3,25 @@ import argparse
 import getpass
 from pathlib import Path
 from dataclasses import dataclass
+from functools import partial
 from datetime import datetime
 import os
 import shutil
+import multiprocessing
 
 from src.utils.load_config import load_config
 from src.utils.resources import get_template_path, get_default_config_path, get_docs_path, is_bundled
-from src.data_load.from_db.load_from_db_pg import load_all_schema, load_all_db_ents, load_all_tables_data
-from src.generate.generate_script import generate_all_script
+from src.data_load.from_db.load_from_db_pg import load_all_schema, load_all_db_ents, load_all_tables_data, PipelinedTablesData
+from src.generate.generate_script import write_all_script
+from src.generate.ddl_cache import DDLCache
 from src.defs.script_defs import DBType, ScriptingOptions, ConfigVals
+from src.infra.database import DBSession
+from src.data_load.from_db.catalog_cache import CatalogCache
 
 __version__ = '0.2.2'
 
+SCRIPT_WRITE_BUFFER_BYTES = 1024 * 1024  # the script is written in many small pieces
+
 
 def show_config_docs():
     """Display the configuration documentation."""
@@ -279,16 +286,26 @@ def main():
         print(f"         Bundled path: {get_template_path('code_diff_template.html')}")
         print("         Code diff generation may fail.")
 
-    schema = load_all_schema(config_vals.db_conn, load_security=config_vals.script_ops.script_security)
+    # one connection shared by the whole load phase (schema, entities, data)
+    db_session = DBSession(config_vals.db_conn)
+    catalog_cache = CatalogCache(os.path.join(output_dir, ".catalog_cache"), config_vals.db_conn) if config_vals.db_load_ops.catalog_cache else None
+    load_workers = config_vals.db_load_ops.load_workers if config_vals.db_load_ops.parallel_catalog_load else 1
+    # with specific entities configured, the catalog queries only read those
+    entity_filter = config_vals.db_ents_to_load.tables if len(config_vals.db_ents_to_load.tables) >= 1 else None
+    schema = load_all_schema(config_vals.db_conn, load_security=config_vals.script_ops.script_security, session=db_session, parallel_workers=load_workers, catalog_backend=config_vals.db_load_ops.catalog_backend, cache=catalog_cache, entity_filter=entity_filter, schema_fingerprint=config_vals.script_ops.schema_fingerprint_check)
 
      # Determine which entities to load
     if len(config_vals.db_ents_to_load.tables) >= 1:
         # Load specific entities from config
         entities_to_load = config_vals.db_ents_to_load.tables
-        tbl_ents = load_all_db_ents(config_vals.db_conn, entity_filter=entities_to_load)  # Assuming load_all_db_ents supports filtering
+        tbl_ents = load_all_db_ents(config_vals.db_conn, entity_filter=entities_to_load, session=db_session, catalog_backend=config_vals.db_load_ops.catalog_backend, cache=catalog_cache)  # Assuming load_all_db_ents supports filtering
     else:
         # Default: load all entities
-        tbl_ents = load_all_db_ents(config_vals.db_conn)
+        tbl_ents = load_all_db_ents(config_vals.db_conn, session=db_session, catalog_backend=config_vals.db_load_ops.catalog_backend, cache=catalog_cache)
+
+    data_itersize = config_vals.db_load_ops.itersize if config_vals.db_load_ops.stream_table_data else None
+    data_workers = config_vals.db_load_ops.load_workers if config_vals.db_load_ops.parallel_data_load else 1
+    pipelined = config_vals.db_load_ops.pipelined_data_load
 
     # Mark tables for scripting
     if len(config_vals.tables_data.tables) >= 1:  # Changed from >1 to >=1 to handle single table
@@ -300,14 +317,31 @@ def main():
         tbl_ents.loc[table_filter.isin(tables_to_script), 'scriptdata'] = True
         
         # Load data for these specific tables
-        load_all_tables_data(config_vals.db_conn, db_all=schema, table_names=tables_to_script)    
+        if not pipelined:
+            load_all_tables_data(config_vals.db_conn, db_all=schema, table_names=tables_to_script, session=db_session, itersize=data_itersize, use_copy=config_vals.db_load_ops.copy_table_data, parallel_workers=data_workers, chunk_rows=config_vals.db_load_ops.table_chunk_rows)
     else: #just load all tables
         table_rows = tbl_ents[tbl_ents['enttype'] == 'Table']
         config_vals.tables_data.tables = (table_rows['entschema'] + '.' + table_rows['entname']).tolist()
         # Set scriptdata to True for all tables
         tbl_ents.loc[tbl_ents['enttype'] == 'Table', 'scriptdata'] = True
         #and load
-        load_all_tables_data(config_vals.db_conn, db_all = schema, table_names = config_vals.tables_data.tables)
+        if not pipelined:
+            load_all_tables_data(config_vals.db_conn, db_all = schema, table_names = config_vals.tables_data.tables, session=db_session, itersize=data_itersize, use_copy=config_vals.db_load_ops.copy_table_data, parallel_workers=data_workers, chunk_rows=config_vals.db_load_ops.table_chunk_rows)
+
+    if pipelined:
+        # the data is loaded while the script is generated, a window of tables at a time in the order the script
+        # walks them, so the session stays open until the script is written
+        sorted_ents = tbl_ents.sort_values("scriptsortorder")
+        sort_pos = {name: pos for pos, name in enumerate(sorted_ents['entschema'] + '.' + sorted_ents['entname'])}
+        pipeline_tables = sorted(config_vals.tables_data.tables, key=lambda name: sort_pos.get(name, len(sort_pos)))
+        schema.tables_data = PipelinedTablesData(pipeline_tables,
+                                                 partial(load_all_tables_data, config_vals.db_conn, schema, session=db_session, itersize=data_itersize, use_copy=config_vals.db_load_ops.copy_table_data, parallel_workers=data_workers, chunk_rows=config_vals.db_load_ops.table_chunk_rows),
+                                                 window_tables=config_vals.db_load_ops.pipeline_window_tables)
+    else:
+        db_session.close()
+        db_session.print_timings()
+        if catalog_cache:
+            catalog_cache.print_report()
 
     # Copy CSV compare template if we have data tables to script (must be after tables_data.tables is populated)
     if len(config_vals.tables_data.tables) >= 1:
@@ -320,14 +354,31 @@ def main():
             print(f"WARNING: CSV compare template not found at: {csv_compare_template}")
             print("         Data comparison HTML may fail.")
 
-    script = generate_all_script(schema, db_type= DBType.PostgreSQL, tbl_ents=tbl_ents, scrpt_ops= config_vals.script_ops, input_output=config_vals.input_output, got_specific_tables = (len(config_vals.db_ents_to_load.tables) >= 1), tables_data=config_vals.tables_data, sql_script_params=config_vals.sql_script_params)
-
-    with open(config_vals.input_output.output_sql, 'w') as f:
-       f.write(script)
+    # the script is streamed to the file as it's generated (it can be much bigger than memory with data embedded),
+    # into a temp file first so a failed run doesn't leave a half-written script behind
+    tmp_output_sql = f"{config_vals.input_output.output_sql}.tmp"
+    ddl_cache = DDLCache()
+    try:
+        with open(tmp_output_sql, 'w', buffering=SCRIPT_WRITE_BUFFER_BYTES) as f:
+            write_all_script(f, schema, db_type= DBType.PostgreSQL, tbl_ents=tbl_ents, scrpt_ops= config_vals.script_ops, input_output=config_vals.input_output, got_specific_tables = (len(config_vals.db_ents_to_load.tables) >= 1), tables_data=config_vals.tables_data, sql_script_params=config_vals.sql_script_params, ddl_cache=ddl_cache)
+        os.replace(tmp_output_sql, config_vals.input_output.output_sql)
+    except BaseException:
+        if os.path.exists(tmp_output_sql):
+            os.remove(tmp_output_sql)
+        raise
+    ddl_cache.print_report()
+    if pipelined:
+        db_session.close()
+        db_session.print_timings()
+        if catalog_cache:
+            catalog_cache.print_report()
 
     print(f"Script written to: {config_vals.input_output.output_sql}")
 
 
 if __name__ == "__main__":
+    # the table-data worker pools spawn processes; in the bundled exe each worker re-runs this entry point and
+    # freeze_support() turns it into the worker instead of starting another main()
+    multiprocessing.freeze_support()
     main()
 
@@ -5,6 +5,7 @@ from typing import Any
 from typing import Optional , Union, Any
 import math
 import json
+import datetime
 
 def quote_str_or_null(value: Any) -> str:
     if value is None or (isinstance(value, float) and math.isnan(value)):
@@ -62,6 +63,38 @@ def format_value_for_sql(value: Any) -> str:
     str_val = str(value).replace("'", "''")
     return f"'{str_val}'"
 
+def format_value_for_json(value: Any) -> Any:
+    """Format a value for a JSON payload read back with jsonb_populate_recordset.
+
+    Scalars become their PostgreSQL text form (JSON strings), which the target column's input
+    function parses, so numerics, dates and intervals keep their exact value:
+    - NULL/NaN/NaT -> None
+    - Floats that are whole numbers (42.0) -> '42', infinities -> 'Infinity'/'-Infinity'
+    - Dates/times -> ISO 8601 (keeps the UTC offset of timestamptz values)
+    - Intervals (timedelta) -> 'D days S seconds U microseconds'
+    - Bytea (bytes/memoryview) -> '\\x' hex
+    - Lists (array columns) -> JSON arrays of formatted elements
+    """
+    if isinstance(value, list):
+        return [format_value_for_json(v) for v in value]
+    if value is None or value is pd.NaT or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float):
+        if math.isinf(value):
+            return 'Infinity' if value > 0 else '-Infinity'
+        return str(int(value)) if value.is_integer() else repr(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return f"{value.days} days {value.seconds} seconds {value.microseconds} microseconds"
+    if isinstance(value, (bytes, memoryview)):
+        return '\\x' + bytes(value).hex()
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return str(value)
+
 def bool_to_sql_bit_boolean_val(val, full_boolean):    
     if val is None:
         return "NULL"
@@ -124,6 +157,16 @@ def add_exec_sql(db_type: DBType, num_tabs: int, script: StringIO, exec_str_name
        script.write(f"{align}schemaChanged := True;\n")  # !no! what if its only data?? fix also for MS (but maybe its ok... see where this one is used
 
 
+def write_insert_values_batches(db_type: DBType, script: StringIO, align: str, insert_sql: str, rows_values: list, batch_rows: int) -> None:
+    """Write insert_sql (INSERT INTO ... (cols)) for the rows' VALUES lists ('(...)' each), batch_rows rows per multi-row VALUES
+    (1 = one INSERT per row; SQL Server allows at most 1000)."""
+    batch_rows = min(batch_rows, 1000) if db_type == DBType.MSSQL else batch_rows
+    batch_rows = max(batch_rows, 1)
+    for i in range(0, len(rows_values), batch_rows):
+        script.write(f"{align}{insert_sql}\n")
+        script.write(f"{align}VALUES " + f",\n{align}".join(rows_values[i:i + batch_rows]) + ";\n")
+
+
 def write_drop_temp_table_if_exists(db_type: DBType, indent_level: int, script: StringIO, table_name: str) -> None:
     """Write the drop-if-exists pattern for temp tables (PostgreSQL)."""
     align = "\t" * indent_level
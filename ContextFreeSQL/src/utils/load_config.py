@@ -1,7 +1,7 @@
 import json
 from pathlib import Path
 from typing import Optional, Union
-from src.defs.script_defs import ConfigVals, DBConnSettings, ScriptingOptions, ScriptTableOptions, ListTables, InputOutput, SQLScriptParams
+from src.defs.script_defs import ConfigVals, DBConnSettings, ScriptingOptions, ScriptTableOptions, ListTables, InputOutput, SQLScriptParams, DBLoadOptions
 
 
 def load_config(config_path: Optional[Union[str, Path]] = None) -> ConfigVals:
@@ -29,6 +29,9 @@ def load_config(config_path: Optional[Union[str, Path]] = None) -> ConfigVals:
     sql_script_params_data = data.get('sql_script_params', {})
     sql_script_params = SQLScriptParams(**sql_script_params_data)
 
+    # Load DB load options (with defaults if not present in config)
+    db_load_ops = DBLoadOptions(**data.get('db_load_options', {}))
+
     # Create and return ConfigVals
     return ConfigVals(
         db_conn=db_conn,
@@ -37,5 +40,6 @@ def load_config(config_path: Optional[Union[str, Path]] = None) -> ConfigVals:
         db_ents_to_load=db_ents_to_load,
         tables_data=tables_data,
         input_output=input_output,
-        sql_script_params=sql_script_params
+        sql_script_params=sql_script_params,
+        db_load_ops=db_load_ops
     )
@@ -16,6 +16,7 @@ import tempfile
 from pathlib import Path
 from typing import Generator, List, Optional
 from dataclasses import dataclass
+from functools import partial
 
 import pytest
 import psycopg2
@@ -28,8 +29,8 @@ from src.defs.script_defs import (
     DBType, DBConnSettings, ScriptingOptions, ScriptTableOptions,
     ListTables, InputOutput, SQLScriptParams, ConfigVals
 )
-from src.data_load.from_db.load_from_db_pg import load_all_schema, load_all_db_ents, load_all_tables_data
-from src.generate.generate_script import generate_all_script
+from src.data_load.from_db.load_from_db_pg import load_all_schema, load_all_db_ents, load_all_tables_data, PipelinedTablesData
+from src.generate.generate_script import generate_all_script, write_all_script
 
 from tests.utils import db_helpers
 
@@ -165,7 +166,19 @@ class ScriptGenerator:
         indexes: bool = True,
         foreign_keys: bool = True,
         defaults: bool = True,
-        exec_code: bool = True
+        exec_code: bool = True,
+        data_insert_batch_rows: int = 1,
+        data_embed_format: str = "insert",
+        data_generation_workers: int = 1,
+        pipelined_data_load: bool = False,
+        data_hash_fast_path: bool = False,
+        data_hash_chunk_rows: int = 0,
+        data_tune_work_mem: bool = False,
+        data_set_based_dml: bool = False,
+        state_insert_batch_rows: int = 1,
+        schema_fingerprint_check: bool = False,
+        print_output: bool = False,
+        output_file: Optional[str] = None
     ) -> str:
         """
         Generate a ContextFreeSQL script for the specified tables.
@@ -180,6 +193,18 @@ class ScriptGenerator:
             foreign_keys: Whether to script foreign keys
             defaults: Whether to script column defaults
             exec_code: Whether generated script should execute DDL
+            data_insert_batch_rows: Rows per multi-row INSERT when embedding table data
+            data_embed_format: "insert" or "jsonb" (one jsonb_populate_recordset INSERT per table)
+            data_generation_workers: Worker processes rendering the tables' data sections
+            pipelined_data_load: Load each table's data when the script reaches it (PipelinedTablesData), as main does with pipelined_data_load
+            data_hash_fast_path: Skip the row compare of tables whose aggregate row hash matches the scripted rows'
+            data_hash_chunk_rows: Rows per key range hashed by the chunked data diff (0 = off)
+            data_tune_work_mem: Raise work_mem before each table's compare, from its row count
+            data_set_based_dml: One UPDATE per table for changed rows, and set-based rendering of the printed DML
+            state_insert_batch_rows: Rows per multi-row INSERT when filling the columns/indexes/FKs state tables
+            schema_fingerprint_check: Load the source's schema fingerprint and end the script early when the target's matches
+            print_output: Whether the script logs what it does to scriptoutput (see execute_generated_script_output)
+            output_file: If set, the script is streamed to this file (as main does) and read back
 
         Returns:
             The generated SQL script as a string
@@ -189,7 +214,16 @@ class ScriptGenerator:
             remove_all_extra_ents=remove_extras,
             script_schemas=script_schemas,
             script_security=script_security,
-            data_scripting_generate_dml_statements=script_data
+            data_scripting_generate_dml_statements=script_data,
+            data_insert_batch_rows=data_insert_batch_rows,
+            data_embed_format=data_embed_format,
+            data_generation_workers=data_generation_workers,
+            data_hash_fast_path=data_hash_fast_path,
+            data_hash_chunk_rows=data_hash_chunk_rows,
+            data_tune_work_mem=data_tune_work_mem,
+            data_set_based_dml=data_set_based_dml,
+            state_insert_batch_rows=state_insert_batch_rows,
+            schema_fingerprint_check=schema_fingerprint_check
         )
 
         # Create table script options
@@ -211,7 +245,7 @@ class ScriptGenerator:
 
         # SQL script params - for testing we typically want exec_code=True
         sql_script_params = SQLScriptParams(
-            print=False,
+            print=print_output,
             print_exec=False,
             exec_code=exec_code,
             html_report=False,
@@ -219,7 +253,7 @@ class ScriptGenerator:
         )
 
         # Load schema
-        schema = load_all_schema(self.db_conn, load_security=script_security)
+        schema = load_all_schema(self.db_conn, load_security=script_security, schema_fingerprint=schema_fingerprint_check)
 
         # Load entities
         if tables:
@@ -232,12 +266,14 @@ class ScriptGenerator:
         if script_data and tables:
             table_filter = tbl_ents['entschema'] + '.' + tbl_ents['entname']
             tbl_ents.loc[table_filter.isin(tables), 'scriptdata'] = True
-            load_all_tables_data(self.db_conn, db_all=schema, table_names=tables)
+            if pipelined_data_load:
+                schema.tables_data = PipelinedTablesData(tables, partial(load_all_tables_data, self.db_conn, schema))
+            else:
+                load_all_tables_data(self.db_conn, db_all=schema, table_names=tables)
 
         # Generate script
         db_ents_to_load = ListTables(tables=tables)
-        script = generate_all_script(
-            schema,
+        script_args = dict(
             db_type=DBType.PostgreSQL,
             tbl_ents=tbl_ents,
             scrpt_ops=script_ops,
@@ -246,6 +282,13 @@ class ScriptGenerator:
             tables_data=tables_data,
             sql_script_params=sql_script_params
         )
+        if output_file:
+            with open(output_file, 'w') as f:
+                write_all_script(f, schema, **script_args)
+            with open(output_file) as f:
+                return f.read()
+
+        script = generate_all_script(schema, **script_args)
 
         return script
 
@@ -309,6 +352,16 @@ def execute_generated_script(conn, script: str) -> None:
         cur.execute(script)
 
 
+def execute_generated_script_output(conn, script: str) -> List[str]:
+    """
+    Execute a generated ContextFreeSQL script and return its scriptoutput lines
+    (the script ends by selecting them; they're only written with print_output).
+    """
+    with conn.cursor() as cur:
+        cur.execute(script)
+        return [row[0] for row in cur.fetchall()]
+
+
 # Helper functions available to tests
 
 def create_test_table(conn, schema: str, table_name: str, columns: str,
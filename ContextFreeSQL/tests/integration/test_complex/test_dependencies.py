@@ -8,8 +8,9 @@ Tests verify that ContextFreeSQL correctly handles:
 4. Script idempotency (running twice is safe)
 """
 import pytest
+from src.data_load.from_db.schema_fingerprint import schema_fingerprint_sql
 from tests.utils import db_helpers
-from tests.conftest import execute_generated_script
+from tests.conftest import execute_generated_script, execute_generated_script_output
 
 
 @pytest.mark.complex
@@ -294,6 +295,47 @@ class TestIdempotency:
         schema_assertions.assert_column_exists('public', table_name, 'name')
         schema_assertions.assert_column_nullable('public', table_name, 'name', False)
 
+    def test_schema_fingerprint_check(self, test_connection, script_generator, unique_prefix):
+        """
+        Test that with schema_fingerprint_check the script embeds the source's schema fingerprint,
+        which the unchanged database still computes, and that once the schema changes the
+        fingerprints differ and the full compare runs.
+        """
+        table_name = f"{unique_prefix}fingerprint"
+        full_table = f"public.{table_name}"
+
+        db_helpers.execute_sql(
+            test_connection,
+            f'''
+            CREATE TABLE public."{table_name}" (
+                id INT PRIMARY KEY,
+                name VARCHAR(100)
+            )
+            '''
+        )
+
+        script = script_generator.generate([full_table], schema_fingerprint_check=True, print_output=True)
+        fingerprint = db_helpers.execute_sql(test_connection, schema_fingerprint_sql(include_security=False))[0][0]
+        assert f"= '{fingerprint}' THEN" in script
+
+        # Nothing changed: the script logs the match and stops before the schema compare
+        output = execute_generated_script_output(test_connection, script)
+        assert output == [f"--Schema fingerprint {fingerprint} matches the source's: the schema is up to date, schema compare skipped"]
+
+        db_helpers.execute_sql(
+            test_connection,
+            f'ALTER TABLE public."{table_name}" ALTER COLUMN name TYPE VARCHAR(50)'
+        )
+        assert db_helpers.execute_sql(test_connection, schema_fingerprint_sql(include_security=False))[0][0] != fingerprint
+
+        # Changed: the full compare runs and restores the column
+        output = execute_generated_script_output(test_connection, script)
+        assert not any('schema compare skipped' in line for line in output)
+        assert any(table_name in line for line in output)
+
+        col_info = db_helpers.get_column_info(test_connection, 'public', table_name, 'name')
+        assert col_info['character_maximum_length'] == 100
+
 
 @pytest.mark.complex
 class TestFullWorkflow:
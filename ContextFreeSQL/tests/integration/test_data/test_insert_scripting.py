@@ -9,6 +9,7 @@ Tests verify that ContextFreeSQL correctly generates SQL to:
 5. Handle timestamp/datetime precision correctly
 6. Detect and revert UPDATE operations
 """
+import re
 import pytest
 from tests.utils import db_helpers
 from tests.conftest import execute_generated_script
@@ -664,3 +665,289 @@ class TestDataScripting:
             f'''SELECT event_date::text FROM public."{table_name}" WHERE id = 1'''
         )
         assert result[0][0] == '2024-01-15'
+
+    def test_batched_multi_row_inserts(self, test_connection, script_generator, unique_prefix, data_assertions):
+        """
+        Test that embedding the data as multi-row INSERTs (data_insert_batch_rows)
+        restores deleted and updated rows like the one-INSERT-per-row script.
+        """
+        table_name = f"{unique_prefix}batched"
+        full_table_name = f"public.{table_name}"
+
+        db_helpers.execute_sql(
+            test_connection,
+            f'''
+            CREATE TABLE public."{table_name}" (
+                id INT PRIMARY KEY,
+                name VARCHAR(50),
+                at TIMESTAMP
+            )
+            '''
+        )
+        db_helpers.execute_sql(
+            test_connection,
+            f'''
+            INSERT INTO public."{table_name}" (id, name, at)
+            SELECT g, CASE WHEN g % 5 = 0 THEN NULL ELSE 'it''s row ' || g END, '2024-01-01'::timestamp + g * interval '1 hour'
+            FROM generate_series(1, 25) g
+            '''
+        )
+
+        # 25 rows in batches of 10: three INSERTs into the temp table
+        script = script_generator.generate([full_table_name], script_data=True, data_insert_batch_rows=10)
+        temp_table = f"public_{table_name}"
+        assert script.count(f"INSERT INTO {temp_table} (\n") == 3
+
+        db_helpers.execute_sql(test_connection, f'''DELETE FROM public."{table_name}" WHERE id IN (1, 10, 11, 25)''')
+        db_helpers.execute_sql(test_connection, f'''UPDATE public."{table_name}" SET name = 'changed' WHERE id = 12''')
+
+        execute_generated_script(test_connection, script)
+
+        data_assertions.assert_row_count('public', table_name, 25)
+        data_assertions.assert_row_exists('public', table_name, {'id': 11, 'name': "it's row 11"})
+        data_assertions.assert_row_exists('public', table_name, {'id': 12, 'name': "it's row 12"})
+        result = db_helpers.execute_sql(test_connection, f'''SELECT name IS NULL, at::text FROM public."{table_name}" WHERE id = 10''')
+        assert result[0] == (True, '2024-01-01 10:00:00')
+
+    def test_jsonb_embedded_data(self, test_connection, script_generator, unique_prefix, data_assertions):
+        """
+        Test that embedding the data as one JSON array per table (data_embed_format="jsonb")
+        restores deleted and updated rows with their types intact.
+        """
+        table_name = f"{unique_prefix}jsonb_embed"
+        full_table_name = f"public.{table_name}"
+
+        db_helpers.execute_sql(
+            test_connection,
+            f'''
+            CREATE TABLE public."{table_name}" (
+                id INT PRIMARY KEY,
+                name VARCHAR(50),
+                amount NUMERIC(12,4),
+                ratio DOUBLE PRECISION,
+                flag BOOLEAN,
+                day DATE,
+                at TIMESTAMPTZ,
+                span INTERVAL,
+                doc JSONB,
+                tags INT[],
+                raw BYTEA
+            )
+            '''
+        )
+        db_helpers.execute_sql(
+            test_connection,
+            f'''
+            INSERT INTO public."{table_name}" VALUES
+                (1, 'it''s "quoted" \\ here', 12.3400, 0.1, true, '2024-02-29', '2024-01-02 03:04:05.123456+02',
+                 '1 day 02:03:04.5', '{{"a": [1, 2], "b": "x''y"}}', '{{1,2,3}}', '\\xdeadbeef'),
+                (2, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL, NULL),
+                (3, 'three', -5, 1e300, false, '1999-12-31', '2024-06-01 00:00:00+00', '-3 hours', '[]', '{{}}', '\\x')
+            '''
+        )
+
+        script = script_generator.generate([full_table_name], script_data=True, data_embed_format="jsonb")
+        assert script.count("jsonb_populate_recordset(NULL::") == 1
+
+        snapshot_sql = f'''SELECT id, name, amount::text, ratio, flag, day::text, at, span::text, doc::text, tags::text, encode(raw, 'hex')
+                           FROM public."{table_name}" ORDER BY id'''
+        before = db_helpers.execute_sql(test_connection, snapshot_sql)
+
+        db_helpers.execute_sql(test_connection, f'''DELETE FROM public."{table_name}" WHERE id IN (1, 2)''')
+        db_helpers.execute_sql(test_connection, f'''UPDATE public."{table_name}" SET name = 'changed', ratio = 2 WHERE id = 3''')
+
+        execute_generated_script(test_connection, script)
+
+        data_assertions.assert_row_count('public', table_name, 3)
+        assert db_helpers.execute_sql(test_connection, snapshot_sql) == before
+
+    def test_streamed_script_matches_in_memory(self, test_connection, script_generator, unique_prefix, tmp_path):
+        """
+        Test that streaming the script to a file as it's generated (as main does)
+        writes exactly the script generate_all_script returns.
+        """
+        table_name = f"{unique_prefix}streamed"
+        full_table_name = f"public.{table_name}"
+
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{table_name}" (id INT PRIMARY KEY, name VARCHAR(50), at TIMESTAMP)')
+        db_helpers.execute_sql(
+            test_connection,
+            f'''INSERT INTO public."{table_name}" SELECT g, 'row ' || g, '2024-01-01'::timestamp + g * interval '1 day' FROM generate_series(1, 50) g'''
+        )
+
+        in_memory = script_generator.generate([full_table_name], script_data=True)
+        streamed = script_generator.generate([full_table_name], script_data=True, output_file=str(tmp_path / "streamed.sql"))
+
+        assert f"INSERT INTO public_{table_name}" in streamed
+        assert streamed == in_memory
+
+    def test_parallel_data_generation_matches_serial(self, test_connection, script_generator, unique_prefix, data_assertions):
+        """
+        Test that rendering the tables' data sections on worker processes
+        (data_generation_workers) gives the same script, in the same table order,
+        as rendering them in process.
+        """
+        parent = f"{unique_prefix}gen_parent"
+        child = f"{unique_prefix}gen_child"
+        empty = f"{unique_prefix}gen_empty"
+
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{parent}" (id INT PRIMARY KEY, name VARCHAR(50), at TIMESTAMPTZ)')
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{child}" (id INT PRIMARY KEY, parent_id INT REFERENCES public."{parent}"(id), qty NUMERIC(8,2))')
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{empty}" (id INT PRIMARY KEY)')
+        db_helpers.execute_sql(test_connection, f'''INSERT INTO public."{parent}" SELECT g, 'p' || g, '2024-01-01 00:00:00+00'::timestamptz + g * interval '1 hour' FROM generate_series(1, 20) g''')
+        db_helpers.execute_sql(test_connection, f'''INSERT INTO public."{child}" SELECT g, g % 20 + 1, g / 4.0 FROM generate_series(1, 40) g''')
+        tables = [f"public.{parent}", f"public.{child}", f"public.{empty}"]
+
+        serial = script_generator.generate(tables, script_data=True)
+        parallel = script_generator.generate(tables, script_data=True, data_generation_workers=3)
+
+        assert parallel == serial
+
+        db_helpers.execute_sql(test_connection, f'''DELETE FROM public."{child}" WHERE id > 30''')
+        db_helpers.execute_sql(test_connection, f'''DELETE FROM public."{parent}" WHERE id = 20 AND NOT EXISTS (SELECT 1 FROM public."{child}" WHERE parent_id = 20)''')
+        db_helpers.execute_sql(test_connection, f'''INSERT INTO public."{empty}" VALUES (1)''')
+
+        execute_generated_script(test_connection, parallel)
+
+        data_assertions.assert_row_count('public', parent, 20)
+        data_assertions.assert_row_count('public', child, 40)
+        data_assertions.assert_row_count('public', empty, 0)
+
+    def test_pipelined_data_load_matches_preloaded(self, test_connection, script_generator, unique_prefix):
+        """
+        Test that loading each table's data only when the script reaches it
+        (pipelined_data_load) gives the same script as loading every table first.
+        """
+        parent = f"{unique_prefix}pipe_parent"
+        child = f"{unique_prefix}pipe_child"
+        empty = f"{unique_prefix}pipe_empty"
+
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{parent}" (id INT PRIMARY KEY, name VARCHAR(50))')
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{child}" (id INT PRIMARY KEY, parent_id INT REFERENCES public."{parent}"(id), qty NUMERIC(8,2))')
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{empty}" (id INT PRIMARY KEY)')
+        db_helpers.execute_sql(test_connection, f'''INSERT INTO public."{parent}" SELECT g, 'p' || g FROM generate_series(1, 20) g''')
+        db_helpers.execute_sql(test_connection, f'''INSERT INTO public."{child}" SELECT g, g % 20 + 1, g / 4.0 FROM generate_series(1, 40) g''')
+        tables = [f"public.{child}", f"public.{parent}", f"public.{empty}"]
+
+        preloaded = script_generator.generate(tables, script_data=True)
+        pipelined = script_generator.generate(tables, script_data=True, pipelined_data_load=True)
+
+        assert pipelined == preloaded
+
+    def test_hash_fast_path_skips_equal_and_restores_changed(self, test_connection, script_generator, unique_prefix, data_assertions):
+        """
+        Test that with data_hash_fast_path the script leaves an in-sync table as it is
+        and still restores deleted, updated and extra rows when the hashes differ.
+        """
+        table_name = f"{unique_prefix}hash_fast"
+        full_table_name = f"public.{table_name}"
+
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{table_name}" (id INT PRIMARY KEY, name VARCHAR(50), amount NUMERIC(10,2), at TIMESTAMPTZ)')
+        db_helpers.execute_sql(
+            test_connection,
+            f'''INSERT INTO public."{table_name}" SELECT g, CASE WHEN g % 7 = 0 THEN NULL ELSE 'row ' || g END, g * 1.5, '2024-01-01 00:00:00+00'::timestamptz + g * interval '1 hour' FROM generate_series(1, 30) g'''
+        )
+        snapshot_sql = f'SELECT id, name, amount::text, at FROM public."{table_name}" ORDER BY id'
+        before = db_helpers.execute_sql(test_connection, snapshot_sql)
+
+        script = script_generator.generate([full_table_name], script_data=True, data_hash_fast_path=True)
+        assert "_DataEqual := true" in script
+
+        # in sync: the hashes match and nothing changes
+        execute_generated_script(test_connection, script)
+        assert db_helpers.execute_sql(test_connection, snapshot_sql) == before
+
+        # out of sync: the full compare runs and puts the rows back
+        db_helpers.execute_sql(test_connection, f'DELETE FROM public."{table_name}" WHERE id IN (2, 3)')
+        db_helpers.execute_sql(test_connection, f'''UPDATE public."{table_name}" SET name = 'changed' WHERE id = 5''')
+        db_helpers.execute_sql(test_connection, f'''INSERT INTO public."{table_name}" VALUES (100, 'extra', 1, now())''')
+
+        execute_generated_script(test_connection, script)
+
+        data_assertions.assert_row_count('public', table_name, 30)
+        assert db_helpers.execute_sql(test_connection, snapshot_sql) == before
+
+    def test_chunked_hash_diff_restores_changed_ranges(self, test_connection, script_generator, unique_prefix, data_assertions):
+        """
+        Test that with data_hash_chunk_rows only the differing key ranges are compared,
+        and that deleted, updated and extra rows in them, and extra rows beyond the
+        scripted keys, are still put right.
+        """
+        table_name = f"{unique_prefix}hash_chunks"
+        full_table_name = f"public.{table_name}"
+
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{table_name}" (region VARCHAR(10), id INT, name VARCHAR(50), PRIMARY KEY (region, id))')
+        db_helpers.execute_sql(
+            test_connection,
+            f'''INSERT INTO public."{table_name}" SELECT r, g, r || '-' || g FROM generate_series(1, 100) g, unnest(ARRAY['east', 'west']) r'''
+        )
+        snapshot_sql = f'SELECT region, id, name FROM public."{table_name}" ORDER BY region, id'
+        before = db_helpers.execute_sql(test_connection, snapshot_sql)
+
+        script = script_generator.generate([full_table_name], script_data=True, data_hash_chunk_rows=25)
+        assert f"public_{table_name}_chunkdiff" in script
+
+        execute_generated_script(test_connection, script)
+        assert db_helpers.execute_sql(test_connection, snapshot_sql) == before
+
+        db_helpers.execute_sql(test_connection, f'''DELETE FROM public."{table_name}" WHERE region = 'east' AND id IN (10, 11)''')
+        db_helpers.execute_sql(test_connection, f'''UPDATE public."{table_name}" SET name = 'changed' WHERE region = 'west' AND id = 50''')
+        db_helpers.execute_sql(test_connection, f'''INSERT INTO public."{table_name}" VALUES ('east', 1000, 'extra'), ('zzz', 1, 'extra'), ('aaa', 1, 'extra')''')
+
+        execute_generated_script(test_connection, script)
+
+        data_assertions.assert_row_count('public', table_name, 200)
+        assert db_helpers.execute_sql(test_connection, snapshot_sql) == before
+
+    def test_temp_table_index_and_work_mem(self, test_connection, script_generator, unique_prefix, data_assertions):
+        """
+        Test that the comparison temp table is indexed and analyzed, that
+        data_tune_work_mem raises work_mem for a big table, and that the compare
+        still restores the data.
+        """
+        table_name = f"{unique_prefix}tuned"
+        full_table_name = f"public.{table_name}"
+
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{table_name}" (id INT PRIMARY KEY, name VARCHAR(50), value INT)')
+        db_helpers.execute_sql(test_connection, f'''INSERT INTO public."{table_name}" SELECT g, 'row ' || g, g % 100 FROM generate_series(1, 30000) g''')
+
+        script = script_generator.generate([full_table_name], script_data=True, data_embed_format="jsonb", data_tune_work_mem=True)
+        assert f"CREATE INDEX ON public_{table_name} (id);" in script
+        assert f"ANALYZE public_{table_name};" in script
+        assert "set_config('work_mem'" in script
+
+        db_helpers.execute_sql(test_connection, f'DELETE FROM public."{table_name}" WHERE id % 1000 = 0')
+        db_helpers.execute_sql(test_connection, f'''UPDATE public."{table_name}" SET name = 'changed' WHERE id = 77''')
+
+        execute_generated_script(test_connection, script)
+
+        data_assertions.assert_row_count('public', table_name, 30000)
+        assert db_helpers.execute_sql(test_connection, f'''SELECT name FROM public."{table_name}" WHERE id = 77''') == [('row 77',)]
+
+    def test_set_based_dml(self, test_connection, script_generator, unique_prefix, data_assertions):
+        """
+        Test that data_set_based_dml renders the printed DML with set-based
+        INSERT ... SELECTs, applies updates with one UPDATE, and still restores
+        added, removed and changed rows.
+        """
+        table_name = f"{unique_prefix}set_based"
+        full_table_name = f"public.{table_name}"
+
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{table_name}" (id INT PRIMARY KEY, category VARCHAR(50), amount NUMERIC(10, 2))')
+        db_helpers.execute_sql(test_connection, f'''INSERT INTO public."{table_name}" VALUES (1, 'Electronics', 100.00), (2, 'Books', 50.00), (3, 'O''Reilly', 75.50)''')
+
+        script = script_generator.generate([full_table_name], script_data=True, data_set_based_dml=True)
+        # the schema sections still loop over their state tables; no loop may read this table's compare rows
+        assert not re.search(rf"FOR temprow IN\s+SELECT[^;]*FROM public_{table_name} s", script)
+        assert "quote_nullable(s.category)" in script
+
+        db_helpers.execute_sql(test_connection, f'DELETE FROM public."{table_name}" WHERE id = 2')
+        db_helpers.execute_sql(test_connection, f'''UPDATE public."{table_name}" SET amount = 999.99, category = NULL WHERE id = 3''')
+        db_helpers.execute_sql(test_connection, f'''INSERT INTO public."{table_name}" VALUES (4, 'New Item', 200.00)''')
+
+        execute_generated_script(test_connection, script)
+
+        data_assertions.assert_row_count('public', table_name, 3)
+        data_assertions.assert_row_exists('public', table_name, {'id': 2, 'category': 'Books'})
+        result = db_helpers.execute_sql(test_connection, f'''SELECT category, amount FROM public."{table_name}" WHERE id = 3''')
+        assert result[0][0] == "O'Reilly" and float(result[0][1]) == 75.50
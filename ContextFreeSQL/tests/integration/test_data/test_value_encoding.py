@@ -0,0 +1,85 @@
+"""
+Tests for formatting table data as SQL literals when it is embedded in the script.
+
+These build synthetic frames shaped like the data load returns them, so they don't
+need test objects in the database.
+"""
+import datetime
+import decimal
+import time
+
+import pandas as pd
+import pytest
+from src.generate.generate_final_data import _rows_values_sql, _value_sql
+
+
+def _synthetic_table_data(num_rows: int) -> pd.DataFrame:
+    """A frame with a column of each kind the data load produces; most columns have NULLs."""
+    return pd.DataFrame([{
+        'id': i,
+        'qty': None if i % 7 == 0 else i * 3,  # int column with NULLs loads as float64
+        'price': [0.1, 42.0, -0.0, float('inf'), 1e300, 2.0 ** 70, 123456789.125, 1.5e-7, None][i % 9],
+        'flag': i % 2 == 0,
+        'flag_null': None if i % 3 == 0 else i % 2 == 0,
+        'name': ["it's", "", "plain", "tab\t\\", "ünï", None][i % 6],
+        'at': None if i % 11 == 0 else datetime.datetime(2024, 1, 1, 3, 4, 5, i % 1000) + datetime.timedelta(hours=i),
+        'at_tz': None if i % 13 == 0 else datetime.datetime(2024, 1, 1, 3, 4, 5, 123, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+        'day': None if i % 5 == 0 else datetime.date(2000, 2, 29),
+        'amount': None if i % 4 == 0 else decimal.Decimal('12.3400'),
+        'doc': None if i % 6 == 0 else {'a': "it's", 'b': [1, 2]},
+        'tags': None if i % 9 == 0 else [1, 2],
+        'span': None if i % 8 == 0 else datetime.timedelta(days=1, seconds=i),
+        'big': 9000000000000000001 if i % 2 else -5,
+    } for i in range(num_rows)])
+
+
+def _rows_values_sql_per_row(tbl_data: pd.DataFrame, ar_cols):
+    """The row-by-row formatting the column-wise encoder replaced."""
+    return [",".join(_value_sql(row.get(s_col_name)) for s_col_name in ar_cols) for _, row in tbl_data.iterrows()]
+
+
+class TestValueEncoding:
+    """Tests for the column-wise SQL literal encoder."""
+
+    def test_matches_per_row_formatting(self):
+        """
+        Test that formatting column by column gives exactly the literals of
+        formatting each value on its own, for every column kind (and NULLs).
+        """
+        tbl_data = _synthetic_table_data(500)
+        ar_cols = list(tbl_data.columns)
+
+        assert _rows_values_sql(tbl_data, ar_cols) == _rows_values_sql_per_row(tbl_data, ar_cols)
+
+    def test_literals(self):
+        """Test the literals of a few values that have special handling."""
+        tbl_data = _synthetic_table_data(9)
+        rows = _rows_values_sql(tbl_data, ['price', 'name', 'flag', 'doc'])
+
+        assert rows[0] == """'0.1','it''s','true',NULL"""
+        assert rows[1] == """'42','','false','{"a": "it''s", "b": [1, 2]}'"""
+        assert rows[2] == """'0','plain','true','{"a": "it''s", "b": [1, 2]}'"""
+        assert rows[3].startswith("'inf',")
+        assert rows[5].startswith(f"'{2 ** 70}',NULL,")
+        assert rows[8].startswith("NULL,")
+
+    @pytest.mark.slow
+    def test_encoder_throughput(self):
+        """
+        Microbenchmark: the column-wise encoder formats 50,000 rows of a typical table
+        (numbers, text, timestamps) at least 5x faster than the row-by-row loop it replaced.
+        Object columns (JSON, arrays, dates) are still formatted value by value.
+        """
+        tbl_data = _synthetic_table_data(50000)
+        ar_cols = ['id', 'qty', 'price', 'flag', 'name', 'at', 'at_tz', 'amount', 'big']
+
+        start = time.perf_counter()
+        per_row = _rows_values_sql_per_row(tbl_data, ar_cols)
+        per_row_secs = time.perf_counter() - start
+        start = time.perf_counter()
+        by_column = _rows_values_sql(tbl_data, ar_cols)
+        by_column_secs = time.perf_counter() - start
+
+        print(f"\nper row: {len(tbl_data) / per_row_secs:,.0f} rows/s, by column: {len(tbl_data) / by_column_secs:,.0f} rows/s")
+        assert by_column == per_row
+        assert per_row_secs / by_column_secs >= 5
@@ -0,0 +1 @@
+# Load tests package
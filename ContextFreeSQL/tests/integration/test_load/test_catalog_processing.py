@@ -0,0 +1,184 @@
+"""
+Tests for the frame processing done after the catalog queries.
+
+These build synthetic catalog frames, so they don't need test objects in the
+database.
+"""
+import time
+
+import pandas as pd
+import pytest
+from src.data_load.from_db.load_from_db_pg import DBSchema, _process_fk_cols_pg, _set_coded_ents_sort_order
+from src.defs.script_defs import DBType, ScriptingOptions
+from src.generate.ddl_cache import DDLCache
+from src.generate.generate_final_create_table import get_create_table_from_sys_tables
+from src.generate.generate_db_ent_types.generate_state_tables.tables import create_db_state_temp_tables_for_tables
+
+
+def _synthetic_catalog(num_fks: int, num_tables: int = 2000, cols_per_table: int = 10):
+    """Columns and FK frames shaped like the catalog queries return them; FK i has 1-3 column pairs."""
+    cols = pd.DataFrame({
+        'table_schema': 'public',
+        'table_name': [f't{t}' for t in range(num_tables) for _ in range(cols_per_table)],
+        'column_id': [c + 1 for _ in range(num_tables) for c in range(cols_per_table)],
+        'col_name': [f'c{c + 1}' for _ in range(num_tables) for c in range(cols_per_table)],
+        'user_type_name': 'int4',
+    })
+    fks = pd.DataFrame([{
+        'fkey_table_id': 1000 + i % num_tables, 'rkey_table_id': 1000 + (i * 7) % num_tables, 'fkey_constid': 50000 + i,
+        'fk_name': f'fk{i}', 'fkey_table_schema': 'public', 'fkey_table_name': f't{i % num_tables}',
+        'rkey_table_schema': 'public', 'rkey_table_name': f't{(i * 7) % num_tables}',
+        'f_cols': '{' + ','.join(str((i + k) % cols_per_table + 1) for k in range(i % 3 + 1)) + '}',
+        'r_cols': '{' + ','.join(str(k + 1) for k in range(i % 3 + 1)) + '}',
+    } for i in range(num_fks)])
+    return cols, fks
+
+
+def _synthetic_schema(num_tables: int, cols_per_table: int = 5) -> DBSchema:
+    """A DBSchema of num_tables tables with an int4 PK column and text columns; table t (t > 0) has an FK to t - 1."""
+    names = [f't{t}' for t in range(num_tables)]
+    tables = pd.DataFrame({'object_id': [f'public.{n}' for n in names], 'entschema': 'public', 'entname': names,
+                           'table_schema': 'public', 'table_name': names})
+    columns = pd.DataFrame([{
+        'object_id': f'public.{n}', 'table_schema': 'public', 'table_name': n, 'column_id': c + 1, 'col_name': f'c{c + 1}',
+        'user_type_name': 'int4' if c == 0 else 'text', 'max_length': None, 'precision': None, 'scale': None,
+        'is_nullable': c > 0, 'is_identity': False, 'is_computed': 0, 'collation_name': None, 'computed_definition': None,
+        'col_default_name': None, 'seed_value': None, 'increment_value': None,
+    } for n in names for c in range(cols_per_table)])
+    indexes = pd.DataFrame({'object_id': [f'public.{n}' for n in names], 'table_schema': 'public', 'table_name': names,
+                            'index_id': range(num_tables), 'index_name': [f'{n}_pkey' for n in names], 'name': [f'{n}_pkey' for n in names],
+                            'is_unique': True, 'is_primary_key': True, 'is_unique_constraint': 0, 'type': 0,
+                            'index_sql': [f'CREATE UNIQUE INDEX {n}_pkey ON public.{n} USING btree (c1)' for n in names]})
+    index_cols = pd.DataFrame({'object_id': [f'public.{n}' for n in names], 'index_id': range(num_tables),
+                               'index_name': [f'{n}_pkey' for n in names], 'table_schema': 'public', 'table_name': names,
+                               'col_name': 'c1', 'name': 'c1', 'index_column_id': 1, 'key_ordinal': 1,
+                               'is_descending_key': False, 'is_included_column': False})
+    fks = pd.DataFrame({'fk_name': [f'fk{t}' for t in range(1, num_tables)], 'fkey_table_schema': 'public',
+                        'fkey_table_name': names[1:], 'rkey_table_schema': 'public', 'rkey_table_name': names[:-1],
+                        'delete_referential_action': 'a', 'update_referential_action': 'a'})
+    fk_cols = fks[['fk_name', 'fkey_table_schema', 'fkey_table_name', 'rkey_table_schema', 'rkey_table_name']].assign(
+        fkey_col_name='c1', rkey_col_name='c1')
+    defaults = pd.DataFrame({'table_schema': 'public', 'table_name': names, 'col_name': 'c2', 'default_definition': "'x'::text"})
+    coded_ents = pd.DataFrame({'code_schema': 'public', 'code_name': ['f', 'f'], 'param_type_list': [None, 'int4'],
+                               'definition': ['f()', 'f(int4)']})
+    return DBSchema(schemas=pd.DataFrame({'name': ['public']}), tables=tables, columns=columns, defaults=defaults, indexes=indexes,
+                    index_cols=index_cols, fks=fks, fk_cols=fk_cols, coded_ents=coded_ents)
+
+
+class TestCatalogProcessing:
+    """Tests for turning catalog rows into the DBSchema frames."""
+
+    def test_fk_cols_resolves_column_pairs(self):
+        """
+        Test that each FK column pair resolves to its column names in key order,
+        and pairs whose column isn't loaded are skipped.
+        """
+        cols, fks = _synthetic_catalog(num_fks=3, num_tables=3, cols_per_table=3)
+        fks.loc[0, 'f_cols'] = '{1,9}'  # attnum 9 doesn't exist
+        fks.loc[0, 'r_cols'] = '{1,2}'  # so the pair (9, 2) reaches the column lookup
+        fk_cols = _process_fk_cols_pg(cols, fks)
+
+        fk0 = fk_cols[fk_cols['fk_name'] == 'fk0']
+        assert list(zip(fk0['fkey_col_name'], fk0['rkey_col_name'])) == [('c1', 'c1')]
+
+        assert list(fk_cols.columns) == ['fkey_table_id', 'fkey_constid', 'fk_name', 'keyno', 'fkey_table_schema', 'fkey_table_name',
+                                         'rkey_table_schema', 'rkey_table_name', 'fkey_col_name', 'rkey_col_name']
+        assert fk_cols['fk_name'].tolist() == ['fk0', 'fk1', 'fk1', 'fk2', 'fk2', 'fk2']
+        assert fk_cols['keyno'].tolist() == [0, 0, 1, 0, 1, 2]
+        assert fk_cols['fkey_col_name'].tolist() == ['c1', 'c2', 'c3', 'c3', 'c1', 'c2']
+        assert fk_cols['rkey_col_name'].tolist() == ['c1', 'c1', 'c2', 'c1', 'c2', 'c3']
+
+    @pytest.mark.slow
+    def test_fk_cols_10k_fks(self):
+        """
+        Regression benchmark: resolving the columns of 10,000 FKs (about 20,000 column
+        pairs) against 20,000 columns takes well under a second (the row-by-row version took minutes).
+        """
+        cols, fks = _synthetic_catalog(num_fks=10000)
+        start = time.perf_counter()
+        fk_cols = _process_fk_cols_pg(cols, fks)
+        elapsed = time.perf_counter() - start
+
+        assert len(fk_cols) == sum(i % 3 + 1 for i in range(10000))
+        assert elapsed < 5, f"_process_fk_cols_pg took {elapsed:.2f}s for 10k FKs"
+
+    def test_catalog_index_matches_masks(self):
+        """
+        Test that the DBSchema.catalog lookups return the same rows, in the same
+        order, as the boolean masks they replace, and an empty frame for a missing key.
+        """
+        schema = _synthetic_schema(num_tables=50)
+        catalog = schema.catalog
+
+        columns = catalog.columns.rows('public.t7')
+        pd.testing.assert_frame_equal(columns, schema.columns[schema.columns['object_id'] == 'public.t7'])
+        index_cols = catalog.index_cols_by_name.rows('public.t7', 't7_pkey')
+        pd.testing.assert_frame_equal(index_cols, schema.index_cols[(schema.index_cols['object_id'] == 'public.t7') & (schema.index_cols['index_name'] == 't7_pkey')])
+        assert catalog.fk_cols.rows('public', 't8', 'fk8')['rkey_table_name'].tolist() == ['t7']
+        assert catalog.columns.rows('public.nope').empty
+        assert list(catalog.columns.rows('public.nope').columns) == list(schema.columns.columns)
+
+        # a NULL parameter list is found by an empty one, and overloads are told apart
+        assert catalog.coded_ents.rows('public', 'f', '')['definition'].tolist() == ['f()']
+        assert catalog.coded_ents.rows('public', 'f', 'int4')['definition'].tolist() == ['f(int4)']
+        assert len(catalog.coded_ents_by_name.rows('public', 'f')) == 2
+
+    @pytest.mark.slow
+    def test_create_table_10k_tables(self):
+        """
+        Regression benchmark: scripting CREATE TABLE for each of 10,000 tables takes a
+        few seconds, since each table's columns, indexes, FKs and defaults are looked up in
+        the catalog index (masking the whole catalog per lookup was quadratic and took minutes).
+        """
+        schema = _synthetic_schema(num_tables=10000)
+        start = time.perf_counter()
+        for t in range(10000):
+            sql, err = get_create_table_from_sys_tables(DBType.PostgreSQL, 'public', f't{t}', schema)
+            assert not err
+        elapsed = time.perf_counter() - start
+
+        assert 'CONSTRAINT t9999_pkey PRIMARY KEY (c1)' in sql
+        assert elapsed < 10, f"get_create_table_from_sys_tables took {elapsed:.2f}s for 10k tables"
+
+    def test_ddl_cache_renders_fragments_once(self):
+        """
+        Test that the tables' state tables come out the same with the DDL cache, and
+        that each table's PK, rendered for both its CREATE TABLE and its ScriptIndexes row,
+        is rendered once.
+        """
+        schema = _synthetic_schema(num_tables=20)
+        schema.indexes = schema.indexes.assign(is_clustered=False, ignore_dup_key=False, allow_row_locks=False, allow_page_locks=False,
+                                               has_filter=False, filter_definition=None, index_columns='c1')
+        tbl_ents = schema.tables[['entschema', 'entname']].assign(enttype='Table', scriptschema=True, scriptsortorder=range(20))
+
+        uncached = create_db_state_temp_tables_for_tables(DBType.PostgreSQL, tbl_ents, ScriptingOptions(), schema).getvalue()
+        ddl_cache = DDLCache()
+        cached = create_db_state_temp_tables_for_tables(DBType.PostgreSQL, tbl_ents, ScriptingOptions(), schema, ddl_cache=ddl_cache).getvalue()
+
+        assert cached == uncached
+        assert ddl_cache.misses['indexes'] == 20
+        assert ddl_cache.hits['indexes'] == 20
+        assert ddl_cache.misses['fks'] == 19
+
+    def test_coded_ents_sort_order_follows_dependencies(self):
+        """
+        Test that coded entities are numbered after the tables, each after the entities it
+        depends on (a view on a view, a view calling a function, a trigger on its function),
+        with overloads told apart and unrelated entities left in load order.
+        """
+        tbl_ents = pd.DataFrame({
+            'entkey': ['public.t', 'public.v_top', 'public.f', 'public.v_base', 'public.tr', 'public.f'],
+            'enttype': ['Table', 'View', 'Function', 'View', 'Trigger', 'Function'],
+            'entparamlist': [None, None, 'a integer', None, None, ''],
+            'scriptsortorder': [1.0, 2.0, 2.0, 2.0, 2.0, 2.0],
+        })
+        code_deps = [
+            {'dep_key': 'public.v_top', 'dep_params': None, 'ref_key': 'public.v_base', 'ref_params': None},
+            {'dep_key': 'public.v_base', 'dep_params': None, 'ref_key': 'public.f', 'ref_params': ''},
+            {'dep_key': 'public.tr', 'dep_params': None, 'ref_key': 'public.f', 'ref_params': 'a integer'},
+            {'dep_key': 'other.v', 'dep_params': None, 'ref_key': 'public.f', 'ref_params': ''},  # not loaded
+        ]
+
+        _set_coded_ents_sort_order(tbl_ents, code_deps)
+
+        assert tbl_ents['scriptsortorder'].tolist() == [1, 6, 2, 5, 3, 4]
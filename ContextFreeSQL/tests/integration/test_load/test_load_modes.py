@@ -0,0 +1,262 @@
+"""
+Integration tests for the catalog/data load modes.
+
+Tests verify that the optional load strategies return the same DBSchema
+frames as the default serial load.
+"""
+import pytest
+from tests.utils import db_helpers
+from src.data_load.from_db.load_from_db_pg import load_all_schema, load_all_db_ents, load_all_tables_data
+from src.data_load.from_db.catalog_cache import CatalogCache
+from src.defs.script_defs import DBConnSettings
+from src.infra.database import DBSession
+
+
+def _conn_settings(test_db_settings) -> DBConnSettings:
+    return DBConnSettings(
+        host=test_db_settings.host,
+        db_name=test_db_settings.db_name,
+        user=test_db_settings.user,
+        password=test_db_settings.password,
+        port=test_db_settings.port
+    )
+
+
+def _rows_for_prefix(df, col, prefix):
+    """Rows of a catalog frame that belong to this test, sorted so frames can be compared."""
+    rows = df[df[col].astype(str).str.startswith(prefix)]
+    return rows.sort_values(list(rows.columns)).astype(str).reset_index(drop=True)
+
+
+@pytest.mark.schema
+class TestLoadModes:
+    """Tests for the different ways of loading the source database."""
+
+    def test_parallel_catalog_load_matches_serial(self, test_connection, test_db_settings, unique_prefix):
+        """
+        Test that loading the catalog on a pool of snapshot-sharing connections
+        gives the same frames as the serial load.
+        """
+        parent = f"{unique_prefix}parent"
+        child = f"{unique_prefix}child"
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{parent}" (id INT PRIMARY KEY, code VARCHAR(10) UNIQUE)')
+        db_helpers.execute_sql(
+            test_connection,
+            f'CREATE TABLE public."{child}" (id INT PRIMARY KEY, parent_id INT NOT NULL REFERENCES public."{parent}"(id), qty INT DEFAULT 1 CHECK (qty > 0))'
+        )
+
+        conn_settings = _conn_settings(test_db_settings)
+        serial = load_all_schema(conn_settings, load_security=False)
+        parallel = load_all_schema(conn_settings, load_security=False, parallel_workers=4)
+
+        for frame, col in [('columns', 'table_name'), ('defaults', 'table_name'), ('indexes', 'table_name'),
+                           ('index_cols', 'table_name'), ('fk_cols', 'fkey_table_name'), ('check_constraints', 'table_name')]:
+            expected = _rows_for_prefix(getattr(serial, frame), col, unique_prefix)
+            actual = _rows_for_prefix(getattr(parallel, frame), col, unique_prefix)
+            assert not expected.empty, f"no {frame} rows loaded for test tables"
+            assert expected.equals(actual), f"{frame} differs between serial and parallel load"
+
+    def test_pg_catalog_backend_matches_information_schema(self, test_connection, test_db_settings, unique_prefix):
+        """
+        Test that the native pg_catalog loader gives the same tables, columns,
+        defaults and entities as the information_schema one.
+        """
+        table = f"{unique_prefix}rich"
+        db_helpers.execute_sql(
+            test_connection,
+            f'CREATE TABLE public."{table}" (id INT GENERATED ALWAYS AS IDENTITY (START WITH 5 INCREMENT BY 2) PRIMARY KEY, '
+            f'name VARCHAR(40) COLLATE "C" NOT NULL DEFAULT \'x\', amount NUMERIC(10,3), tags TEXT[], at TIMESTAMPTZ(3) DEFAULT now(), '
+            f'doubled NUMERIC GENERATED ALWAYS AS (amount * 2) STORED, dropped INT)'
+        )
+        db_helpers.execute_sql(test_connection, f'ALTER TABLE public."{table}" DROP COLUMN dropped')
+        db_helpers.execute_sql(test_connection, f'CREATE VIEW public."{unique_prefix}v" AS SELECT id, name FROM public."{table}"')
+
+        conn_settings = _conn_settings(test_db_settings)
+        info = load_all_schema(conn_settings, load_security=False)
+        native = load_all_schema(conn_settings, load_security=False, catalog_backend="pg_catalog")
+
+        for frame in ['tables', 'columns', 'defaults']:
+            expected = _rows_for_prefix(getattr(info, frame).drop(columns=['db_now'], errors='ignore'), 'table_name', unique_prefix)
+            actual = _rows_for_prefix(getattr(native, frame).drop(columns=['db_now'], errors='ignore'), 'table_name', unique_prefix)
+            assert not expected.empty, f"no {frame} rows loaded for test objects"
+            assert expected.equals(actual), f"{frame} differs between information_schema and pg_catalog load"
+
+        expected = _rows_for_prefix(load_all_db_ents(conn_settings), 'entname', unique_prefix)
+        actual = _rows_for_prefix(load_all_db_ents(conn_settings, catalog_backend="pg_catalog"), 'entname', unique_prefix)
+        assert len(expected) == 2
+        assert expected.equals(actual), "entities differ between information_schema and pg_catalog load"
+
+    def test_streamed_table_data_matches_fetchall(self, test_connection, test_db_settings, unique_prefix):
+        """
+        Test that streaming table data through a server-side cursor in small
+        chunks gives the same frame as fetching it in one go.
+        """
+        table = f"{unique_prefix}data"
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{table}" (id INT PRIMARY KEY, qty INT, name TEXT, price NUMERIC(8,2))')
+        # the last rows are all NULL, so the final chunks have no values to infer dtypes from
+        db_helpers.execute_sql(
+            test_connection,
+            f'INSERT INTO public."{table}" SELECT g, CASE WHEN g <= 20 THEN g * 10 END, CASE WHEN g <= 20 THEN \'n\' || g END, '
+            f'CASE WHEN g <= 20 THEN g / 4.0 END FROM generate_series(1, 25) g'
+        )
+
+        conn_settings = _conn_settings(test_db_settings)
+        fetched = load_all_schema(conn_settings, load_security=False)
+        streamed = load_all_schema(conn_settings, load_security=False)
+        table_name = f"public.{table}"
+        load_all_tables_data(conn_settings, fetched, [table_name])
+        load_all_tables_data(conn_settings, streamed, [table_name], itersize=4)
+
+        expected = fetched.tables_data[table_name]
+        actual = streamed.tables_data[table_name]
+        assert len(expected) == 25
+        assert list(expected.dtypes) == list(actual.dtypes)
+        assert expected.equals(actual)
+
+    def test_copy_table_data_matches_fetchall(self, test_connection, test_db_settings, unique_prefix):
+        """
+        Test that reading table data with COPY gives the same values and dtypes
+        as fetching the rows through the cursor.
+        """
+        table = f"{unique_prefix}copy"
+        db_helpers.execute_sql(
+            test_connection,
+            f'CREATE TABLE public."{table}" (id INT PRIMARY KEY, big BIGINT, f FLOAT8, n NUMERIC(10,2), b BOOL, t TEXT, c CHAR(3), '
+            f'd DATE, ts TIMESTAMP, tstz TIMESTAMPTZ, iv INTERVAL, u UUID, jb JSONB, arr INT[], by BYTEA)'
+        )
+        db_helpers.execute_sql(
+            test_connection,
+            f"""INSERT INTO public."{table}" VALUES
+            (1, 9000000000, 1.5, 12.34, true, E'tab\\there\\nnew "q" \\\\ back', 'ab', '2024-01-02', '2024-01-02 03:04:05.5',
+             '2024-01-02 03:04:05+02', '1 day 02:00', 'a0eebc99-9c0b-4ef8-bb6d-6bb9bd380a11', '{{"a": [1, 2]}}', '{{1,2}}', '\\x00ff'),
+            (2, NULL, 'NaN', NULL, false, '', NULL, NULL, NULL, NULL, NULL, NULL, 'null', NULL, NULL),
+            (3, -1, '-Infinity', -1, NULL, E'\\\\N', 'x', '1999-12-31', '1999-12-31 23:59:59', '1999-12-31 23:59:59-05', '-3 hours',
+             NULL, '"s"', '{{}}', '\\x')"""
+        )
+
+        conn_settings = _conn_settings(test_db_settings)
+        fetched = load_all_schema(conn_settings, load_security=False)
+        copied = load_all_schema(conn_settings, load_security=False)
+        table_name = f"public.{table}"
+        load_all_tables_data(conn_settings, fetched, [table_name])
+        load_all_tables_data(conn_settings, copied, [table_name], use_copy=True)
+
+        expected = fetched.tables_data[table_name]
+        actual = copied.tables_data[table_name]
+        assert len(expected) == 3
+        assert actual.loc[2, 't'] == '\\N', "a literal backslash-N must not be read as NULL"
+        assert list(expected.dtypes) == list(actual.dtypes)
+        assert expected.equals(actual)
+
+    def test_parallel_table_data_load_matches_serial(self, test_connection, test_db_settings, unique_prefix):
+        """
+        Test that loading table data on worker processes sharing one snapshot
+        gives the same frames as the serial load.
+        """
+        small = f"{unique_prefix}small"
+        big = f"{unique_prefix}big"
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{small}" (id INT PRIMARY KEY, payload BYTEA, at TIMESTAMPTZ)')
+        db_helpers.execute_sql(test_connection, f"INSERT INTO public.\"{small}\" VALUES (1, '\\x00ff', '2024-01-02 03:04:05+02'), (2, NULL, NULL)")
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{big}" AS SELECT g AS id, \'row \' || g AS name FROM generate_series(1, 500) g')
+
+        conn_settings = _conn_settings(test_db_settings)
+        serial = load_all_schema(conn_settings, load_security=False)
+        parallel = load_all_schema(conn_settings, load_security=False)
+        table_names = [f"public.{small}", f"public.{big}", f"public.{unique_prefix}missing"]
+        load_all_tables_data(conn_settings, serial, table_names)
+        load_all_tables_data(conn_settings, parallel, table_names, parallel_workers=2)
+
+        assert set(parallel.tables_data) == set(serial.tables_data) == set(table_names[:2])
+        for table_name in table_names[:2]:
+            assert serial.tables_data[table_name].equals(parallel.tables_data[table_name]), f"{table_name} differs between serial and parallel load"
+
+    def test_chunked_table_data_load(self, test_connection, test_db_settings, unique_prefix):
+        """
+        Test that splitting big tables into unique-key ranges (or ctid page
+        ranges when there is no key) loads every row once, in key order.
+        """
+        keyed = f"{unique_prefix}keyed"
+        heap = f"{unique_prefix}heap"
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{keyed}" (code TEXT PRIMARY KEY, n INT)')
+        db_helpers.execute_sql(test_connection, f'INSERT INTO public."{keyed}" SELECT md5(g::text), g FROM generate_series(1, 2000) g')
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{heap}" AS SELECT g AS n, \'row \' || g AS name FROM generate_series(1, 2000) g')
+        db_helpers.execute_sql(test_connection, f'ANALYZE public."{keyed}", public."{heap}"')
+
+        conn_settings = _conn_settings(test_db_settings)
+        serial = load_all_schema(conn_settings, load_security=False)
+        chunked = load_all_schema(conn_settings, load_security=False)
+        table_names = [f"public.{keyed}", f"public.{heap}"]
+        load_all_tables_data(conn_settings, serial, table_names)
+        load_all_tables_data(conn_settings, chunked, table_names, parallel_workers=2, chunk_rows=500)
+
+        expected = serial.tables_data[f"public.{keyed}"].sort_values('code').reset_index(drop=True)
+        actual = chunked.tables_data[f"public.{keyed}"]
+        assert actual['code'].tolist() == sorted(actual['code'].tolist()), "key ranges must come back in key order"
+        assert expected.equals(actual)
+        assert serial.tables_data[f"public.{heap}"].equals(chunked.tables_data[f"public.{heap}"])
+
+    def test_catalog_cache_reused_until_ddl(self, test_connection, test_db_settings, unique_prefix, tmp_path):
+        """
+        Test that a cached catalog is reused without running the catalog queries,
+        and that DDL on the source database invalidates it.
+        """
+        table = f"{unique_prefix}cached"
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{table}" (id INT PRIMARY KEY, name TEXT)')
+
+        conn_settings = _conn_settings(test_db_settings)
+        cache = CatalogCache(str(tmp_path), conn_settings)
+        first = load_all_schema(conn_settings, load_security=False, cache=cache)
+        first_ents = load_all_db_ents(conn_settings, cache=cache)
+        assert cache.results == {'schema': 'miss', 'db_ents': 'miss'}
+        assert sorted(p.suffix for p in tmp_path.iterdir()) == ['.json', '.json'], "entries are stored as JSON, not pickles"
+
+        cache = CatalogCache(str(tmp_path), conn_settings)
+        with DBSession(conn_settings) as session:
+            second = load_all_schema(conn_settings, load_security=False, session=session, cache=cache)
+            second_ents = load_all_db_ents(conn_settings, session=session, cache=cache)
+            labels = [t.label for t in session.timings]
+        assert cache.results == {'schema': 'hit', 'db_ents': 'hit'}
+        assert labels == ['catalog_fingerprint'], "a cache hit must not run the catalog queries"
+        for frame in ['tables', 'columns', 'indexes', 'index_cols']:
+            assert getattr(first, frame).equals(getattr(second, frame)), f"cached {frame} differs from the loaded one"
+        assert first_ents.equals(second_ents)
+
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{unique_prefix}added" (id INT)')
+        cache = CatalogCache(str(tmp_path), conn_settings)
+        third = load_all_schema(conn_settings, load_security=False, cache=cache)
+        assert cache.results == {'schema': 'miss'}
+        assert f"{unique_prefix}added" in third.tables['table_name'].tolist()
+
+    def test_entity_filter_pushed_into_catalog_queries(self, test_connection, test_db_settings, unique_prefix):
+        """
+        Test that an entity filter restricts the catalog queries to the requested
+        entities, while FK columns to unrequested parent tables still resolve.
+        """
+        parent = f"{unique_prefix}parent"
+        child = f"{unique_prefix}child"
+        other = f"{unique_prefix}other"
+        func = f"{unique_prefix}fn"
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{parent}" (id INT PRIMARY KEY)')
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{child}" (id INT PRIMARY KEY, parent_id INT REFERENCES public."{parent}"(id), qty INT DEFAULT 1 CHECK (qty > 0))')
+        db_helpers.execute_sql(test_connection, f'CREATE TABLE public."{other}" (id INT PRIMARY KEY)')
+        db_helpers.execute_sql(test_connection, f'CREATE FUNCTION public."{func}"() RETURNS int LANGUAGE sql AS $$ SELECT 1 $$')
+        db_helpers.execute_sql(test_connection, f'CREATE FUNCTION public."{unique_prefix}fn2"() RETURNS int LANGUAGE sql AS $$ SELECT 2 $$')
+
+        conn_settings = _conn_settings(test_db_settings)
+        entity_filter = [f"public.{child}", f"public.{func}"]
+        full = load_all_schema(conn_settings, load_security=False)
+        for backend in ["information_schema", "pg_catalog"]:
+            filtered = load_all_schema(conn_settings, load_security=False, catalog_backend=backend, entity_filter=entity_filter)
+            assert filtered.tables['table_name'].tolist() == [child]
+            assert set(filtered.columns['table_name']) == {child, parent}, "columns of FK parents are loaded for fk_cols"
+            assert set(filtered.indexes['table_name']) == {child}
+            assert filtered.check_constraints['table_name'].tolist() == [child]
+            assert filtered.coded_ents['entkey'].tolist() == [f"public.{func}"]
+            for frame, col in [('defaults', 'table_name'), ('index_cols', 'table_name'), ('fk_cols', 'fkey_table_name')]:
+                expected = _rows_for_prefix(getattr(full, frame), col, child)
+                actual = _rows_for_prefix(getattr(filtered, frame), col, child)
+                assert not expected.empty, f"no {frame} rows loaded for test tables"
+                assert expected.equals(actual), f"{frame} differs between full and filtered load"
+
+            ents = load_all_db_ents(conn_settings, entity_filter=entity_filter, catalog_backend=backend)
+            assert sorted(ents['entkey'].tolist()) == sorted(entity_filter)
@@ -6,6 +6,7 @@ Tests verify that ContextFreeSQL correctly generates SQL to:
 2. Drop extra foreign keys
 3. Handle foreign key dependencies
 """
+import re
 import pytest
 from tests.utils import db_helpers
 from tests.conftest import execute_generated_script
@@ -364,3 +365,50 @@ class TestForeignKeyOperations:
         # Verify both FKs are restored
         schema_assertions.assert_fk_exists('public', fk1_name)
         schema_assertions.assert_fk_exists('public', fk2_name)
+
+    def test_batched_state_inserts(self, test_connection, script_generator, unique_prefix, schema_assertions):
+        """
+        Test that filling the state tables with multi-row INSERTs (state_insert_batch_rows)
+        restores dropped foreign keys like the one-INSERT-per-row script.
+        """
+        parent = f"{unique_prefix}parent_batched"
+        child = f"{unique_prefix}child_batched"
+        fk1_name = f"{unique_prefix}fk_batched1"
+        fk2_name = f"{unique_prefix}fk_batched2"
+
+        db_helpers.execute_sql(
+            test_connection,
+            f'''
+            CREATE TABLE public."{parent}" (
+                id INT PRIMARY KEY,
+                code VARCHAR(10) UNIQUE
+            )
+            '''
+        )
+        db_helpers.execute_sql(
+            test_connection,
+            f'''
+            CREATE TABLE public."{child}" (
+                id INT PRIMARY KEY,
+                parent_id INT,
+                parent_code VARCHAR(10),
+                CONSTRAINT "{fk1_name}" FOREIGN KEY (parent_id)
+                    REFERENCES public."{parent}" (id),
+                CONSTRAINT "{fk2_name}" FOREIGN KEY (parent_code)
+                    REFERENCES public."{parent}" (code)
+            )
+            '''
+        )
+
+        # each state table is filled by a single INSERT ... VALUES (the INSERT ... SELECTs add the target's extras)
+        script = script_generator.generate([f"public.{parent}", f"public.{child}"], state_insert_batch_rows=100)
+        for state_table in ["ScriptCols", "ScriptIndexes", "scriptfks", "scriptfkcols"]:
+            assert len(re.findall(rf"INSERT INTO {state_table} \([^)]*\)\s*VALUES", script)) == 1, state_table
+
+        db_helpers.execute_sql(test_connection, f'ALTER TABLE public."{child}" DROP CONSTRAINT "{fk1_name}"')
+        db_helpers.execute_sql(test_connection, f'ALTER TABLE public."{child}" DROP CONSTRAINT "{fk2_name}"')
+
+        execute_generated_script(test_connection, script)
+
+        schema_assertions.assert_fk_exists('public', fk1_name)
+        schema_assertions.assert_fk_exists('public', fk2_name)
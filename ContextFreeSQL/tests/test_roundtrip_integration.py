@@ -20,6 +20,7 @@ Test flow:
 import os
 import sys
 import json
+import subprocess
 import pytest
 import psycopg2
 from psycopg2 import sql
@@ -30,6 +31,11 @@ from dataclasses import dataclass, field
 # Add the src directory to the path so we can import the main module
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# The PyInstaller build from build.bat (contextfreesql.exe on Windows, contextfreesql elsewhere)
+BUNDLED_EXE = Path(__file__).parent.parent / "dist" / "contextfreesql.exe"
+if not BUNDLED_EXE.is_file():
+    BUNDLED_EXE = BUNDLED_EXE.with_suffix("")
+
 
 @dataclass
 class SchemaSnapshot:
@@ -457,7 +463,8 @@ class TestRoundtripIntegration:
 
         return differences
 
-    def _create_test_config(self, output_path: str) -> str:
+    def _create_test_config(self, output_path: str, data_generation_workers: int = 1,
+                            db_load_options: Dict[str, Any] = None) -> str:
         """Create a config file for ContextFreeSQL."""
         config = {
             "database": {
@@ -478,7 +485,8 @@ class TestRoundtripIntegration:
                 "data_scripting_leave_report_fields_updated": False,
                 "data_scripting_leave_report_fields_updated_save_old_value": False,
                 "data_scripting_generate_dml_statements": True,
-                "data_comparison_include_equal_rows": False
+                "data_comparison_include_equal_rows": False,
+                "data_generation_workers": data_generation_workers
             },
             "table_script_ops": {
                 "column_identity": True,
@@ -507,10 +515,11 @@ class TestRoundtripIntegration:
                 "exec_code": False,
                 "html_report": False,
                 "export_csv": False
-            }
+            },
+            "db_load_options": db_load_options or {}
         }
 
-        config_path = os.path.join(os.path.dirname(__file__), "test_config_roundtrip.json")
+        config_path = os.path.join(os.path.dirname(output_path), "test_config_roundtrip.json")
         with open(config_path, 'w') as f:
             json.dump(config, f, indent=2)
 
@@ -527,7 +536,7 @@ class TestRoundtripIntegration:
         finally:
             sys.argv = original_argv
 
-    def test_roundtrip_schema_and_data_restoration(self):
+    def test_roundtrip_schema_and_data_restoration(self, tmp_path):
         """
         Test that ContextFreeSQL can detect all changes and restore the database
         to its original state.
@@ -544,7 +553,8 @@ class TestRoundtripIntegration:
         tests_dir = Path(__file__).parent
         setup_sql = tests_dir / "setup_test_db.sql"
         modify_sql = tests_dir / "modify_test_db.sql"
-        output_sql = tests_dir / "roundtrip_test_output.sql"
+        # main copies the report templates next to the script, so it goes to tmp_path, not tests/
+        output_sql = tmp_path / "roundtrip_test_output.sql"
 
         # Step 1: Create baseline database
         print("\n=== Step 1: Creating baseline database ===")
@@ -607,6 +617,31 @@ class TestRoundtripIntegration:
         assert len(differences) == 0, f"Schema differences found after roundtrip:\n" + "\n".join(differences)
         print("\n=== SUCCESS: Database restored to baseline state! ===")
 
+    @pytest.mark.slow
+    @pytest.mark.skipif(not BUNDLED_EXE.is_file(), reason=f"bundled exe not built: {BUNDLED_EXE}")
+    def test_bundled_exe_with_worker_pools(self, tmp_path):
+        """
+        Run the bundled exe with the data load and data generation worker pools on.
+
+        The pools spawn their workers, which in a frozen exe re-run the exe itself; without
+        multiprocessing.freeze_support() each worker would start main() again instead of
+        running its task. Skipped until the exe is built (build.bat).
+        """
+        self._run_sql_file(str(Path(__file__).parent / "setup_test_db.sql"))
+        output_sql = tmp_path / "exe_workers_output.sql"
+        config_path = self._create_test_config(
+            str(output_sql),
+            data_generation_workers=2,
+            db_load_options={"parallel_data_load": True, "load_workers": 2},
+        )
+
+        result = subprocess.run([str(BUNDLED_EXE), config_path], capture_output=True, text=True, timeout=300)
+
+        assert result.returncode == 0, f"exe failed:\n{result.stdout}\n{result.stderr}"
+        script_content = output_sql.read_text(encoding="utf-8")
+        # each table's rows go into its staging table (schema_table) before the compare
+        assert "INSERT INTO public_categories" in script_content, "the exe's script has no table data"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])